@@ -2,7 +2,7 @@ import os
 import json
 import google.generativeai as genai
 from dotenv import load_dotenv
-import yt_dlp
+import ydl_pool
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 import base64
 import io
@@ -25,6 +25,13 @@ CATEGORIES_JSON = {
     "editing": ["Subtitle/Font", "VFX", "Infographic", "AI-Generated", "Interactive", "Motion Graphics", "Cinematic", "Typography", "Vertical", "One-take", "Chroma-key", "Fast-paced"]
 }
 
+# 메타데이터만 추출 (ydl_pool 프로필)
+ANALYZER_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': True,
+}
+
 def extract_video_data(url):
     """
     1단계: 데이터 추출
@@ -40,16 +47,10 @@ def extract_video_data(url):
         "images_data": []
     }
 
-    # 1. Extract Metadata using yt-dlp
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'extract_flat': True, # 메타데이터만 추출
-    }
-    
+    # 1. Extract Metadata using yt-dlp (초기화된 인스턴스 재사용)
     video_id = None
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with ydl_pool.acquire(ANALYZER_YDL_OPTS) as ydl:
             info = ydl.extract_info(url, download=False)
             video_data["channel_name"] = info.get('uploader') or info.get('channel') or info.get('uploader_id')
             video_data["video_title"] = info.get('title')
@@ -61,7 +62,7 @@ def extract_video_data(url):
             
             # Import visual extraction tools from youtube_service
             try:
-                from youtube_service import extract_frames, download_image_as_base64
+                from youtube_service import frame_superset, select_frames, download_image_as_base64
                 
                 print("🖼️ Extracting visual data...")
                 # 썸네일 다운로드
@@ -71,7 +72,7 @@ def extract_video_data(url):
                         video_data["images_data"].append(thumb_b64)
                 
                 # 프레임 추출
-                frames = extract_frames(url, count=3)
+                frames = select_frames(frame_superset(url), 3)
                 if frames:
                     video_data["images_data"].extend(frames)
                     
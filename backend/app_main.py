@@ -4,182 +4,62 @@ import os
 
 load_dotenv()
 
-from sqlalchemy import or_, String
+from sqlalchemy import or_, String, select
+from sqlalchemy.exc import IntegrityError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, FileResponse
 import requests
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, undefer
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import uuid
 import base64
+import asyncio
 import os
 from datetime import timedelta, datetime
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from database import engine, get_db, Base
+from database import engine, get_db, get_read_db, get_async_db, Base
 from db_models import User, Category, Post as DBPost
 from models import (
     UserCreate, UserLogin, UserResponse, UserApprove, UserMakeAdmin, UserRevokeAdmin,
     PasswordVerify, Token,
     CategoryCreate, CategoryResponse,
-    PostCreate, PostUpdate, PostResponse,
+    PostCreate, PostUpdate, PostResponse, SimilarPostResponse,
+    FrameJobCreate, FrameJobResponse,
 )
 from auth import (
     hash_employee_id, verify_employee_id, create_access_token,
     get_current_user, get_current_approved_user, get_current_admin_user, get_current_user_optional,
+    get_current_user_async, get_current_user_optional_async,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
-from youtube_service import extract_youtube_metadata, extract_frames, validate_youtube_url
+from youtube_service import (
+    extract_youtube_metadata, validate_youtube_url, warm_extractors,
+    frame_superset, frame_url_superset, frame_superset_key, select_frames,
+)
+from frame_jobs import submit_frame_job, get_frame_job
+from frame_store import get_frame_path
+import thumbnail_store
+import prewarm
+from video_ids import extract_video_id, extract_video_id_lenient
+import extraction_pool
+import single_flight
+import frame_hashes
+import visual_index
+from extraction_pool import ExtractionQueueFull
+from db_config import FRAME_FORMAT, FRAME_QUALITY, FRAME_MAX_WIDTH
 from security_logger import log_login_attempt, log_security_event
+from migrations import check_schema_version
+from backfill_categories import CATEGORY_COLUMNS, is_backfill_complete
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
-
-def check_and_migrate_db():
-    """DB 스키마 마이그레이션 (컬럼 추가 등)"""
-    from sqlalchemy import text, inspect
-    
-    inspector = inspect(engine)
-    columns = [col['name'] for col in inspector.get_columns('posts')]
-    
-    with engine.connect() as conn:
-        # 1. view_count 컬럼 추가
-        if 'view_count' not in columns:
-            print("🔄 Migrating: Adding view_count column to posts table...")
-            try:
-                # SQLite & Postgres compatible
-                conn.execute(text("ALTER TABLE posts ADD COLUMN view_count INTEGER DEFAULT 0"))
-                conn.commit() # 커밋 필요
-                print("✅ Added view_count column")
-            except Exception as e:
-                print(f"⚠️ Failed to add view_count column: {e}")
-
-        # 2. Rename author_id -> user_id
-        if 'author_id' in columns and 'user_id' not in columns:
-            print("🔄 Migrating: Renaming author_id to user_id...")
-            try:
-                conn.execute(text("ALTER TABLE posts RENAME COLUMN author_id TO user_id"))
-                conn.commit()
-                print("✅ Renamed author_id to user_id")
-            except Exception as e:
-                print(f"⚠️ Failed to rename author_id: {e}")
-
-        # 3. Rename primary_category -> industry_categories
-        if 'primary_category' in columns and 'industry_categories' not in columns:
-            print("🔄 Migrating: Renaming primary_category to industry_categories...")
-            try:
-                conn.execute(text("ALTER TABLE posts RENAME COLUMN primary_category TO industry_categories"))
-                conn.commit()
-                print("✅ Renamed primary_category to industry_categories")
-            except Exception as e:
-                print(f"⚠️ Failed to rename primary_category: {e}")
-        elif 'primary_categories' in columns and 'industry_categories' not in columns:
-             print("🔄 Migrating: Renaming primary_categories to industry_categories...")
-             try:
-                conn.execute(text("ALTER TABLE posts RENAME COLUMN primary_categories TO industry_categories"))
-                conn.commit()
-                print("✅ Renamed primary_categories to industry_categories")
-             except Exception as e:
-                print(f"⚠️ Failed to rename primary_categories: {e}")
-
-        # 4. Rename secondary_category -> genre_categories
-        if 'secondary_category' in columns and 'genre_categories' not in columns:
-            print("🔄 Migrating: Renaming secondary_category to genre_categories...")
-            try:
-                conn.execute(text("ALTER TABLE posts RENAME COLUMN secondary_category TO genre_categories"))
-                conn.commit()
-                print("✅ Renamed secondary_category to genre_categories")
-            except Exception as e:
-                print(f"⚠️ Failed to rename secondary_category: {e}")
-        elif 'secondary_categories' in columns and 'genre_categories' not in columns:
-             print("🔄 Migrating: Renaming secondary_categories to genre_categories...")
-             try:
-                conn.execute(text("ALTER TABLE posts RENAME COLUMN secondary_categories TO genre_categories"))
-                conn.commit()
-                print("✅ Renamed secondary_categories to genre_categories")
-             except Exception as e:
-                print(f"⚠️ Failed to rename secondary_categories: {e}")
-
-        # 5. Add new columns: cast, mood, editing
-        new_cols = ['cast_categories', 'mood_categories', 'editing_categories']
-        for col_name in new_cols:
-            if col_name not in columns:
-                print(f"🔄 Migrating: Adding {col_name} column...")
-                try:
-                    # JSON type support varies, using Text or JSON depending on DB
-                    # SQLAlchemy JSON type usually maps to JSON in Postgres and JSON/TEXT in SQLite
-                    # Here we use generic ADD COLUMN. SQLite doesn't support JSON type in ALTER TABLE easily without extensions sometimes, 
-                    # but SQLAlchemy handles it if we define it in model. 
-                    # For raw SQL:
-                    conn.execute(text(f"ALTER TABLE posts ADD COLUMN {col_name} JSON DEFAULT '[]'"))
-                    conn.commit()
-                    print(f"✅ Added {col_name} column")
-                except Exception as e:
-                    print(f"⚠️ Failed to add {col_name} (trying TEXT fallback): {e}")
-                    try:
-                        conn.execute(text(f"ALTER TABLE posts ADD COLUMN {col_name} TEXT DEFAULT '[]'"))
-                        conn.commit()
-                        print(f"✅ Added {col_name} column (TEXT)")
-                    except Exception as e2:
-                         print(f"⚠️ Failed to add {col_name}: {e2}")
-
-        # 6. Add channel_name column
-        if 'channel_name' not in columns:
-            print("🔄 Migrating: Adding channel_name column...")
-            try:
-                conn.execute(text("ALTER TABLE posts ADD COLUMN channel_name VARCHAR"))
-                conn.commit()
-                print("✅ Added channel_name column")
-            except Exception as e:
-                print(f"⚠️ Failed to add channel_name column: {e}")
-
-        # 6. Check Favorites table for 'id' column
-        if 'favorites' in inspector.get_table_names():
-            fav_columns = [col['name'] for col in inspector.get_columns('favorites')]
-            if 'id' not in fav_columns:
-                print("🔄 Migrating: Adding id column to favorites table...")
-                try:
-                    # Postgres specific (SERIAL)
-                    # Try adding as PK first
-                    try:
-                        conn.execute(text("ALTER TABLE favorites ADD COLUMN id SERIAL PRIMARY KEY"))
-                        conn.commit()
-                        print("✅ Added id column to favorites (PK)")
-                    except Exception as pk_err:
-                        print(f"⚠️ Failed to add id as PK: {pk_err}")
-                        conn.rollback()
-                        # Fallback: Add as regular column
-                        conn.execute(text("ALTER TABLE favorites ADD COLUMN id SERIAL"))
-                        conn.commit()
-                        print("✅ Added id column to favorites (Non-PK)")
-                        
-                except Exception as e:
-                    print(f"⚠️ Failed to add id column to favorites (Postgres method): {e}")
-                    try:
-                        # Fallback for SQLite
-                        conn.execute(text("ALTER TABLE favorites ADD COLUMN id INTEGER PRIMARY KEY AUTOINCREMENT"))
-                        conn.commit()
-                        print("✅ Added id column to favorites (SQLite method)")
-                    except Exception as e2:
-                        print(f"⚠️ Failed to add id column to favorites (SQLite method): {e2}")
-
-        # 7. Migrate Category Types (Data Migration)
-        # primary -> industry, secondary -> genre
-        try:
-            conn.execute(text("UPDATE categories SET type='industry' WHERE type='primary'"))
-            conn.execute(text("UPDATE categories SET type='genre' WHERE type='secondary'"))
-            conn.commit()
-            print("✅ Migrated category types (primary->industry, secondary->genre)")
-        except Exception as e:
-            print(f"⚠️ Failed to migrate category types: {e}")
+# 스키마 버전 확인 (마이그레이션은 배포 시 `python migrations.py upgrade` 로 한 번만 실행)
+check_schema_version()
 
-# 마이그레이션 실행
-try:
-    check_and_migrate_db()
-except Exception as e:
-    print(f"⚠️ DB Migration failed: {e}")
+# 카테고리 컬럼 정규화 백필이 끝났으면 요청마다 하는 JSON 보정 루프를 건너뜀
+CATEGORIES_NORMALIZED = is_backfill_complete()
 
 app = FastAPI(title="Refedia API", version="1.0.0")
 
@@ -188,6 +68,17 @@ limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+# 프레임 추출 워커 풀 대기열 초과 → 503 + Retry-After
+async def _extraction_queue_full_handler(request: Request, exc: ExtractionQueueFull):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Frame extraction is busy. Please try again later."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+app.add_exception_handler(ExtractionQueueFull, _extraction_queue_full_handler)
+
 # CORS 설정 (환경 변수 사용)
 allowed_origins = os.getenv(
     "ALLOWED_ORIGINS", 
@@ -274,6 +165,24 @@ def debug_system():
     import sys
     result["python"] = sys.version
 
+    # 3.5 Frame cache stats
+    from redis_cache import get_cache_stats
+    result["frame_cache"] = get_cache_stats()
+    result["single_flight"] = dict(single_flight.stats)
+    result["extraction_pool"] = extraction_pool.get_metrics()
+    import media_cache
+    result["media_cache"] = dict(media_cache.stats)
+    import frame_store
+    result["frame_store"] = dict(frame_store.stats)
+    import frame_selection
+    result["scene_selection"] = frame_selection.get_stats()
+    result["frame_hashes"] = dict(frame_hashes.stats)
+    result["visual_index"] = dict(visual_index.stats)
+    result["thumbnails"] = dict(thumbnail_store.stats)
+    result["prewarm"] = dict(prewarm.stats)
+    import ydl_pool
+    result["ydl_pool"] = ydl_pool.get_stats()
+
     # 4. Check Connectivity (Simple curl)
     try:
         out = subprocess.check_output(["curl", "-I", "https://www.youtube.com"], stderr=subprocess.STDOUT).decode()
@@ -357,12 +266,12 @@ def logout(request: Request, current_user: User = Depends(get_current_user)):
     return {"status": "logged out", "message": "Please clear your session storage"}
 
 @app.get("/api/auth/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_async)):
     """현재 사용자 정보"""
     return current_user
 
 @app.get("/api/admin/users", response_model=List[UserResponse])
-def get_all_users(current_user: User = Depends(get_current_admin_user), db: Session = Depends(get_db)):
+def get_all_users(current_user: User = Depends(get_current_admin_user), db: Session = Depends(get_read_db)):
     """모든 사용자 조회 (관리자 전용)"""
     return db.query(User).all()
 
@@ -448,19 +357,30 @@ def delete_category(category_id: str, current_user: User = Depends(get_current_a
 
 @app.get("/api/youtube/frames")
 @limiter.limit("10/minute")  # YouTube API 과도한 호출 방지
-def get_youtube_frames(
+async def get_youtube_frames(
     request: Request,
     url: str = Query(...), 
     count: int = Query(4), 
+    format: str = Query(FRAME_FORMAT, pattern="^(jpeg|webp|png)$"),
+    quality: int = Query(FRAME_QUALITY, ge=1, le=100),
+    max_width: int = Query(FRAME_MAX_WIDTH, ge=0, le=3840),
     current_user: User = Depends(get_current_approved_user)
 ):
-    """YouTube 랜덤 프레임 추출 (Base64)"""
+    """YouTube 랜덤 프레임 추출 (프레임 이미지 URL 목록, 기본 640px JPEG)"""
     if not validate_youtube_url(url):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="Invalid YouTube URL"
         )
-    frames = extract_frames(url, count)
+    # 추출은 전용 워커 풀에서 실행 (요청 스레드를 잡지 않음, 대기열 초과 시 503)
+    # 같은 영상의 동시 요청은 워커 하나의 프레임 세트 추출을 공유하고, 선택만 요청마다 한다
+    # 다른 워커가 추출 중이면 풀에 넣기 전에 기다림 (기다리는 동안 워커 슬롯을 차지하지 않음)
+    key = frame_superset_key(url, format, quality, max_width, urls=True)
+    await single_flight.wait_for_remote(key)
+    superset = await asyncio.wrap_future(
+        extraction_pool.submit_coalesced(key, frame_url_superset, url, format, quality, max_width)
+    )
+    frames = select_frames(superset, count)
     if not frames:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
@@ -469,6 +389,52 @@ def get_youtube_frames(
     return {"frames": frames, "count": len(frames)}
 
 
+@app.get("/api/frames/{video_id}/{filename}")
+def get_frame_file(video_id: str, filename: str):
+    """프레임 이미지 파일 (내용 해시 기반 파일명이라 영구 캐시 가능)"""
+    path = get_frame_path(video_id, filename)
+    if not path:
+        raise HTTPException(status_code=404, detail="Frame not found")
+    return FileResponse(path, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
+@app.get("/api/thumbnails/{video_id}/{filename}")
+def get_thumbnail_file(video_id: str, filename: str):
+    """게시물 썸네일 파생 이미지 (내용 해시 기반 파일명이라 영구 캐시 가능)"""
+    path = thumbnail_store.get_thumbnail_path(video_id, filename)
+    if not path:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    return FileResponse(path, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
+@app.post("/api/youtube/frames/jobs", response_model=FrameJobResponse, status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("10/minute")
+def create_frame_job(
+    request: Request,
+    job_data: FrameJobCreate,
+    current_user: User = Depends(get_current_approved_user)
+):
+    """YouTube 프레임 추출 작업 등록 (작업 ID 즉시 반환)"""
+    if not validate_youtube_url(job_data.url):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid YouTube URL"
+        )
+    return submit_frame_job(job_data.url, job_data.count)
+
+
+@app.get("/api/youtube/frames/jobs/{job_id}", response_model=FrameJobResponse)
+def get_frame_job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_approved_user)
+):
+    """프레임 추출 작업 상태 / 결과 조회"""
+    job = get_frame_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 
 # ========================================
 # Category API (Duplicate - keeping second definition)
@@ -479,10 +445,11 @@ def get_youtube_frames(
 # ========================================
 
 @app.get("/api/categories")
-def get_categories(db: Session = Depends(get_db)):
+async def get_categories(db: AsyncSession = Depends(get_async_db)):
     """카테고리 목록 (primary/secondary 그룹화)"""
     # DB에서 가져온 후 Python에서 정렬 (DB Collation 차이 방지)
-    categories = db.query(Category).all()
+    result = await db.execute(select(Category))
+    categories = result.scalars().all()
     
     def sort_key(c):
         return c.name.lower()
@@ -558,7 +525,8 @@ def delete_category(
 def create_post(
     post_data: PostCreate,
     current_user: User = Depends(get_current_approved_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
 ):
     """게시물 생성"""
     try:
@@ -573,8 +541,13 @@ def create_post(
                 detail="Invalid YouTube URL"
             )
         
-        # URL 중복 확인
-        existing = db.query(DBPost).filter(DBPost.url == url_str).first()
+        # 중복 확인 (읽기 세션 사용: 메타데이터 추출 동안 쓰기 커넥션을 잡지 않음)
+        # 같은 영상의 다른 URL 형태(youtu.be, shorts, &t= 등)도 video_id 인덱스로 걸러냄
+        vid = extract_video_id(url_str)
+        if vid:
+            existing = read_db.query(DBPost).filter(or_(DBPost.video_id == vid, DBPost.url == url_str)).first()
+        else:
+            existing = read_db.query(DBPost).filter(DBPost.url == url_str).first()
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -603,6 +576,7 @@ def create_post(
         # 게시물 생성
         new_post = DBPost(
             url=url_str,
+            video_id=vid,
             title=title,
             channel_name=channel_name,
             thumbnail=thumbnail,
@@ -614,19 +588,13 @@ def create_post(
             mood_categories=post_data.mood_categories,
             editing_categories=post_data.editing_categories,
             memo=post_data.memo,
-            user_id=current_user.id
+            user_id=current_user.id,
+            # 미리보기 / AI 분석 때 계산한 지각 해시 (없으면 이후 추출 시 저장됨)
+            frame_hashes=frame_hashes.get_record(vid)
         )
         
         # 초기 조회수 가져오기
         try:
-            vid = None
-            if 'v=' in url_str:
-                vid = url_str.split('v=')[1].split('&')[0]
-            elif 'youtu.be/' in url_str:
-                vid = url_str.split('youtu.be/')[1].split('?')[0]
-            elif 'shorts/' in url_str:
-                vid = url_str.split('shorts/')[1].split('?')[0]
-                
             if vid:
                 from youtube_service import update_view_counts_batch
                 view_counts = update_view_counts_batch([vid])
@@ -637,8 +605,19 @@ def create_post(
             print(f"⚠️ Failed to fetch initial view count: {e}")
         
         db.add(new_post)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # 동시에 같은 영상이 등록된 경우 (unique 인덱스)
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Post with this URL already exists"
+            )
         db.refresh(new_post)
+
+        # 썸네일 파생 이미지 / 프레임 세트는 응답 후 백그라운드에서 미리 준비 (부하 시 생략)
+        prewarm.submit(new_post.id, url_str, vid, thumbnail)
         
         return new_post
 
@@ -663,7 +642,7 @@ def create_post(
 def analyze_video_category(
     url: str = Body(..., embed=True),
     current_user: User = Depends(get_current_approved_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     AI를 사용하여 비디오 URL을 분석하고 적절한 카테고리를 추천합니다.
@@ -671,7 +650,7 @@ def analyze_video_category(
     """
     # 1. YouTube 메타데이터 추출
     try:
-        from youtube_service import extract_youtube_metadata, extract_frames, download_image_as_base64
+        from youtube_service import extract_youtube_metadata, download_image_as_base64
         title, thumbnail_url, _, description, channel_name = extract_youtube_metadata(url)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to fetch YouTube metadata: {str(e)}")
@@ -681,17 +660,27 @@ def analyze_video_category(
     try:
         print("🖼️ Extracting visual data for AI analysis...")
         # 썸네일 다운로드
+        thumb_hash = None
         if thumbnail_url:
             thumb_b64 = download_image_as_base64(thumbnail_url)
             if thumb_b64:
                 images_data.append(thumb_b64)
+                thumb_hash = frame_hashes.hash_data_url(thumb_b64)
         
-        # 프레임 추출 (3장 정도만 추출하여 속도 최적화)
-        frames = extract_frames(url, count=3)
+        # 프레임 추출 (3장 정도만 추출하여 속도 최적화, 전용 워커 풀에서 실행)
+        # 썸네일과 거의 같은 프레임은 제외 (같은 이미지를 두 번 보내지 않도록)
+        key = frame_superset_key(url)
+        single_flight.wait_for_remote_blocking(key)
+        superset = extraction_pool.submit_coalesced(key, frame_superset, url).result()
+        frames = select_frames(superset, 3, exclude=thumb_hash)
+        if thumb_hash:
+            frame_hashes.save_record(extract_video_id(url), thumbnail=thumb_hash)
         if frames:
             images_data.extend(frames)
             
         print(f"✅ Visual data ready: {len(images_data)} images")
+    except ExtractionQueueFull:
+        print("⚠️ Extraction queue is full. Analyzing without frames.")
     except Exception as e:
         print(f"⚠️ Failed to extract visual data: {e}")
         # 시각 정보 실패해도 텍스트 분석은 계속 진행
@@ -730,7 +719,7 @@ def analyze_video_category(
 
 
 @app.get("/api/posts", response_model=List[PostResponse])
-def get_posts(
+async def get_posts(
     page: int = 1,
     limit: int = 20,
     industry_category: List[str] = Query(None),
@@ -746,11 +735,11 @@ def get_posts(
     my_posts: bool = False,
     favorites_only: bool = False,
     seed: Optional[int] = None,
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Optional[User] = Depends(get_current_user_optional_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """게시물 목록 조회 (서버 사이드 필터링 & 페이지네이션)"""
-    query = db.query(DBPost)
+    query = select(DBPost)
     
     # 0. My Posts & Favorites Filter
     if my_posts:
@@ -838,7 +827,8 @@ def get_posts(
         # DB 레벨에서 랜덤 정렬을 해야 함.
         # SQLite: ORDER BY RANDOM() - 시드 지원 안함
         # Python 메모리 정렬 방식 사용 (데이터가 많지 않다고 가정)
-        posts = query.options(joinedload(DBPost.author)).all()
+        result = await db.execute(query.options(joinedload(DBPost.author)))
+        posts = list(result.scalars().all())
         random.seed(seed)
         random.shuffle(posts)
         
@@ -849,11 +839,13 @@ def get_posts(
     else:
         # 기본 정렬 (최신순)
         skip = (page - 1) * limit
-        posts = query.options(joinedload(DBPost.author))\
-                     .order_by(DBPost.created_at.desc())\
-                     .offset(skip)\
-                     .limit(limit)\
-                     .all()
+        result = await db.execute(
+            query.options(joinedload(DBPost.author))
+                 .order_by(DBPost.created_at.desc())
+                 .offset(skip)
+                 .limit(limit)
+        )
+        posts = result.scalars().all()
         print(f"DEBUG: Fetched {len(posts)} posts")
     
     # 작성자 이름 및 좋아요 여부 설정
@@ -863,9 +855,10 @@ def get_posts(
             if post.author:
                 post.author_name = post.author.name
             
-            # JSON 파싱 보정 (DB에 문자열로 저장된 경우)
-            # JSON 파싱 보정 (DB에 문자열로 저장된 경우)
-            for attr in ['industry_categories', 'genre_categories', 'cast_categories', 'mood_categories', 'editing_categories']:
+            # JSON 파싱 보정 (DB에 문자열로 저장된 경우, 백필 완료 시 생략)
+            if CATEGORIES_NORMALIZED:
+                continue
+            for attr in CATEGORY_COLUMNS:
                 val = getattr(post, attr)
                 if isinstance(val, str):
                     try:
@@ -881,11 +874,13 @@ def get_posts(
             # 최적화: 한 번의 쿼리로 현재 페이지의 모든 포스트에 대한 좋아요 여부 가져오기
             post_ids = [p.id for p in posts]
             if post_ids:
-                favorites = db.query(Favorite).filter(
-                    Favorite.user_id == current_user.id,
-                    Favorite.post_id.in_(post_ids)
-                ).all()
-                favorited_post_ids = {f.post_id for f in favorites}
+                fav_result = await db.execute(
+                    select(Favorite.post_id).where(
+                        Favorite.user_id == current_user.id,
+                        Favorite.post_id.in_(post_ids)
+                    )
+                )
+                favorited_post_ids = set(fav_result.scalars().all())
                 
                 for post in posts:
                     post.is_favorited = post.id in favorited_post_ids
@@ -906,19 +901,22 @@ def get_posts(
 
 
 @app.get("/api/posts/{post_id}", response_model=PostResponse)
-def get_post(
+async def get_post(
     post_id: int, 
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Optional[User] = Depends(get_current_user_optional_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """게시물 상세 조회"""
-    post = db.query(DBPost).filter(DBPost.id == post_id).first()
+    result = await db.execute(
+        select(DBPost).options(joinedload(DBPost.author)).where(DBPost.id == post_id)
+    )
+    post = result.scalars().first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    # JSON 파싱 보정
+    # JSON 파싱 보정 (백필 완료 시 생략)
     import json
-    for attr in ['industry_categories', 'genre_categories', 'cast_categories', 'mood_categories', 'editing_categories']:
+    for attr in ([] if CATEGORIES_NORMALIZED else CATEGORY_COLUMNS):
         val = getattr(post, attr)
         if isinstance(val, str):
             try:
@@ -940,11 +938,13 @@ def get_post(
     # 좋아요 여부 확인
     if current_user:
         from db_models import Favorite
-        is_favorited = db.query(Favorite).filter(
-            Favorite.user_id == current_user.id,
-            Favorite.post_id == post.id
-        ).first() is not None
-        post.is_favorited = is_favorited
+        fav_result = await db.execute(
+            select(Favorite.id).where(
+                Favorite.user_id == current_user.id,
+                Favorite.post_id == post.id
+            )
+        )
+        post.is_favorited = fav_result.first() is not None
     else:
         post.is_favorited = False
         
@@ -954,6 +954,44 @@ def get_post(
     return post
 
 
+@app.get("/api/posts/{post_id}/visually-similar", response_model=List[SimilarPostResponse])
+def get_visually_similar_posts(
+    post_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_read_db)
+):
+    """썸네일 / 프레임이 비슷해 보이는 게시물 (지각 해시 + 색/구도 유사도 순)"""
+    post = db.query(DBPost).options(undefer(DBPost.frame_hashes)).filter(DBPost.id == post_id).first()
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    # 게시물 저장 전 계산된 해시도 사용 (아직 인덱스에 없는 새 게시물)
+    record = post.frame_hashes or frame_hashes.get_record(post.video_id)
+    neighbors = visual_index.search(post.id, record, limit)
+    if not neighbors:
+        return []
+
+    scores = dict(neighbors)
+    posts = db.query(DBPost).options(joinedload(DBPost.author)).filter(DBPost.id.in_(scores)).all()
+    posts.sort(key=lambda p: scores[p.id], reverse=True)
+
+    favorited_post_ids = set()
+    if current_user:
+        from db_models import Favorite
+        favorited_post_ids = {row[0] for row in db.query(Favorite.post_id).filter(
+            Favorite.user_id == current_user.id,
+            Favorite.post_id.in_(scores)
+        )}
+
+    for p in posts:
+        if p.author:
+            p.author_name = p.author.name
+        p.is_favorited = p.id in favorited_post_ids
+        p.similarity = scores[p.id]
+    return posts
+
+
 @app.post("/api/posts/{post_id}/favorite")
 def toggle_favorite(
     post_id: int,
@@ -1060,10 +1098,23 @@ def delete_post(
     
     return {"status": "deleted", "post_id": post_id}
 
+def _group_posts_by_video(posts) -> dict:
+    """
+    영상 ID별 게시물 목록
+    video_id가 비어 있는 게시물(같은 영상 중복 게시물, 예전 URL 형식)은 URL에서 다시 추출한다 (예전 파서 방식 포함).
+    """
+    post_map = {}
+    for post in posts:
+        vid = post.video_id or extract_video_id_lenient(post.url)
+        if vid:
+            post_map.setdefault(vid, []).append(post)
+    return post_map
+
+
 @app.post("/api/admin/update-views")
 def update_all_views(
     current_user: User = Depends(get_current_approved_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)  # 전체 스캔은 복제본, 변경분 commit은 primary
 ):
     """관리자용: 모든 게시물의 조회수 강제 업데이트"""
     if not current_user.is_admin:
@@ -1071,21 +1122,8 @@ def update_all_views(
     
     try:
         posts = db.query(DBPost).all()
-        video_ids = []
-        post_map = {}
-        
-        for post in posts:
-            vid = None
-            if 'v=' in post.url:
-                vid = post.url.split('v=')[1].split('&')[0]
-            elif 'youtu.be/' in post.url:
-                vid = post.url.split('youtu.be/')[1].split('?')[0]
-            elif 'shorts/' in post.url:
-                vid = post.url.split('shorts/')[1].split('?')[0]
-                
-            if vid:
-                video_ids.append(vid)
-                post_map[vid] = post
+        post_map = _group_posts_by_video(posts)
+        video_ids = list(post_map)
         
         updated_count = 0
         if video_ids:
@@ -1094,8 +1132,7 @@ def update_all_views(
             view_counts = update_view_counts_batch(video_ids)
             
             for vid, count in view_counts.items():
-                if vid in post_map:
-                    post = post_map[vid]
+                for post in post_map.get(vid, []):
                     if post.view_count != count:
                         post.view_count = count
                         updated_count += 1
@@ -1372,34 +1409,21 @@ def run_daily_scheduler():
             print("🔄 Running daily view count update...")
             # DB 세션 생성 및 업데이트 로직 실행
             # 주의: 여기서는 app context 외부이므로 새로운 세션을 만들어야 함
-            from database import SessionLocal
+            # 라우팅 세션: 전체 게시물 스캔은 복제본에서, 조회수 변경 commit은 primary로
+            from database import ReadSessionLocal
             from youtube_service import update_view_counts_batch
             
-            db = SessionLocal()
+            db = ReadSessionLocal()
             try:
                 posts = db.query(DBPost).all()
-                video_ids = []
-                post_map = {}
-                
-                for post in posts:
-                    vid = None
-                    if 'v=' in post.url:
-                        vid = post.url.split('v=')[1].split('&')[0]
-                    elif 'youtu.be/' in post.url:
-                        vid = post.url.split('youtu.be/')[1].split('?')[0]
-                    elif 'shorts/' in post.url:
-                        vid = post.url.split('shorts/')[1].split('?')[0]
-                        
-                    if vid:
-                        video_ids.append(vid)
-                        post_map[vid] = post
+                post_map = _group_posts_by_video(posts)
+                video_ids = list(post_map)
                 
                 if video_ids:
                     view_counts = update_view_counts_batch(video_ids)
                     updated_count = 0
                     for vid, count in view_counts.items():
-                        if vid in post_map:
-                            post = post_map[vid]
+                        for post in post_map.get(vid, []):
                             if post.view_count != count:
                                 post.view_count = count
                                 updated_count += 1
@@ -1417,6 +1441,8 @@ async def startup_event():
     # 백그라운드 스레드로 스케줄러 실행
     thread = threading.Thread(target=run_daily_scheduler, daemon=True)
     thread.start()
+    # 첫 요청이 yt-dlp 초기화를 기다리지 않도록
+    threading.Thread(target=warm_extractors, daemon=True).start()
 
 if __name__ == "__main__":
     import uvicorn
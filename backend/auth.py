@@ -4,9 +4,11 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from db_config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
-from database import get_db
+from database import get_read_db, get_async_db
 from db_models import User
 
 # 비밀번호 해싱
@@ -42,7 +44,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> User:
     """현재 로그인한 사용자 가져오기"""
     credentials_exception = HTTPException(
@@ -92,7 +94,7 @@ def get_current_admin_user(current_user: User = Depends(get_current_user)) -> Us
 
 def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> Optional[User]:
     """로그인한 경우 사용자 반환, 아니면 None"""
     if not credentials:
@@ -119,3 +121,58 @@ def get_current_user_optional(
     user = db.query(User).filter(User.email == email).first()
     print(f"DEBUG: User found: {user}")
     return user
+
+
+# ========================================
+# 비동기 의존성 (async 엔드포인트용)
+# ========================================
+
+def decode_token_email(token: str) -> Optional[str]:
+    """JWT 토큰에서 이메일(sub) 추출, 실패 시 None"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+async def get_current_user_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """현재 로그인한 사용자 가져오기 (비동기 세션)"""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    if not credentials:
+        raise credentials_exception
+
+    email = decode_token_email(credentials.credentials)
+    if email is None:
+        raise credentials_exception
+
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
+    if user is None:
+        raise credentials_exception
+
+    return user
+
+
+async def get_current_user_optional_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[User]:
+    """로그인한 경우 사용자 반환, 아니면 None (비동기 세션)"""
+    if not credentials:
+        return None
+
+    email = decode_token_email(credentials.credentials)
+    if email is None:
+        return None
+
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
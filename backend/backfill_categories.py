@@ -0,0 +1,165 @@
+"""
+카테고리 JSON 컬럼 정규화 백필 (온라인, 재개 가능)
+
+카테고리 컬럼에는 실제 JSON 배열, JSON 문자열, 이중 인코딩된 리스트가 섞여 있다.
+(fix_double_json.py 참고) 이 스크립트는 5개 카테고리 컬럼을 모두
+"문자열 ID의 JSON 배열" 하나의 형태로 다시 쓴다.
+
+- 작은 배치 단위로 commit 하므로 테이블을 오래 잠그지 않음
+- 진행 상황(last_id)을 backfill_progress 테이블에 기록하여 중단 후 재개 가능
+- 완료되면 get_posts / get_post 의 행 단위 보정 루프를 건너뜀
+
+사용법:
+  python backfill_categories.py                 # 실행 / 재개
+  python backfill_categories.py --batch-size 500 --pause 0.05
+  python backfill_categories.py --restart       # 처음부터 다시
+"""
+import json
+import time
+import argparse
+from typing import List
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import select, update
+
+from database import SessionLocal
+from db_models import Post, BackfillProgress
+
+BACKFILL_NAME = "normalize_categories"
+
+CATEGORY_COLUMNS = [
+    'industry_categories',
+    'genre_categories',
+    'cast_categories',
+    'mood_categories',
+    'editing_categories',
+]
+
+
+def normalize_categories(value) -> List[str]:
+    """
+    카테고리 값을 문자열 리스트로 정규화
+    예) '["a"]' -> ['a'], ['["a","b"]'] -> ['a', 'b'], [1, 2] -> ['1', '2'], None -> []
+    """
+    # JSON 문자열 (여러 번 인코딩된 경우 포함) 풀기
+    for _ in range(3):
+        if not isinstance(value, str):
+            break
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+
+    if not isinstance(value, list):
+        return []
+
+    result = []
+    for item in value:
+        # 이중 인코딩: 리스트 안에 JSON 배열 문자열이 들어있는 경우
+        if isinstance(item, str) and item.startswith("["):
+            try:
+                inner = json.loads(item)
+                if isinstance(inner, list):
+                    result.extend(str(x) for x in inner)
+                    continue
+            except ValueError:
+                pass
+        if item is None:
+            continue
+        result.append(str(item))
+    return result
+
+
+def is_backfill_complete() -> bool:
+    """백필 완료 여부 (테이블이 없거나 확인 실패 시 False)"""
+    db = SessionLocal()
+    try:
+        progress = db.get(BackfillProgress, BACKFILL_NAME)
+        return bool(progress and progress.completed)
+    except Exception as e:
+        print(f"⚠️ Backfill status check failed: {e}")
+        return False
+    finally:
+        db.close()
+
+
+def run_backfill(batch_size: int = 200, pause: float = 0.1, restart: bool = False):
+    """id 순서대로 배치 단위 정규화 (배치마다 commit + 진행 상황 기록)"""
+    db = SessionLocal()
+    try:
+        progress = db.get(BackfillProgress, BACKFILL_NAME)
+        if progress is None:
+            progress = BackfillProgress(name=BACKFILL_NAME, last_id=0, completed=False)
+            db.add(progress)
+            db.commit()
+        elif restart:
+            progress.last_id = 0
+            progress.completed = False
+            db.commit()
+
+        if progress.completed:
+            print("✅ Backfill already completed. Use --restart to run again.")
+            return
+
+        print(f"🔄 Normalizing category columns from post id > {progress.last_id}...")
+        columns = [getattr(Post, c) for c in CATEGORY_COLUMNS]
+        total_updated = 0
+
+        while True:
+            rows = db.execute(
+                select(Post.id, *columns)
+                .where(Post.id > progress.last_id)
+                .order_by(Post.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            batch_updated = 0
+            for row in rows:
+                values = {}
+                for col_name, raw in zip(CATEGORY_COLUMNS, row[1:]):
+                    normalized = normalize_categories(raw)
+                    if raw != normalized:
+                        values[col_name] = normalized
+                if values:
+                    # 형식만 바꾸는 작업이므로 onupdate로 수정 시각이 바뀌지 않도록 현재 값 유지
+                    db.execute(
+                        update(Post)
+                        .where(Post.id == row.id)
+                        .values(**values, updated_at=Post.updated_at)
+                    )
+                    batch_updated += 1
+
+            # 배치 결과와 진행 상황을 같은 트랜잭션으로 commit
+            progress.last_id = rows[-1].id
+            db.commit()
+            total_updated += batch_updated
+            print(f"   ✅ Batch up to id {progress.last_id}: {batch_updated} rows updated")
+
+            if pause:
+                time.sleep(pause)
+
+        progress.completed = True
+        db.commit()
+        print(f"✅ Backfill completed: {total_updated} rows updated")
+        print("ℹ️ Restart the API workers to skip per-row category repair.")
+
+    except Exception as e:
+        print(f"❌ Backfill failed (progress saved, re-run to resume): {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize category JSON columns")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--pause", type=float, default=0.1, help="배치 사이 대기 (초)")
+    parser.add_argument("--restart", action="store_true", help="처음부터 다시 실행")
+    args = parser.parse_args()
+
+    run_backfill(batch_size=args.batch_size, pause=args.pause, restart=args.restart)
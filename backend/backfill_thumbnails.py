@@ -0,0 +1,103 @@
+"""
+썸네일 파생 이미지 / 자리표시자 백필 (온라인, 재개 가능)
+
+thumbnail_variants / blurhash 가 없는 기존 게시물의 썸네일을 받아
+크기별 WebP / JPEG와 자리표시자를 만든다. (새 게시물은 생성 시 thumbnail_store.submit으로 처리)
+
+- 서버 워커가 아니라 배포 후 이 스크립트로 한 번만 실행
+- 진행 상황(last_id)을 backfill_progress 테이블에 기록하여 중단 후 재개 가능
+- 썸네일을 받지 못한 게시물은 건너뛰고 계속 진행 (--restart로 다시 시도)
+
+사용법:
+  python backfill_thumbnails.py                 # 실행 / 재개
+  python backfill_thumbnails.py --batch-size 50 --pause 0.5
+  python backfill_thumbnails.py --restart       # 처음부터 다시
+"""
+import time
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import select, or_
+
+from database import SessionLocal
+from db_models import Post, BackfillProgress
+import thumbnail_store
+
+BACKFILL_NAME = "thumbnail_variants"
+
+
+def run_backfill(batch_size: int = 50, pause: float = 0.5, restart: bool = False):
+    """id 순서대로 배치 단위 생성 (배치마다 진행 상황 기록)"""
+    db = SessionLocal()
+    try:
+        progress = db.get(BackfillProgress, BACKFILL_NAME)
+        if progress is None:
+            progress = BackfillProgress(name=BACKFILL_NAME, last_id=0, completed=False)
+            db.add(progress)
+            db.commit()
+        elif restart:
+            progress.last_id = 0
+            progress.completed = False
+            db.commit()
+
+        if progress.completed:
+            print("✅ Backfill already completed. Use --restart to run again.")
+            return
+
+        print(f"🔄 Generating thumbnail variants from post id > {progress.last_id}...")
+        total_generated = 0
+        total_failed = 0
+
+        while True:
+            rows = db.execute(
+                select(Post.id, Post.video_id, Post.thumbnail)
+                .where(
+                    Post.id > progress.last_id,
+                    Post.video_id.isnot(None),
+                    or_(Post.thumbnail_variants.is_(None), Post.blurhash.is_(None)),
+                )
+                .order_by(Post.id)
+                .limit(batch_size)
+            ).all()
+            # 읽기 트랜잭션을 닫고 처리 (process_post가 다른 세션으로 씀)
+            db.commit()
+            if not rows:
+                break
+
+            for row in rows:
+                try:
+                    thumbnail_store.process_post(row.id, row.video_id, row.thumbnail)
+                    total_generated += 1
+                except Exception as e:
+                    total_failed += 1
+                    print(f"   ⚠️ Post {row.id} skipped: {e}")
+
+            progress.last_id = rows[-1].id
+            db.commit()
+            print(f"   ✅ Batch up to id {progress.last_id}: {len(rows)} posts processed")
+
+            if pause:
+                time.sleep(pause)
+
+        progress.completed = True
+        db.commit()
+        print(f"✅ Backfill completed: {total_generated} posts generated, {total_failed} skipped")
+
+    except Exception as e:
+        print(f"❌ Backfill failed (progress saved, re-run to resume): {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate missing thumbnail variants and placeholders")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--pause", type=float, default=0.5, help="배치 사이 대기 (초)")
+    parser.add_argument("--restart", action="store_true", help="처음부터 다시 실행")
+    args = parser.parse_args()
+
+    run_backfill(batch_size=args.batch_size, pause=args.pause, restart=args.restart)
@@ -1,7 +1,9 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url, Insert, Update, Delete
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 
 # 1. 환경 변수 직접 가져오기 (db_config 의존성 제거)
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -17,14 +19,71 @@ DATABASE_URL = DATABASE_URL.strip()
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# 3-1. 읽기 전용 복제본 (옵션, Postgres 전용)
+DATABASE_READ_URL = (os.getenv("DATABASE_READ_URL") or "").strip() or None
+if DATABASE_READ_URL and DATABASE_READ_URL.startswith("postgres://"):
+    DATABASE_READ_URL = DATABASE_READ_URL.replace("postgres://", "postgresql://", 1)
+
 # 4. 엔진 생성
 print(f"✅ DB 연결 시도: {DATABASE_URL[:10]}...")  # 로그 확인용 (앞부분만 출력)
 
-if DATABASE_URL.startswith("sqlite"):
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+# 인메모리 DB는 WAL / 별도 읽기 풀을 쓸 수 없음
+IS_SQLITE_FILE = IS_SQLITE and ":memory:" not in DATABASE_URL and DATABASE_URL != "sqlite://"
+
+# SQLite 프로덕션 프로파일 ("database is locked" 방지)
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # 256MB
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-64000"))  # 음수 = KiB 단위 (약 64MB)
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "5"))
+SQLITE_WRITE_WAIT_SECONDS = float(os.getenv("SQLITE_WRITE_WAIT_SECONDS", "30"))  # 쓰기 커넥션을 기다리는 최대 시간
+
+
+def apply_sqlite_pragmas(engine_, read_only: bool = False):
+    """SQLite 연결마다 WAL / busy_timeout 등 PRAGMA 적용"""
+    @event.listens_for(engine_, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            # WAL: 읽기는 쓰기를 기다리지 않고, 쓰기도 읽기를 기다리지 않음
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+if IS_SQLITE_FILE:
+    # 쓰기 엔진: 단일 커넥션 (SQLite는 한 번에 한 트랜잭션만 쓸 수 있으므로 쓰기를 프로세스 안에서 직렬화)
+    # 여러 커넥션이 쓰기 락을 두고 경쟁하면 "database is locked"가 나므로 풀에서 순서대로 대기한다.
+    # 조회는 읽기 엔진으로 가므로, 쓰기 세션은 짧게 쓰고 바로 commit / close 해야 한다.
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=SQLITE_WRITE_WAIT_SECONDS,
+    )
+    apply_sqlite_pragmas(engine)
+
+    # 읽기 엔진: 읽기 전용 커넥션 풀 (GET 핸들러용)
+    read_engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=SQLITE_READ_POOL_SIZE,
+        max_overflow=SQLITE_READ_POOL_SIZE * 2,
+    )
+    apply_sqlite_pragmas(read_engine, read_only=True)
+elif IS_SQLITE:
     engine = create_engine(
         DATABASE_URL, 
         connect_args={"check_same_thread": False}
     )
+    read_engine = engine
 else:
     engine = create_engine(
         DATABASE_URL,
@@ -32,8 +91,42 @@ else:
         pool_size=10,
         max_overflow=20
     )
+    if DATABASE_READ_URL:
+        print(f"✅ 읽기 복제본 사용: {DATABASE_READ_URL[:10]}...")
+        read_engine = create_engine(
+            DATABASE_READ_URL,
+            pool_pre_ping=True,
+            pool_size=10,
+            max_overflow=20
+        )
+    else:
+        read_engine = engine
+
+
+class RoutingSession(Session):
+    """
+    읽기/쓰기 라우팅 세션
+    - SELECT: read_engine (복제본 / SQLite 읽기 풀)
+    - flush 및 INSERT/UPDATE/DELETE: engine (primary)
+    - 한 번이라도 쓴 세션은 이후 읽기도 primary로 고정 (read-your-writes)
+    """
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or self.info.get("wrote"):
+            return engine
+        if isinstance(clause, (Insert, Update, Delete, TextClause)):
+            # 원시 SQL은 쓰기 여부를 알 수 없으므로 primary로 보냄
+            self.info["wrote"] = True
+            return engine
+        return read_engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_session_wrote(session, flush_context):
+    session.info["wrote"] = True
+
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
 Base = declarative_base()
 
 def get_db():
@@ -42,3 +135,69 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """읽기 위주 세션 (GET 핸들러 / 스캔용, 쓰기는 primary로 라우팅)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# 5. 비동기 엔진 (읽기 전용 엔드포인트용)
+# 동기 핸들러는 DB 대기 동안 스레드풀 슬롯을 점유하므로,
+# 피드/상세 조회는 이벤트 루프 위에서 asyncpg / aiosqlite 로 처리한다.
+# asyncpg는 libpq 전용 쿼리 파라미터를 모르므로 (connect() TypeError) 변환하거나 제거한다.
+# sslmode=require → ssl=require (asyncpg도 같은 모드 이름 사용)
+_ASYNCPG_RENAMED_PARAMS = {"sslmode": "ssl"}
+_ASYNCPG_UNSUPPORTED_PARAMS = ("channel_binding",)
+
+
+def to_async_url(url: str) -> str:
+    """동기 드라이버 URL을 비동기 드라이버 URL로 변환"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if not url.startswith(("postgresql://", "postgresql+psycopg2://")):
+        return url
+
+    parsed = make_url(url)
+    query = {}
+    for key, value in parsed.query.items():
+        if key in _ASYNCPG_UNSUPPORTED_PARAMS:
+            continue
+        query[_ASYNCPG_RENAMED_PARAMS.get(key, key)] = value
+    parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    return parsed.render_as_string(hide_password=False)
+
+
+# 비동기 엔진은 읽기 전용이므로 복제본이 있으면 복제본에 연결
+ASYNC_DATABASE_URL = to_async_url(DATABASE_READ_URL if DATABASE_READ_URL and not IS_SQLITE else DATABASE_URL)
+
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        connect_args={"check_same_thread": False}
+    )
+    if IS_SQLITE_FILE:
+        # 비동기 엔진은 읽기 엔드포인트 전용이므로 읽기 프로파일 적용
+        apply_sqlite_pragmas(async_engine.sync_engine, read_only=True)
+else:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20
+    )
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
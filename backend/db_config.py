@@ -16,3 +16,84 @@ REDIS_URL = os.getenv("REDIS_URL", None)
 
 # Frame Cache Configuration
 FRAME_CACHE_EXPIRE_SECONDS = int(os.getenv("FRAME_CACHE_EXPIRE_SECONDS", "300"))
+# 프로세스 내 L1 캐시 (Redis 앞단, Redis 미설정 시에도 동작)
+FRAME_L1_CACHE_MAX_BYTES = int(os.getenv("FRAME_L1_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64MB
+FRAME_L1_CACHE_TTL_SECONDS = int(os.getenv("FRAME_L1_CACHE_TTL_SECONDS", str(FRAME_CACHE_EXPIRE_SECONDS)))
+
+# Frame Extraction Configuration
+# seek: 직접 미디어 URL에 ffmpeg HTTP range 탐색 (필요한 프레임만 디코딩)
+# stream: ffmpeg가 360p 미디어를 순차로 읽으며 필요한 프레임만 파이프로 출력 (임시 파일 없음)
+FRAME_EXTRACTION_MODE = os.getenv("FRAME_EXTRACTION_MODE", "seek")
+# stream 방식으로 처음부터 읽을 최대 영상 길이 (더 길면 타임스탬프별 구간 탐색 + 스토리보드 이미지)
+FRAME_STREAM_MAX_SECONDS = int(os.getenv("FRAME_STREAM_MAX_SECONDS", "180"))
+
+# 영상별로 한 번 추출하는 고정 위치 프레임 수 (요청한 count는 이 세트에서 선택)
+FRAME_SUPERSET_SIZE = int(os.getenv("FRAME_SUPERSET_SIZE", "12"))
+
+# 프레임 위치 선택
+# scene: 장면 전환 분석으로 서로 다른 장면의 선명한 프레임 선택 (로컬에 캐시된 영상만, 처음 보는 영상은 균등 간격)
+# scene_remote: 처음 보는 짧은 영상도 원격 스트림 키프레임으로 장면 분석 (예산 안에 다 읽지 못하면 균등 간격)
+# even: 균등 간격
+FRAME_SELECTION_MODE = os.getenv("FRAME_SELECTION_MODE", "scene")
+FRAME_SCENE_BUDGET_SECONDS = float(os.getenv("FRAME_SCENE_BUDGET_SECONDS", "2.0"))  # 영상당 분석 시간 상한
+
+# 지각 해시(pHash + dHash) 해밍 거리가 이 값 이하이면 거의 같은 프레임으로 보고 제외 (64비트 중)
+FRAME_HASH_DISTANCE = int(os.getenv("FRAME_HASH_DISTANCE", "10"))
+FRAME_HASH_EXPIRE_SECONDS = int(os.getenv("FRAME_HASH_EXPIRE_SECONDS", "86400"))  # 게시물 등록 전 해시 보관 시간
+
+# 시각 유사 게시물 검색 (NumPy 인덱스 재생성 주기, 점수 중 해시 비중 / 나머지는 색·구도)
+VISUAL_INDEX_REFRESH_SECONDS = int(os.getenv("VISUAL_INDEX_REFRESH_SECONDS", "300"))
+VISUAL_HASH_WEIGHT = float(os.getenv("VISUAL_HASH_WEIGHT", "0.6"))
+
+# keyframe: 키프레임만 디코딩 (랜덤 프레임처럼 정확한 위치가 필요 없을 때, CPU 절약, stream 방식은 항상 exact)
+# exact: 요청한 타임스탬프의 정확한 프레임
+FRAME_SEEK_PRECISION = os.getenv("FRAME_SEEK_PRECISION", "keyframe")
+
+# Frame Encoding Configuration (기본값, /api/youtube/frames 쿼리로 변경 가능)
+FRAME_FORMAT = os.getenv("FRAME_FORMAT", "jpeg")  # jpeg | webp | png
+FRAME_QUALITY = int(os.getenv("FRAME_QUALITY", "80"))  # JPEG/WebP 품질 (1-100)
+FRAME_MAX_WIDTH = int(os.getenv("FRAME_MAX_WIDTH", "640"))  # 최대 가로 픽셀 (0이면 원본)
+
+# yt-dlp 인스턴스 풀 (옵션 조합별로 초기화된 인스턴스 재사용)
+YDL_POOL_SIZE = int(os.getenv("YDL_POOL_SIZE", "2"))  # 옵션 조합당 보관할 유휴 인스턴스 수
+YDL_POOL_MAX_USES = int(os.getenv("YDL_POOL_MAX_USES", "100"))  # 이만큼 사용하면 새 인스턴스로 교체
+YDL_PLAYER_CACHE_SIZE = int(os.getenv("YDL_PLAYER_CACHE_SIZE", "4"))  # 인스턴스당 보관할 플레이어 스크립트 수
+
+# Single-flight (같은 영상 동시 추출 시 한 워커만 실행, Redis 락)
+FRAME_LOCK_TTL_SECONDS = int(os.getenv("FRAME_LOCK_TTL_SECONDS", "120"))  # 락 자동 만료 (워커가 죽은 경우)
+FRAME_LOCK_WAIT_SECONDS = int(os.getenv("FRAME_LOCK_WAIT_SECONDS", "90"))  # 다른 워커 결과를 기다리는 최대 시간
+
+# Media Cache Configuration (저해상도 영상 디스크 LRU, 재추출 시 네트워크 없이 디코딩)
+MEDIA_CACHE_DIR = os.getenv("MEDIA_CACHE_DIR", "./media_cache")
+MEDIA_CACHE_MAX_BYTES = int(os.getenv("MEDIA_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))  # 2GB (0이면 사용 안 함)
+MEDIA_CACHE_MAX_AGE_SECONDS = int(os.getenv("MEDIA_CACHE_MAX_AGE_SECONDS", "86400"))  # 이 시간 동안 사용 안 하면 만료
+MEDIA_CACHE_MAX_DURATION_SECONDS = int(os.getenv("MEDIA_CACHE_MAX_DURATION_SECONDS", "900"))  # 이보다 긴 영상은 캐시 안 함
+MEDIA_CACHE_MIN_REQUESTS = int(os.getenv("MEDIA_CACHE_MIN_REQUESTS", "2"))  # 이만큼 요청된 영상만 캐시 (처음 보는 영상은 받지 않음)
+
+# YouTube 메타데이터 캐시 (게시물 생성 / AI 분석 시 같은 영상의 oEmbed·yt-dlp 재호출 방지)
+METADATA_CACHE_EXPIRE_SECONDS = int(os.getenv("METADATA_CACHE_EXPIRE_SECONDS", "86400"))
+METADATA_L1_CACHE_MAX_BYTES = int(os.getenv("METADATA_L1_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))  # 프로세스 내 L1 (4MB)
+
+# Pre-warm Configuration (게시물 생성 후 프레임 세트 / 저해상도 영상을 미리 추출, 부하 시 생략)
+PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "true").lower() == "true"
+PREWARM_MAX_LOAD = float(os.getenv("PREWARM_MAX_LOAD", "0.75"))  # CPU당 1분 평균 부하가 이보다 높으면 대기
+PREWARM_RETRY_SECONDS = int(os.getenv("PREWARM_RETRY_SECONDS", "30"))  # 바쁠 때 다시 확인하는 간격
+PREWARM_ATTEMPTS = int(os.getenv("PREWARM_ATTEMPTS", "4"))  # 이만큼 확인해도 바쁘면 생략
+
+# Frame Store Configuration (추출한 프레임 파일 저장 위치, /api/frames/... 로 제공)
+FRAME_STORE_DIR = os.getenv("FRAME_STORE_DIR", "./frame_store")
+FRAME_STORE_MAX_BYTES = int(os.getenv("FRAME_STORE_MAX_BYTES", str(1024 * 1024 * 1024)))  # 1GB, LRU 삭제 (0이면 제한 없음)
+
+# Thumbnail Store Configuration (게시물 썸네일 크기별 WebP/JPEG, /api/thumbnails/... 로 제공)
+THUMBNAIL_STORE_DIR = os.getenv("THUMBNAIL_STORE_DIR", "./thumbnail_store")
+THUMBNAIL_CARD_WIDTH = int(os.getenv("THUMBNAIL_CARD_WIDTH", "320"))  # 목록 카드
+THUMBNAIL_DETAIL_WIDTH = int(os.getenv("THUMBNAIL_DETAIL_WIDTH", "640"))  # 상세 화면
+
+# Extraction Pool Configuration (프레임 추출 전용 워커 풀)
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "2"))  # 동시 추출 수
+EXTRACTION_QUEUE_DEPTH = int(os.getenv("EXTRACTION_QUEUE_DEPTH", "8"))  # 대기열 길이 (초과 시 503)
+EXTRACTION_RETRY_AFTER_SECONDS = int(os.getenv("EXTRACTION_RETRY_AFTER_SECONDS", "10"))  # 통계가 없을 때 Retry-After
+
+# Frame Job Configuration (POST /api/youtube/frames/jobs, 추출은 위 워커 풀에서 실행)
+FRAME_JOB_TTL_SECONDS = int(os.getenv("FRAME_JOB_TTL_SECONDS", "3600"))  # 작업 결과 보관 시간
+FRAME_JOB_STALE_SECONDS = int(os.getenv("FRAME_JOB_STALE_SECONDS", "600"))  # 이 시간 동안 갱신 없으면 실패 처리
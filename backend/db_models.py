@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database import Base
 
@@ -32,8 +32,12 @@ class Post(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, unique=True, nullable=False, index=True)
+    video_id = Column(String, unique=True, index=True)  # YouTube 영상 ID (video_ids.extract_video_id)
     title = Column(String, nullable=False)
     thumbnail = Column(String)  # 썸네일 URL
+    thumbnail_variants = Column(JSON)  # 크기별 WebP/JPEG 파생 이미지 URL (thumbnail_store)
+    blurhash = Column(String)  # 썸네일 자리표시자 (placeholders)
+    dominant_color = Column(String)  # 썸네일 대표 색 '#rrggbb'
     platform = Column(String, default="youtube")
     video_type = Column(String, nullable=False)  # 'long' or 'short'
     industry_categories = Column(JSON, default=list)  # 업종 (Industry)
@@ -50,6 +54,8 @@ class Post(Base):
 
     author = relationship("User", back_populates="posts")
     view_count = Column(Integer, default=0)
+    # 프레임 / 썸네일 지각 해시 (frame_hashes 모듈 기록 형식, 목록 조회에서는 읽지 않음)
+    frame_hashes = deferred(Column(JSON))
 
 
 class Favorite(Base):
@@ -65,3 +71,37 @@ class Favorite(Base):
 
 User.favorites = relationship("Favorite", back_populates="user")
 Post.favorites = relationship("Favorite", back_populates="post")
+
+
+class SchemaVersion(Base):
+    """적용된 마이그레이션 기록 (migrations.py)"""
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class BackfillProgress(Base):
+    """온라인 백필 진행 상황 (재개용)"""
+    __tablename__ = "backfill_progress"
+
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, default=0, nullable=False)
+    completed = Column(Boolean, default=False, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class FrameJob(Base):
+    """비동기 프레임 추출 작업 (Redis 미설정 시 저장소, frame_jobs.py)"""
+    __tablename__ = "frame_jobs"
+
+    id = Column(String, primary_key=True)
+    video_key = Column(String, index=True, nullable=False)
+    url = Column(String, nullable=False)
+    count = Column(Integer, nullable=False)
+    status = Column(String, nullable=False, default="pending")
+    result = Column(Text)  # 프레임 목록 JSON
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,129 @@
+"""
+프레임 추출 전용 워커 풀 (상한 + 대기열 제한)
+
+추출 / 다운로드를 요청 처리 스레드에서 직접 실행하지 않고 이 풀에서만 실행한다.
+- 동시 실행 수: EXTRACTION_WORKERS
+- 대기열 길이: EXTRACTION_QUEUE_DEPTH (가득 차면 ExtractionQueueFull → API는 503 + Retry-After)
+- 같은 작업(같은 영상의 프레임 세트)은 submit_coalesced로 합쳐 워커 하나만 사용
+- 대기열 길이 / 대기 시간 / 실행 시간 통계 제공 (get_metrics)
+"""
+import math
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable
+
+from db_config import EXTRACTION_WORKERS, EXTRACTION_QUEUE_DEPTH, EXTRACTION_RETRY_AFTER_SECONDS
+
+
+class ExtractionQueueFull(Exception):
+    """대기열이 가득 참 (retry_after: 권장 재시도 대기 시간, 초)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Extraction queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+_executor = ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS, thread_name_prefix="extract")
+_lock = threading.Lock()
+_inflight = {}  # submit_coalesced 키 -> Future
+_inflight_lock = threading.Lock()
+_metrics = {
+    "queued": 0,
+    "running": 0,
+    "submitted": 0,
+    "completed": 0,
+    "failed": 0,
+    "rejected": 0,
+    "joined": 0,
+    "total_wait_seconds": 0.0,
+    "max_wait_seconds": 0.0,
+    "total_run_seconds": 0.0,
+}
+
+
+def _retry_after() -> int:
+    """평균 실행 시간과 대기열 길이로 재시도 시간 추정 (통계가 없으면 설정값)"""
+    done = _metrics["completed"] + _metrics["failed"]
+    if not done:
+        return EXTRACTION_RETRY_AFTER_SECONDS
+    avg_run = _metrics["total_run_seconds"] / done
+    return max(1, math.ceil(avg_run * (_metrics["queued"] + 1) / EXTRACTION_WORKERS))
+
+
+def submit(fn: Callable, *args, **kwargs) -> Future:
+    """추출 작업 등록 (대기열이 가득 차면 ExtractionQueueFull)"""
+    with _lock:
+        # 실행 중 + 대기 중 작업 수로 판단 (작업이 시작되기 전의 순간에도 정확)
+        if _metrics["queued"] + _metrics["running"] >= EXTRACTION_WORKERS + EXTRACTION_QUEUE_DEPTH:
+            _metrics["rejected"] += 1
+            raise ExtractionQueueFull(_retry_after())
+        _metrics["queued"] += 1
+        _metrics["submitted"] += 1
+
+    submitted_at = time.monotonic()
+
+    def task():
+        started_at = time.monotonic()
+        wait = started_at - submitted_at
+        with _lock:
+            _metrics["queued"] -= 1
+            _metrics["running"] += 1
+            _metrics["total_wait_seconds"] += wait
+            _metrics["max_wait_seconds"] = max(_metrics["max_wait_seconds"], wait)
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with _lock:
+                _metrics["running"] -= 1
+                _metrics["completed" if ok else "failed"] += 1
+                _metrics["total_run_seconds"] += time.monotonic() - started_at
+
+    return _executor.submit(task)
+
+
+def submit_coalesced(key: str, fn: Callable, *args, **kwargs) -> Future:
+    """
+    같은 key의 작업이 이미 대기 / 실행 중이면 그 Future를 공유 (워커 슬롯을 차지하지 않음)
+    인기 영상에 요청이 몰려도 leader 하나만 워커를 쓰고 나머지는 결과만 기다린다.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            with _lock:
+                _metrics["joined"] += 1
+            return future
+        future = submit(fn, *args, **kwargs)
+        _inflight[key] = future
+
+    def forget(_):
+        with _inflight_lock:
+            if _inflight.get(key) is future:
+                del _inflight[key]
+
+    future.add_done_callback(forget)
+    return future
+
+
+def get_metrics() -> dict:
+    """대기열 길이 / 대기 시간 / 실행 시간 통계"""
+    with _lock:
+        started = _metrics["submitted"] - _metrics["queued"]
+        done = _metrics["completed"] + _metrics["failed"]
+        return {
+            "workers": EXTRACTION_WORKERS,
+            "queue_depth_limit": EXTRACTION_QUEUE_DEPTH,
+            "queued": _metrics["queued"],
+            "running": _metrics["running"],
+            "submitted": _metrics["submitted"],
+            "completed": _metrics["completed"],
+            "failed": _metrics["failed"],
+            "rejected": _metrics["rejected"],
+            "joined": _metrics["joined"],
+            "avg_wait_seconds": round(_metrics["total_wait_seconds"] / started, 3) if started else 0.0,
+            "max_wait_seconds": round(_metrics["max_wait_seconds"], 3),
+            "avg_run_seconds": round(_metrics["total_run_seconds"] / done, 3) if done else 0.0,
+        }
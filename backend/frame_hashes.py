@@ -0,0 +1,239 @@
+"""
+프레임 / 썸네일 지각 해시 (pHash + dHash, NumPy 벡터 연산)
+
+- 여러 프레임을 한 번에 해시: 32x32 흑백 축소 → DCT(행렬 곱) 저주파 8x8 → 중앙값 비교 (pHash),
+  9x8 축소 → 가로 인접 픽셀 비교 (dHash). 각각 64비트.
+- 두 해시 모두 해밍 거리가 FRAME_HASH_DISTANCE 이하이면 거의 같은 프레임으로 보고 하나만 남김
+  (검은 화면 반복, 정지 화면, 썸네일과 같은 장면 등)
+- 영상별 해시 기록은 프로세스 내 LRU + Redis에 잠시 보관하고, 게시물이 있으면 posts.frame_hashes에 저장
+  (미리보기 후 게시물 등록 시 / 이후 유사 영상 검색에서 재사용)
+- 색 / 구도 특징: 4x4 격자별 평균 Lab 색 (48차원), 유사 영상 검색(visual_index)에서 사용
+
+기록 형식: {"thumbnail": {"phash": hex, "dhash": hex, "layout": [48]} | None,
+           "frames": [{"t": 초, "phash": hex, "dhash": hex}, ...],
+           "layout": [48] (프레임 평균)}
+"""
+import json
+import base64
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from db_config import FRAME_HASH_DISTANCE, FRAME_HASH_EXPIRE_SECONDS
+from redis_cache import redis_client
+
+_RECENT_MAX = 512  # 프로세스 내에 보관할 영상 수
+
+# 32x32 DCT-II 정규직교 행렬 (pHash)
+_N = 32
+_k = np.arange(_N)
+_DCT = np.sqrt(2.0 / _N) * np.cos(np.pi * (2 * _k[None, :] + 1) * _k[:, None] / (2 * _N))
+_DCT[0] /= np.sqrt(2.0)
+_DCT = _DCT.astype(np.float32)
+
+_recent = OrderedDict()  # video_id -> 기록
+_recent_lock = threading.Lock()
+stats = {"hashed": 0, "dropped": 0, "persisted": 0}
+
+
+def _gray(frame: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+
+
+def _pack(bits: np.ndarray) -> np.ndarray:
+    """(n, 64) bool → (n, 8) uint8"""
+    return np.packbits(bits.reshape(len(bits), 64), axis=1)
+
+
+def compute_hashes(frames: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """프레임(BGR) 목록의 (pHash, dHash), 각각 (n, 8) uint8"""
+    if not frames:
+        empty = np.zeros((0, 8), np.uint8)
+        return empty, empty
+
+    grays = [_gray(f) for f in frames]
+    small = np.stack([cv2.resize(g, (_N, _N), interpolation=cv2.INTER_AREA) for g in grays]).astype(np.float32)
+    tiny = np.stack([cv2.resize(g, (9, 8), interpolation=cv2.INTER_AREA) for g in grays]).astype(np.float32)
+
+    # pHash: 모든 프레임의 2D DCT를 한 번에 (C @ X @ C^T), DC 제외 중앙값과 비교
+    low = (_DCT @ small @ _DCT.T)[:, :8, :8].reshape(len(frames), 64)
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    phash = _pack(low > median)
+
+    # dHash: 오른쪽 픽셀이 더 밝은지
+    dhash = _pack(tiny[:, :, 1:] > tiny[:, :, :-1])
+
+    stats["hashed"] += len(frames)
+    return phash, dhash
+
+
+def compute_layout(frames: List[np.ndarray]) -> np.ndarray:
+    """프레임(BGR) 목록의 4x4 격자 평균 Lab 색 (n, 48), 0~255"""
+    grids = np.stack([cv2.resize(f, (4, 4), interpolation=cv2.INTER_AREA) for f in frames])
+    lab = cv2.cvtColor(grids.reshape(-1, 4, 3), cv2.COLOR_BGR2LAB)  # 여러 프레임을 한 번에 변환
+    return lab.reshape(len(frames), 48)
+
+
+def _distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(n, 8) x (m, 8) 해시 간 해밍 거리 행렬 (n, m)"""
+    return np.unpackbits(a[:, None, :] ^ b[None, :, :], axis=2).sum(axis=2)
+
+
+def unique_indices(phash: np.ndarray, dhash: np.ndarray,
+                   exclude: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> List[int]:
+    """
+    거의 같은 프레임을 뺀 인덱스 (앞쪽 프레임 우선)
+    exclude: 이 해시와 비슷한 프레임도 제외 (예: 썸네일)
+    """
+    near = (_distances(phash, phash) <= FRAME_HASH_DISTANCE) & (_distances(dhash, dhash) <= FRAME_HASH_DISTANCE)
+    drop = np.zeros(len(phash), bool)
+    if exclude is not None:
+        drop |= ((_distances(phash, exclude[0]) <= FRAME_HASH_DISTANCE)
+                 & (_distances(dhash, exclude[1]) <= FRAME_HASH_DISTANCE)).any(axis=1)
+
+    keep = []
+    for i in range(len(phash)):
+        if drop[i]:
+            continue
+        keep.append(i)
+        drop |= near[i]
+    stats["dropped"] += len(phash) - len(keep)
+    return keep
+
+
+def to_hex(packed: np.ndarray) -> str:
+    return packed.tobytes().hex()
+
+
+def from_hex(values: List[str]) -> np.ndarray:
+    """hex 문자열 목록 → (n, 8) uint8"""
+    return np.frombuffer(bytes.fromhex("".join(values)), np.uint8).reshape(len(values), 8)
+
+
+def hash_image_bytes(data: bytes) -> Optional[dict]:
+    """인코딩된 이미지(JPEG 등) 해시 {"phash": hex, "dhash": hex, "layout": [48]} (디코딩 실패 시 None)"""
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    phash, dhash = compute_hashes([image])
+    return {"phash": to_hex(phash[0]), "dhash": to_hex(dhash[0]), "layout": compute_layout([image])[0].tolist()}
+
+
+def hash_data_url(data_url: Optional[str]) -> Optional[dict]:
+    """data URL 이미지 해시 (썸네일용)"""
+    if not data_url or "," not in data_url:
+        return None
+    try:
+        return hash_image_bytes(base64.b64decode(data_url.split(",", 1)[1]))
+    except ValueError:
+        return None
+
+
+# ========================================
+# 영상별 해시 기록
+# ========================================
+
+def get_record(video_id: Optional[str]) -> Optional[dict]:
+    """영상의 해시 기록 (프로세스 내 → Redis → 게시물에 저장된 기록)"""
+    if not video_id:
+        return None
+    with _recent_lock:
+        record = _recent.get(video_id)
+        if record is not None:
+            _recent.move_to_end(video_id)
+            return record
+
+    record = None
+    if redis_client:
+        try:
+            cached = redis_client.get(f"hashes:{video_id}")
+            record = json.loads(cached) if cached else None
+        except Exception as e:
+            print(f"[ERROR] Redis get error: {e}")
+    if record is None:
+        record = _load_persisted(video_id)
+    if record is not None:
+        _remember(video_id, record)
+    return record
+
+
+def _load_persisted(video_id: str) -> Optional[dict]:
+    from database import ReadSessionLocal
+    from db_models import Post
+
+    db = ReadSessionLocal()
+    try:
+        row = db.query(Post.frame_hashes).filter(Post.video_id == video_id).first()
+        return row[0] if row and row[0] else None
+    except Exception as e:
+        print(f"⚠️ Failed to load frame hashes for {video_id}: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def _remember(video_id: str, record: dict):
+    with _recent_lock:
+        _recent[video_id] = record
+        _recent.move_to_end(video_id)
+        while len(_recent) > _RECENT_MAX:
+            _recent.popitem(last=False)
+
+
+def save_record(video_id: Optional[str], frames: Optional[List[dict]] = None, thumbnail: Optional[dict] = None,
+                layout: Optional[List[int]] = None):
+    """영상별 해시 기록 갱신 (주어진 항목만 교체) 후 게시물에도 저장"""
+    if not video_id:
+        return
+    record = dict(get_record(video_id) or {"thumbnail": None, "frames": [], "layout": None})
+    if frames is not None:
+        record["frames"] = frames
+    if layout is not None:
+        record["layout"] = layout
+    if thumbnail is not None:
+        record["thumbnail"] = thumbnail
+    _remember(video_id, record)
+
+    if redis_client:
+        try:
+            redis_client.setex(f"hashes:{video_id}", FRAME_HASH_EXPIRE_SECONDS, json.dumps(record))
+        except Exception as e:
+            print(f"[ERROR] Redis set error: {e}")
+
+    _persist(video_id, record)
+
+
+def _persist(video_id: str, record: dict):
+    """이미 등록된 게시물이면 posts.frame_hashes 갱신 (없으면 게시물 생성 시 get_record로 저장됨)"""
+    from database import SessionLocal, ReadSessionLocal
+    from db_models import Post
+
+    # 게시물이 없는 영상(미리보기)은 primary에 쓰지 않음
+    db = ReadSessionLocal()
+    try:
+        post_id = db.query(Post.id).filter(Post.video_id == video_id).scalar()
+    except Exception as e:
+        print(f"⚠️ Failed to look up post for {video_id}: {e}")
+        return
+    finally:
+        db.close()
+    if post_id is None:
+        return
+
+    db = SessionLocal()
+    try:
+        # 해시 기록은 게시물 수정이 아니므로 onupdate로 수정 시각이 바뀌지 않도록 현재 값 유지
+        updated = db.query(Post).filter(Post.id == post_id).update(
+            {Post.frame_hashes: record, Post.updated_at: Post.updated_at}, synchronize_session=False
+        )
+        db.commit()
+        if updated:
+            stats["persisted"] += 1
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Failed to persist frame hashes for {video_id}: {e}")
+    finally:
+        db.close()
@@ -0,0 +1,207 @@
+"""
+비동기 프레임 추출 작업 (Job)
+
+POST /api/youtube/frames/jobs 가 작업 ID를 즉시 반환하고,
+실제 추출은 백그라운드 워커 스레드에서 실행한다.
+- 같은 영상에 대한 진행 중/완료 작업이 있으면 새 작업을 만들지 않음 (중복 제거)
+- 작업 상태는 Redis (설정 시) 또는 DB(frame_jobs 테이블)에 저장되어 모든 워커에서 조회 가능
+- 추출은 extraction_pool 에서 실행 (대기열이 가득 차면 ExtractionQueueFull)
+- 결과는 프레임 저장소 URL 목록만 저장 (/api/frames/..., 이미지 자체는 저장하지 않음)
+"""
+import json
+import uuid
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+from db_config import FRAME_JOB_TTL_SECONDS, FRAME_JOB_STALE_SECONDS
+from redis_cache import redis_client
+from database import SessionLocal
+from db_models import FrameJob
+from video_ids import extract_video_id
+import extraction_pool
+
+# 작업 상태
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_submit_lock = threading.Lock()  # 같은 프로세스 내 동시 등록 시 중복 작업 방지
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(dt: datetime) -> str:
+    # SQLite는 timezone 정보를 저장하지 않으므로 UTC로 간주
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.isoformat()
+
+
+def _video_key(url: str, count: int) -> str:
+    # 같은 영상의 다른 URL 형태도 하나의 작업으로 합침
+    # ':urls' - 결과가 data URL이던 예전 작업은 재사용하지 않음
+    return f"{extract_video_id(url) or url}:{count}:urls"
+
+
+def _is_stale(job: dict) -> bool:
+    """워커가 죽어서 끝나지 못한 작업인지 확인"""
+    if job["status"] not in (PENDING, RUNNING):
+        return False
+    updated_at = datetime.fromisoformat(job["updated_at"])
+    return (_now() - updated_at).total_seconds() > FRAME_JOB_STALE_SECONDS
+
+
+def _is_expired(job: dict) -> bool:
+    created_at = datetime.fromisoformat(job["created_at"])
+    return (_now() - created_at).total_seconds() > FRAME_JOB_TTL_SECONDS
+
+
+# ========================================
+# 저장소 (Redis / DB)
+# ========================================
+
+class _RedisJobStore:
+    """Redis 저장소: frame_job:{id} (작업), frame_job_video:{key} (영상별 최신 작업 ID)"""
+
+    def get(self, job_id: str) -> Optional[dict]:
+        raw = redis_client.get(f"frame_job:{job_id}")
+        return json.loads(raw) if raw else None
+
+    def save(self, job: dict):
+        redis_client.setex(f"frame_job:{job['job_id']}", FRAME_JOB_TTL_SECONDS, json.dumps(job))
+        redis_client.setex(f"frame_job_video:{job['video_key']}", FRAME_JOB_TTL_SECONDS, job['job_id'])
+
+    def find_by_video(self, video_key: str) -> Optional[dict]:
+        job_id = redis_client.get(f"frame_job_video:{video_key}")
+        return self.get(job_id) if job_id else None
+
+
+class _DBJobStore:
+    """DB 저장소 (Redis 미설정 시)"""
+
+    @staticmethod
+    def _to_dict(row: FrameJob) -> dict:
+        return {
+            "job_id": row.id,
+            "video_key": row.video_key,
+            "url": row.url,
+            "count": row.count,
+            "status": row.status,
+            "frames": json.loads(row.result) if row.result else None,
+            "error": row.error,
+            "created_at": _iso(row.created_at),
+            "updated_at": _iso(row.updated_at),
+        }
+
+    def get(self, job_id: str) -> Optional[dict]:
+        db = SessionLocal()
+        try:
+            row = db.get(FrameJob, job_id)
+            return self._to_dict(row) if row else None
+        finally:
+            db.close()
+
+    def save(self, job: dict):
+        db = SessionLocal()
+        try:
+            row = db.get(FrameJob, job["job_id"])
+            if row is None:
+                row = FrameJob(id=job["job_id"], video_key=job["video_key"], url=job["url"], count=job["count"])
+                db.add(row)
+            row.status = job["status"]
+            row.result = json.dumps(job["frames"]) if job.get("frames") is not None else None
+            row.error = job.get("error")
+            row.created_at = datetime.fromisoformat(job["created_at"])
+            row.updated_at = datetime.fromisoformat(job["updated_at"])
+            db.commit()
+        finally:
+            db.close()
+
+    def find_by_video(self, video_key: str) -> Optional[dict]:
+        db = SessionLocal()
+        try:
+            row = db.query(FrameJob).filter(FrameJob.video_key == video_key)\
+                    .order_by(FrameJob.created_at.desc()).first()
+            return self._to_dict(row) if row else None
+        finally:
+            db.close()
+
+
+_store = _RedisJobStore() if redis_client else _DBJobStore()
+
+
+# ========================================
+# 작업 실행 / 조회
+# ========================================
+
+def _run_job(job: dict):
+    """백그라운드 워커에서 실제 프레임 추출 실행 (결과는 /api/youtube/frames 와 같은 프레임 URL 목록)"""
+    from youtube_service import frame_url_superset, select_frames
+    import media_cache
+
+    media_cache.mark_wanted(extract_video_id(job["url"]))  # 작업으로 요청한 영상은 다시 추출될 가능성이 높음
+    job.update(status=RUNNING, updated_at=_now().isoformat())
+    _store.save(job)
+    try:
+        # /api/youtube/frames 와 같은 프레임 세트 (이미 이 풀의 워커이므로 직접 실행, 동시 요청과는 single_flight로 합쳐짐)
+        frames = select_frames(frame_url_superset(job["url"]), job["count"])
+        if frames:
+            job.update(status=DONE, frames=frames)
+        else:
+            job.update(status=FAILED, error="Failed to extract frames")
+    except Exception as e:
+        print(f"❌ Frame job {job['job_id']} failed: {e}")
+        job.update(status=FAILED, error=str(e))
+    job["updated_at"] = _now().isoformat()
+    _store.save(job)
+    print(f"🏁 Frame job {job['job_id']} finished: {job['status']}")
+
+
+def submit_frame_job(url: str, count: int) -> dict:
+    """
+    프레임 추출 작업 등록 (즉시 반환)
+    같은 영상의 진행 중 / 완료된 작업이 있으면 그 작업을 그대로 반환한다.
+    """
+    video_key = _video_key(url, count)
+    with _submit_lock:
+        existing = _store.find_by_video(video_key)
+        if existing and existing["status"] != FAILED and not _is_stale(existing) and not _is_expired(existing):
+            print(f"♻️ Reusing frame job {existing['job_id']} ({existing['status']})")
+            return existing
+
+        now = _now().isoformat()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "video_key": video_key,
+            "url": url,
+            "count": count,
+            "status": PENDING,
+            "frames": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        _store.save(job)
+        try:
+            extraction_pool.submit(_run_job, dict(job))
+        except extraction_pool.ExtractionQueueFull:
+            job.update(status=FAILED, error="Extraction queue is full", updated_at=_now().isoformat())
+            _store.save(job)
+            raise
+    print(f"📥 Frame job {job['job_id']} queued for {url}")
+    return job
+
+
+def get_frame_job(job_id: str) -> Optional[dict]:
+    """작업 조회 (워커가 죽어 멈춘 작업은 failed로 표시, 보관 시간이 지난 작업은 None)"""
+    job = _store.get(job_id)
+    if job and _is_expired(job):
+        # Redis는 TTL로 사라지지만 DB 행은 남아 있으므로 같은 기준으로 만료
+        return None
+    if job and _is_stale(job):
+        job.update(status=FAILED, error="Job timed out")
+    return job
@@ -0,0 +1,181 @@
+"""
+장면 전환 기반 프레임 위치 선택 (NumPy 벡터 연산)
+
+검은 화면 / 같은 컷 반복 / 전환 중 흐린 프레임 대신 서로 다른 장면의 선명한 프레임을 고른다.
+1. ffmpeg로 키프레임만 디코딩하여 초당 최대 1장, 64x36 RGB로 축소한 스트림을 파이프로 받음
+2. 프레임별 색 히스토그램 / 밝기 / 대비 / 선명도(라플라시안 분산)를 한 번에 계산
+3. 인접 프레임 히스토그램 차이로 컷을 나누고 컷마다 가장 선명한 프레임을 대표로 선택
+4. 대표 프레임 중 서로 가장 다른 것부터 (farthest-point) count개 선택
+
+영상당 FRAME_SCENE_BUDGET_SECONDS 안에서만 실행하며 (디코딩이 길어지면 받은 데까지만 분석)
+단계별 소요 시간을 기록한다.
+
+FRAME_SELECTION_MODE
+- scene: 로컬에 캐시된 영상에서만 분석 (처음 보는 영상은 균등 간격, 캐시된 뒤 다시 추출할 때부터 적용)
+- scene_remote: 처음 보는 영상도 원격 360p 스트림의 키프레임을 예산 안에서 읽어 분석
+  (FRAME_STREAM_MAX_SECONDS 이하 영상만, 예산 안에 영상 전체를 훑지 못하면 균등 간격)
+- even: 항상 균등 간격
+"""
+import time
+import threading
+import subprocess
+from typing import List, Optional
+
+import numpy as np
+
+from db_config import FRAME_SCENE_BUDGET_SECONDS
+
+WIDTH, HEIGHT = 64, 36
+MAX_SAMPLES = 240          # 분석할 최대 프레임 수 (영상이 길면 샘플 간격을 넓힘)
+CUT_THRESHOLD = 0.35       # 히스토그램 차이 (0~1) 가 이보다 크면 장면 전환
+DARK, BRIGHT = 16, 240     # 평균 밝기가 이 범위를 벗어나면 검은/흰 화면
+MIN_CONTRAST = 8           # 밝기 표준편차가 이보다 작으면 단색 화면
+
+# 여러 추출 워커가 동시에 갱신하므로 _stats_lock 안에서만 읽고 씀 (조회는 get_stats)
+_stats_lock = threading.Lock()
+_last_timing = {}
+_stats = {"runs": 0, "fallbacks": 0, "budget_exceeded": 0}
+
+
+def _decode_samples(ffmpeg_path: str, source: str, rate: float, deadline: float,
+                    http_headers: Optional[dict] = None) -> np.ndarray:
+    """키프레임만 디코딩한 축소 스트림 (n, HEIGHT, WIDTH, 3), 시간 초과 시 받은 데까지만"""
+    cmd = [ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-nostdin']
+    if http_headers:
+        cmd += ['-headers', "".join(f"{k}: {v}\r\n" for k, v in http_headers.items())]
+    cmd += [
+        '-skip_frame', 'nokey',
+        '-i', source,
+        '-an',
+        '-vf', f"fps={rate:.6f},scale={WIDTH}:{HEIGHT}:flags=area",
+        '-f', 'rawvideo',
+        '-pix_fmt', 'rgb24',
+        'pipe:1',
+    ]
+    frame_size = WIDTH * HEIGHT * 3
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    # 예산을 넘기면 ffmpeg를 종료하고 그때까지 받은 프레임만 사용
+    timer = threading.Timer(max(0.0, deadline - time.perf_counter()), proc.kill)
+    timer.start()
+    try:
+        data = proc.stdout.read()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        proc.wait()
+
+    n = len(data) // frame_size
+    return np.frombuffer(data[:n * frame_size], np.uint8).reshape(n, HEIGHT, WIDTH, 3)
+
+
+def _analyze(samples: np.ndarray):
+    """프레임별 특징 계산 (모두 벡터 연산): 히스토그램, 밝기, 대비, 선명도"""
+    n = len(samples)
+    pixels = HEIGHT * WIDTH
+
+    # 4x4x4 색 히스토그램 (프레임마다 64칸, 한 번의 bincount)
+    q = samples >> 6
+    bins = (q[..., 0].astype(np.int32) << 4) | (q[..., 1].astype(np.int32) << 2) | q[..., 2]
+    bins = bins.reshape(n, -1) + (np.arange(n, dtype=np.int32) * 64)[:, None]
+    hist = np.bincount(bins.ravel(), minlength=n * 64).reshape(n, 64) / pixels
+
+    gray = samples.astype(np.float32) @ np.array([0.299, 0.587, 0.114], np.float32)
+    brightness = gray.mean(axis=(1, 2))
+    contrast = gray.std(axis=(1, 2))
+
+    # 라플라시안 분산 (전환 중 흐린 프레임일수록 작음)
+    lap = (gray[:, 1:-1, :-2] + gray[:, 1:-1, 2:] + gray[:, :-2, 1:-1] + gray[:, 2:, 1:-1]
+           - 4 * gray[:, 1:-1, 1:-1])
+    sharpness = lap.var(axis=(1, 2))
+
+    return hist, brightness, contrast, sharpness
+
+
+def _pick(hist, brightness, contrast, sharpness, count: int) -> List[int]:
+    """컷별 대표 프레임 중 서로 가장 다른 count개의 인덱스"""
+    n = len(hist)
+    usable = (brightness > DARK) & (brightness < BRIGHT) & (contrast > MIN_CONTRAST)
+    if not usable.any():
+        return []
+
+    # 인접 프레임 히스토그램 차이 → 장면 번호
+    diff = np.zeros(n, np.float32)
+    diff[1:] = 0.5 * np.abs(hist[1:] - hist[:-1]).sum(axis=1)
+    shot_ids = np.cumsum(diff > CUT_THRESHOLD)
+
+    # 장면마다 가장 선명한 사용 가능 프레임 (정렬 후 장면별 첫 항목)
+    score = np.where(usable, sharpness, -1.0)
+    order = np.lexsort((-score, shot_ids))
+    first = np.ones(n, bool)
+    first[1:] = shot_ids[order][1:] != shot_ids[order][:-1]
+    reps = order[first]
+    reps = reps[usable[reps]]
+
+    # farthest-point: 가장 선명한 대표부터 시작해 이미 고른 프레임과 가장 다른 것을 추가
+    chosen = [int(reps[np.argmax(sharpness[reps])])]
+    dist = np.abs(hist[reps] - hist[chosen[0]]).sum(axis=1)
+    while len(chosen) < min(count, len(reps)) and dist.max() > 0:
+        idx = int(reps[np.argmax(dist)])
+        chosen.append(idx)
+        dist = np.minimum(dist, np.abs(hist[reps] - hist[idx]).sum(axis=1))
+
+    # 장면 수가 부족하면 남은 사용 가능 프레임에서 균등 간격으로 채움
+    if len(chosen) < count:
+        rest = np.setdiff1d(np.flatnonzero(usable), chosen)
+        if len(rest):
+            take = np.linspace(0, len(rest) - 1, min(count - len(chosen), len(rest))).round().astype(int)
+            chosen.extend(int(i) for i in rest[np.unique(take)])
+
+    return sorted(chosen)
+
+
+def scene_timestamps(ffmpeg_path: str, source: str, duration: float, count: int,
+                     http_headers: Optional[dict] = None, require_full: bool = False) -> Optional[List[float]]:
+    """
+    장면 전환 기반 타임스탬프 count개 (실패 / 분석할 프레임 부족 시 None → 균등 간격 사용)
+    source: 로컬 영상 파일, 또는 원격 미디어 URL (scene_remote, 전체를 읽어야 하므로 짧은 영상만)
+    require_full: 예산 안에 영상 끝까지 읽지 못하면 None (앞부분에만 몰린 선택 방지)
+    """
+    global _last_timing
+    started = time.perf_counter()
+    deadline = started + FRAME_SCENE_BUDGET_SECONDS
+
+    rate = min(1.0, MAX_SAMPLES / duration) if duration > 0 else 1.0
+    samples = _decode_samples(ffmpeg_path, source, rate, deadline, http_headers)
+    decoded = time.perf_counter()
+
+    timestamps = None
+    covered = len(samples) >= int(duration * rate * 0.9)
+    if len(samples) >= count and (covered or not require_full):
+        # 앞뒤 5%는 인트로 / 엔딩이 많으므로 제외
+        trim = int(len(samples) * 0.05)
+        if len(samples) - 2 * trim < count:
+            trim = 0
+        picks = _pick(*_analyze(samples[trim:len(samples) - trim]), count)
+        if len(picks) >= count:
+            timestamps = [(trim + i) / rate for i in picks]
+    finished = time.perf_counter()
+
+    timing = {
+        "samples": int(len(samples)),
+        "decode_ms": round((decoded - started) * 1000, 1),
+        "analyze_ms": round((finished - decoded) * 1000, 1),
+        "total_ms": round((finished - started) * 1000, 1),
+        "budget_ms": FRAME_SCENE_BUDGET_SECONDS * 1000,
+    }
+    with _stats_lock:
+        _last_timing = timing
+        _stats["runs"] += 1
+        if finished > deadline:
+            _stats["budget_exceeded"] += 1
+        if timestamps is None:
+            _stats["fallbacks"] += 1
+    print(f"🎞️ Scene selection: {timing['samples']} samples, decode {timing['decode_ms']}ms, "
+          f"analyze {timing['analyze_ms']}ms{'' if timestamps else ' (fallback to even spacing)'}")
+    return timestamps
+
+
+def get_stats() -> dict:
+    """실행 / 균등 간격 대체 / 예산 초과 횟수와 마지막 실행의 단계별 소요 시간"""
+    with _stats_lock:
+        return dict(_stats, last=dict(_last_timing))
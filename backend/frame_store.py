@@ -0,0 +1,169 @@
+"""
+콘텐츠 주소 기반 프레임 저장소 (디스크)
+
+추출한 프레임을 한 번만 파일로 저장하고 URL로 제공한다.
+  {FRAME_STORE_DIR}/{video_id}/{타임스탬프(ms)}-{내용 해시}.{확장자}
+파일 이름에 내용 해시가 포함되므로 같은 URL의 내용은 절대 바뀌지 않는다.
+→ 브라우저 / CDN 에서 immutable 로 캐시 가능
+인코딩 옵션(형식 / 품질 / 크기) 조합마다 파일이 새로 생기므로
+전체 크기가 FRAME_STORE_MAX_BYTES 를 넘으면 가장 오래 사용하지 않은 파일부터 삭제한다. (mtime 기준, media_cache와 같은 방식)
+"""
+import os
+import re
+import hashlib
+import time
+import tempfile
+import threading
+from typing import Optional
+
+from db_config import FRAME_STORE_DIR, FRAME_STORE_MAX_BYTES
+
+FRAME_URL_PREFIX = "/api/frames"
+
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# 파일 이름 형식 (save_frame과 get_frame_path가 같은 상수를 사용)
+# 타임스탬프는 최소 자릿수만 맞추고 넘치면 그대로 늘어남 (8자리 = 약 27시간)
+_TIMESTAMP_MIN_DIGITS = 8
+_DIGEST_LENGTH = 16
+_EXTENSIONS = (".jpg", ".webp", ".png")
+_FILENAME_RE = re.compile(
+    rf"^\d{{{_TIMESTAMP_MIN_DIGITS},}}-[0-9a-f]{{{_DIGEST_LENGTH}}}"
+    rf"({'|'.join(re.escape(ext) for ext in _EXTENSIONS)})$"
+)
+
+_TOUCH_INTERVAL_SECONDS = 60  # LRU 사용 표시 최소 간격 (너무 잦은 utime 생략)
+_TMP_MAX_AGE_SECONDS = 3600  # 워커가 죽어 남은 .tmp 파일 정리 기준
+# 예산의 이 비율만큼 새로 쓸 때마다 전체 크기 확인 (저장할 때마다 디렉터리를 훑지 않도록)
+_EVICT_CHECK_FRACTION = 20
+
+_evict_lock = threading.Lock()
+_written_lock = threading.Lock()
+_written_since_check = 0
+stats = {"stored": 0, "evicted": 0}
+
+
+def _frame_filename(timestamp: float, data: bytes, ext: str) -> str:
+    """{타임스탬프(ms)}-{내용 해시}.{확장자}"""
+    if ext not in _EXTENSIONS:
+        raise ValueError(f"Invalid frame extension: {ext}")
+    millis = max(0, int(timestamp * 1000))
+    digest = hashlib.sha256(data).hexdigest()[:_DIGEST_LENGTH]
+    return f"{millis:0{_TIMESTAMP_MIN_DIGITS}d}-{digest}{ext}"
+
+
+def save_frame(video_id: str, timestamp: float, data: bytes, ext: str) -> str:
+    """
+    프레임 저장 후 URL 반환 (이미 같은 파일이 있으면 쓰지 않음)
+
+    Args:
+        video_id: 영상 ID (yt-dlp info['id'])
+        timestamp: 프레임 위치 (초)
+        data: 인코딩된 이미지 바이트
+        ext: '.jpg' | '.webp' | '.png'
+    """
+    if not _VIDEO_ID_RE.match(video_id):
+        raise ValueError(f"Invalid video id: {video_id}")
+
+    filename = _frame_filename(timestamp, data, ext)
+    directory = os.path.join(FRAME_STORE_DIR, video_id)
+    path = os.path.join(directory, filename)
+
+    if os.path.exists(path):
+        _touch(path)
+    else:
+        os.makedirs(directory, exist_ok=True)
+        # 임시 파일에 쓴 뒤 rename (동시 요청이 반쯤 쓰인 파일을 읽지 않도록)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        stats["stored"] += 1
+        _maybe_evict(len(data))
+
+    return f"{FRAME_URL_PREFIX}/{video_id}/{filename}"
+
+
+def get_frame_path(video_id: str, filename: str) -> Optional[str]:
+    """URL 경로의 파일 위치 반환 (형식이 잘못되었거나 파일이 없으면 None)"""
+    if not _VIDEO_ID_RE.match(video_id) or not _FILENAME_RE.match(filename):
+        return None
+    path = os.path.join(FRAME_STORE_DIR, video_id, filename)
+    if not os.path.isfile(path):
+        return None
+    _touch(path)
+    return path
+
+
+def _touch(path: str):
+    """LRU: 최근 사용 표시"""
+    try:
+        if time.time() - os.path.getmtime(path) > _TOUCH_INTERVAL_SECONDS:
+            os.utime(path)
+    except OSError:
+        pass
+
+
+def _maybe_evict(size: int):
+    """새로 쓴 크기가 예산의 1/_EVICT_CHECK_FRACTION 을 넘을 때마다 evict 실행"""
+    global _written_since_check
+    if FRAME_STORE_MAX_BYTES <= 0:
+        return
+    with _written_lock:
+        _written_since_check += size
+        if _written_since_check < FRAME_STORE_MAX_BYTES // _EVICT_CHECK_FRACTION:
+            return
+        _written_since_check = 0
+    evict()
+
+
+def evict():
+    """남은 .tmp 파일 삭제 후 전체 크기가 예산 이하가 될 때까지 LRU 삭제 (빈 영상 디렉터리도 삭제)"""
+    if FRAME_STORE_MAX_BYTES <= 0 or not os.path.isdir(FRAME_STORE_DIR):
+        return
+
+    with _evict_lock:
+        now = time.time()
+        entries = []
+        for video_id in os.listdir(FRAME_STORE_DIR):
+            directory = os.path.join(FRAME_STORE_DIR, video_id)
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if name.endswith(".tmp"):
+                    if now - st.st_mtime > _TMP_MAX_AGE_SECONDS:
+                        _remove(path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= FRAME_STORE_MAX_BYTES:
+                break
+            if _remove(path):
+                stats["evicted"] += 1
+            total -= size
+            try:
+                os.rmdir(os.path.dirname(path))  # 비어 있을 때만 삭제됨
+            except OSError:
+                pass
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
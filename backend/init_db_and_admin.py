@@ -1,12 +1,13 @@
-from database import engine, SessionLocal, Base
+from database import SessionLocal
 from db_models import User
 from auth import hash_employee_id
+from migrations import upgrade
 
 def init_database():
-    """데이터베이스 테이블 생성"""
-    print("🔨 Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created!")
+    """데이터베이스 마이그레이션 (최신 버전이면 버전 확인만 수행)"""
+    print("🔨 Migrating database schema...")
+    upgrade()
+    print("✅ Database schema ready!")
 
 
 def create_admin_user():
@@ -0,0 +1,213 @@
+"""
+저해상도(≤360p) 영상 디스크 LRU 캐시
+
+같은 영상을 다시 추출할 때 (count 변경, 다시 뽑기, 미리보기 직후 AI 분석 등)
+네트워크 없이 로컬 파일에서 바로 디코딩한다.
+- 영상 ID 기준: {MEDIA_CACHE_DIR}/{video_id}.mp4
+- 임시 파일(.part)에 받은 뒤 rename (원자적 쓰기)
+- 전체 크기가 MEDIA_CACHE_MAX_BYTES 를 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (mtime 기준)
+- MEDIA_CACHE_MAX_AGE_SECONDS 동안 사용하지 않은 파일은 만료
+- 캐시 채우기는 추출 응답 후 백그라운드에서 실행하되, 다시 요청된 영상만
+  (요청 횟수 MEDIA_CACHE_MIN_REQUESTS 이상, 또는 프레임 작업 / 미리 준비가 mark_wanted로 요청)
+  한 번만 보고 마는 영상까지 전체를 받으면 원본 트래픽이 두 배가 되므로
+"""
+import os
+import re
+import time
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Optional
+
+from db_config import (
+    MEDIA_CACHE_DIR, MEDIA_CACHE_MAX_BYTES, MEDIA_CACHE_MAX_AGE_SECONDS, MEDIA_CACHE_MAX_DURATION_SECONDS,
+    MEDIA_CACHE_MIN_REQUESTS,
+)
+from redis_cache import redis_client
+
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_PART_MAX_AGE_SECONDS = 3600  # 워커가 죽어 남은 .part 파일 정리 기준
+_ACCESS_MAX_ENTRIES = 10000  # 프로세스 내 요청 횟수 기록 상한
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="media-cache")
+_pending = set()
+_pending_lock = threading.Lock()
+_evict_lock = threading.Lock()
+_access = OrderedDict()  # video_id -> 요청 횟수 (Redis 없을 때)
+_access_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "skipped_cold": 0}
+
+
+def is_enabled() -> bool:
+    return MEDIA_CACHE_MAX_BYTES > 0
+
+
+def _path(video_id: str) -> str:
+    return os.path.join(MEDIA_CACHE_DIR, f"{video_id}.mp4")
+
+
+def get_media(video_id: Optional[str]) -> Optional[str]:
+    """캐시된 영상 경로 (없거나 만료되면 None, 사용 시 LRU 순서 갱신)"""
+    if not is_enabled() or not video_id or not _VIDEO_ID_RE.match(video_id):
+        return None
+
+    path = _path(video_id)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        stats["misses"] += 1
+        return None
+
+    if time.time() - mtime > MEDIA_CACHE_MAX_AGE_SECONDS:
+        stats["misses"] += 1
+        return None
+
+    if time.time() - mtime > 60:
+        try:
+            os.utime(path)  # LRU: 최근 사용 표시 (너무 잦은 갱신은 생략)
+        except OSError:
+            pass
+    stats["hits"] += 1
+    print(f"💾 Media cache HIT for {video_id}")
+    return path
+
+
+def record_access(video_id: Optional[str], count: int = 1) -> int:
+    """
+    영상 프레임 요청 횟수 기록 (캐시 적중 포함), 누적 횟수 반환
+    Redis가 있으면 워커 간 공유 (MEDIA_CACHE_MAX_AGE_SECONDS 후 만료)
+    """
+    if not is_enabled() or not _VIDEO_ID_RE.match(video_id or ""):
+        return 0
+    if redis_client:
+        try:
+            key = f"media_access:{video_id}"
+            total = redis_client.incrby(key, count)
+            redis_client.expire(key, MEDIA_CACHE_MAX_AGE_SECONDS)
+            return int(total)
+        except Exception as e:
+            print(f"[ERROR] Redis access count error: {e}")
+    with _access_lock:
+        total = _access.pop(video_id, 0) + count
+        _access[video_id] = total
+        while len(_access) > _ACCESS_MAX_ENTRIES:
+            _access.popitem(last=False)
+        return total
+
+
+def mark_wanted(video_id: Optional[str]):
+    """첫 추출이어도 영상을 캐시하도록 요청 (프레임 작업 / 미리 준비처럼 다시 쓰일 것이 확실할 때)"""
+    record_access(video_id, MEDIA_CACHE_MIN_REQUESTS)
+
+
+def _access_count(video_id: str) -> int:
+    if redis_client:
+        try:
+            return int(redis_client.get(f"media_access:{video_id}") or 0)
+        except Exception as e:
+            print(f"[ERROR] Redis access count error: {e}")
+    with _access_lock:
+        return _access.get(video_id, 0)
+
+
+def prefetch(video_id: str, media_url: str, http_headers: dict, duration: float, ffmpeg_path: str):
+    """
+    영상을 백그라운드로 캐시에 저장 (이미 있거나 받는 중이면 무시)
+    요청 횟수가 MEDIA_CACHE_MIN_REQUESTS 미만인 영상(처음 보는 영상)은 받지 않음
+    """
+    if not is_enabled() or not _VIDEO_ID_RE.match(video_id or ""):
+        return
+    if not duration or duration > MEDIA_CACHE_MAX_DURATION_SECONDS:
+        return
+    if os.path.exists(_path(video_id)):
+        return
+    if _access_count(video_id) < MEDIA_CACHE_MIN_REQUESTS:
+        stats["skipped_cold"] += 1
+        return
+
+    with _pending_lock:
+        if video_id in _pending:
+            return
+        _pending.add(video_id)
+
+    def task():
+        try:
+            _download(video_id, media_url, http_headers, ffmpeg_path)
+        except Exception as e:
+            print(f"⚠️ Media cache download failed for {video_id}: {e}")
+        finally:
+            with _pending_lock:
+                _pending.discard(video_id)
+
+    _executor.submit(task)
+
+
+def _download(video_id: str, media_url: str, http_headers: dict, ffmpeg_path: str):
+    """ffmpeg로 영상 트랙만 복사 (재인코딩 없음) 후 원자적으로 저장"""
+    os.makedirs(MEDIA_CACHE_DIR, exist_ok=True)
+    part_path = os.path.join(MEDIA_CACHE_DIR, f"{video_id}.{os.getpid()}.{threading.get_ident()}.part")
+
+    cmd = [ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-nostdin', '-y']
+    if http_headers:
+        cmd += ['-headers', "".join(f"{k}: {v}\r\n" for k, v in http_headers.items())]
+    cmd += [
+        '-rw_timeout', '10000000',
+        '-i', media_url,
+        '-map', '0:v:0',
+        '-c', 'copy',
+        '-movflags', '+faststart',
+        '-f', 'mp4',
+        part_path,
+    ]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=300)
+        if result.returncode != 0 or not os.path.getsize(part_path):
+            raise Exception(result.stderr.decode(errors='ignore')[:300])
+        os.replace(part_path, _path(video_id))
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+    stats["stored"] += 1
+    print(f"💾 Cached media for {video_id} ({os.path.getsize(_path(video_id)) / 1e6:.1f}MB)")
+    evict()
+
+
+def evict():
+    """만료 파일 / 남은 .part 파일 삭제 후 전체 크기가 예산 이하가 될 때까지 LRU 삭제"""
+    if not os.path.isdir(MEDIA_CACHE_DIR):
+        return
+
+    with _evict_lock:
+        now = time.time()
+        entries = []
+        for name in os.listdir(MEDIA_CACHE_DIR):
+            path = os.path.join(MEDIA_CACHE_DIR, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if name.endswith(".part"):
+                if now - st.st_mtime > _PART_MAX_AGE_SECONDS:
+                    os.remove(path)
+                continue
+            if now - st.st_mtime > MEDIA_CACHE_MAX_AGE_SECONDS:
+                _remove(path)
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= MEDIA_CACHE_MAX_BYTES:
+                break
+            _remove(path)
+            total -= size
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+        stats["evicted"] += 1
+    except OSError:
+        pass
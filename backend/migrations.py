@@ -0,0 +1,231 @@
+"""
+버전 기반 DB 마이그레이션 러너
+
+워커 시작 시에는 check_schema_version()으로 버전만 한 번 확인하고,
+실제 스키마 변경은 배포 시 CLI로 한 번만 실행한다.
+
+사용법:
+  python migrations.py upgrade   # 미적용 마이그레이션을 순서대로 실행
+  python migrations.py status    # 현재 / 최신 버전 확인
+"""
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import text, inspect, select, func
+
+from database import engine, Base
+from db_models import SchemaVersion, BackfillProgress, FrameJob
+import db_models  # noqa: F401  (create_all 대상 모델 등록)
+from video_ids import extract_video_id
+
+
+# ========================================
+# 마이그레이션 단계 (순서대로, 각 단계는 멱등)
+# ========================================
+
+def _columns(conn, table: str) -> list:
+    return [col['name'] for col in inspect(conn).get_columns(table)]
+
+
+def m001_create_tables(conn):
+    """기본 테이블 생성 (이미 있으면 건너뜀)"""
+    Base.metadata.create_all(bind=conn)
+
+
+def m002_rename_legacy_post_columns(conn):
+    """author_id / primary_* / secondary_* 컬럼 이름 변경"""
+    columns = _columns(conn, 'posts')
+    renames = [
+        ('author_id', 'user_id'),
+        ('primary_category', 'industry_categories'),
+        ('primary_categories', 'industry_categories'),
+        ('secondary_category', 'genre_categories'),
+        ('secondary_categories', 'genre_categories'),
+    ]
+    for old, new in renames:
+        if old in columns and new not in columns:
+            print(f"🔄 Renaming posts.{old} to {new}...")
+            conn.execute(text(f"ALTER TABLE posts RENAME COLUMN {old} TO {new}"))
+            columns = _columns(conn, 'posts')
+
+
+def m003_add_post_columns(conn):
+    """view_count / cast / mood / editing / channel_name 컬럼 추가"""
+    columns = _columns(conn, 'posts')
+    new_columns = [
+        ('view_count', "INTEGER DEFAULT 0"),
+        ('cast_categories', "JSON DEFAULT '[]'"),
+        ('mood_categories', "JSON DEFAULT '[]'"),
+        ('editing_categories', "JSON DEFAULT '[]'"),
+        ('channel_name', "VARCHAR"),
+    ]
+    for col_name, col_def in new_columns:
+        if col_name not in columns:
+            print(f"🔄 Adding posts.{col_name}...")
+            conn.execute(text(f"ALTER TABLE posts ADD COLUMN {col_name} {col_def}"))
+
+
+def m004_add_favorites_id(conn):
+    """favorites.id 컬럼 추가 (구버전 테이블)"""
+    if 'id' in _columns(conn, 'favorites'):
+        return
+    print("🔄 Adding favorites.id...")
+    if conn.dialect.name == "postgresql":
+        # 이미 PK가 있는 경우 일반 SERIAL 컬럼으로 추가
+        try:
+            with conn.begin_nested():
+                conn.execute(text("ALTER TABLE favorites ADD COLUMN id SERIAL PRIMARY KEY"))
+        except Exception as e:
+            print(f"⚠️ Failed to add id as PK: {e}")
+            conn.execute(text("ALTER TABLE favorites ADD COLUMN id SERIAL"))
+    else:
+        # SQLite는 ALTER TABLE로 PRIMARY KEY 컬럼을 추가할 수 없음
+        conn.execute(text("ALTER TABLE favorites ADD COLUMN id INTEGER"))
+
+
+def m005_rename_category_types(conn):
+    """카테고리 타입 변경 (primary -> industry, secondary -> genre)"""
+    conn.execute(text("UPDATE categories SET type='industry' WHERE type='primary'"))
+    conn.execute(text("UPDATE categories SET type='genre' WHERE type='secondary'"))
+
+
+def m006_create_backfill_progress(conn):
+    """백필 진행 상황 테이블 생성"""
+    BackfillProgress.__table__.create(bind=conn, checkfirst=True)
+
+
+def m007_create_frame_jobs(conn):
+    """비동기 프레임 추출 작업 테이블 생성"""
+    FrameJob.__table__.create(bind=conn, checkfirst=True)
+
+
+def m008_add_post_video_id(conn):
+    """posts.video_id 컬럼 추가 + 기존 URL에서 채우기 + unique 인덱스"""
+    if 'video_id' not in _columns(conn, 'posts'):
+        print("🔄 Adding posts.video_id...")
+        conn.execute(text("ALTER TABLE posts ADD COLUMN video_id VARCHAR"))
+
+    rows = conn.execute(text("SELECT id, url FROM posts WHERE video_id IS NULL ORDER BY id")).all()
+    taken = {r[0] for r in conn.execute(text("SELECT video_id FROM posts WHERE video_id IS NOT NULL"))}
+    for post_id, url in rows:
+        video_id = extract_video_id(url)
+        if not video_id:
+            continue
+        if video_id in taken:
+            # 같은 영상의 다른 URL 형태로 이미 등록된 게시물 (먼저 등록된 게시물이 ID를 가짐)
+            print(f"⚠️ Post {post_id} duplicates video {video_id}; leaving video_id empty")
+            continue
+        taken.add(video_id)
+        conn.execute(text("UPDATE posts SET video_id = :vid WHERE id = :id"), {"vid": video_id, "id": post_id})
+
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_posts_video_id ON posts (video_id)"))
+
+
+def m009_add_post_frame_hashes(conn):
+    """posts.frame_hashes 컬럼 추가 (프레임 / 썸네일 지각 해시)"""
+    if 'frame_hashes' not in _columns(conn, 'posts'):
+        print("🔄 Adding posts.frame_hashes...")
+        conn.execute(text("ALTER TABLE posts ADD COLUMN frame_hashes JSON"))
+
+
+def m010_add_post_thumbnail_variants(conn):
+    """posts.thumbnail_variants 컬럼 추가 (크기별 썸네일 파생 이미지 URL)"""
+    if 'thumbnail_variants' not in _columns(conn, 'posts'):
+        print("🔄 Adding posts.thumbnail_variants...")
+        conn.execute(text("ALTER TABLE posts ADD COLUMN thumbnail_variants JSON"))
+
+
+def m011_add_post_placeholders(conn):
+    """posts.blurhash / dominant_color 컬럼 추가 (썸네일 자리표시자)"""
+    columns = _columns(conn, 'posts')
+    for col_name in ('blurhash', 'dominant_color'):
+        if col_name not in columns:
+            print(f"🔄 Adding posts.{col_name}...")
+            conn.execute(text(f"ALTER TABLE posts ADD COLUMN {col_name} VARCHAR"))
+
+
+MIGRATIONS = [
+    (1, "create_tables", m001_create_tables),
+    (2, "rename_legacy_post_columns", m002_rename_legacy_post_columns),
+    (3, "add_post_columns", m003_add_post_columns),
+    (4, "add_favorites_id", m004_add_favorites_id),
+    (5, "rename_category_types", m005_rename_category_types),
+    (6, "create_backfill_progress", m006_create_backfill_progress),
+    (7, "create_frame_jobs", m007_create_frame_jobs),
+    (8, "add_post_video_id", m008_add_post_video_id),
+    (9, "add_post_frame_hashes", m009_add_post_frame_hashes),
+    (10, "add_post_thumbnail_variants", m010_add_post_thumbnail_variants),
+    (11, "add_post_placeholders", m011_add_post_placeholders),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ========================================
+# 러너
+# ========================================
+
+def get_current_version(conn) -> int:
+    """적용된 최신 버전 (schema_version 테이블이 없으면 0)"""
+    if not inspect(conn).has_table(SchemaVersion.__tablename__):
+        return 0
+    return conn.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+
+
+def upgrade():
+    """미적용 마이그레이션을 버전 순서대로 실행 (단계마다 commit)"""
+    with engine.begin() as conn:
+        SchemaVersion.__table__.create(bind=conn, checkfirst=True)
+        current = get_current_version(conn)
+
+    pending = [m for m in MIGRATIONS if m[0] > current]
+    if not pending:
+        print(f"✅ Schema is up to date (version {current})")
+        return current
+
+    for version, name, step in pending:
+        print(f"🔄 Applying migration {version:03d}_{name}...")
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(SchemaVersion.__table__.insert().values(version=version, name=name))
+        print(f"✅ Applied migration {version:03d}_{name}")
+
+    return LATEST_VERSION
+
+
+def check_schema_version() -> int:
+    """
+    워커 시작 시 버전 확인 (리플렉션/쓰기 없이 쿼리 한 번)
+    Returns: 현재 스키마 버전 (확인 실패 시 0)
+    """
+    try:
+        with engine.connect() as conn:
+            current = conn.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+    except Exception as e:
+        print(f"⚠️ Schema version check failed: {e}")
+        current = 0
+
+    if current < LATEST_VERSION:
+        print(f"⚠️ DB schema is behind (version {current} < {LATEST_VERSION}). "
+              f"Run `python migrations.py upgrade`.")
+    return current
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+
+    if command == "upgrade":
+        upgrade()
+    elif command == "status":
+        with engine.connect() as conn:
+            current = get_current_version(conn)
+        print(f"Current version: {current}")
+        print(f"Latest version:  {LATEST_VERSION}")
+        for version, name, _ in MIGRATIONS:
+            mark = "✅" if version <= current else "⏳"
+            print(f"  {mark} {version:03d}_{name}")
+    else:
+        print(f"Unknown command: {command} (use 'upgrade' or 'status')")
+        sys.exit(1)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, validator, HttpUrl
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
@@ -94,6 +94,10 @@ class PostResponse(BaseModel):
     title: str
     channel_name: Optional[str] = None
     thumbnail: Optional[str] = None
+    # {"card" | "detail" | "full": {"webp": url, "jpeg": url, "width": w, "height": h}} (생성 전에는 None)
+    thumbnail_variants: Optional[Dict[str, Dict[str, Any]]] = None
+    blurhash: Optional[str] = None  # 이미지 로딩 전 자리표시자
+    dominant_color: Optional[str] = None  # '#rrggbb'
     platform: str
     video_type: str
     industry_categories: List[str] = []
@@ -130,6 +134,27 @@ class PostResponse(BaseModel):
         return v or []
 
 
+class SimilarPostResponse(PostResponse):
+    similarity: float = 0.0  # 0~1 (해시 + 색/구도)
+
+
+# Frame Job Models
+class FrameJobCreate(BaseModel):
+    url: str
+    count: int = Field(4, ge=1, le=10)
+
+
+class FrameJobResponse(BaseModel):
+    job_id: str
+    status: str
+    url: str
+    count: int
+    frames: Optional[List[str]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 # Token Models
 class Token(BaseModel):
     access_token: str
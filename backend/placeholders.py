@@ -0,0 +1,83 @@
+"""
+썸네일 자리표시자 (blurhash + 대표 색, NumPy 벡터 연산)
+
+목록 카드가 이미지를 받기 전에 바로 그릴 수 있도록 게시물마다 한 번 계산해 저장한다.
+- blurhash: 4x3 성분 (약 28자), https://blurha.sh 알고리즘과 같은 인코딩
+- dominant_color: 가장 많은 픽셀이 속한 색 구간의 평균 색 ('#rrggbb')
+"""
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+_BLURHASH_SAMPLE_SIZE = (128, 72)  # 인코딩 전에 축소 (결과는 거의 같고 계산은 수십 배 빠름)
+_COLOR_SAMPLE_SIZE = (32, 18)
+
+
+def _base83(value: int, length: int) -> str:
+    return "".join(_BASE83[(value // 83 ** (length - 1 - i)) % 83] for i in range(length))
+
+
+def _srgb_to_linear(values: np.ndarray) -> np.ndarray:
+    v = values / 255.0
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = min(1.0, max(0.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: np.ndarray, exp: float) -> np.ndarray:
+    return np.sign(value) * np.abs(value) ** exp
+
+
+def blurhash(image: np.ndarray, x_components: int = 4, y_components: int = 3) -> str:
+    """BGR 이미지 → blurhash 문자열"""
+    small = cv2.resize(image, _BLURHASH_SAMPLE_SIZE, interpolation=cv2.INTER_AREA)
+    rgb = _srgb_to_linear(small[:, :, ::-1].astype(np.float64))
+    height, width = rgb.shape[:2]
+
+    # 모든 성분을 한 번에: factors[j, i] = Σ cos(πix/w) cos(πjy/h) · pixel
+    basis_x = np.cos(np.pi * np.arange(x_components)[:, None] * np.arange(width)[None, :] / width)
+    basis_y = np.cos(np.pi * np.arange(y_components)[:, None] * np.arange(height)[None, :] / height)
+    factors = np.einsum("jy,ix,yxc->jic", basis_y, basis_x, rgb) / (width * height)
+    factors[1:] *= 2
+    factors[0, 1:] *= 2
+    factors = factors.reshape(-1, 3)
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+
+    if len(ac):
+        quantised_max = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        max_value = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        max_value = 1
+        result += _base83(0, 1)
+
+    result += _base83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+
+    quant = np.clip(np.floor(_sign_pow(ac / max_value, 0.5) * 9 + 9.5), 0, 18).astype(int)
+    for r, g, b in quant:
+        result += _base83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+def dominant_color(image: np.ndarray) -> str:
+    """BGR 이미지 → 대표 색 '#rrggbb' (4x4x4 색 구간 중 가장 큰 구간의 평균)"""
+    pixels = cv2.resize(image, _COLOR_SAMPLE_SIZE, interpolation=cv2.INTER_AREA).reshape(-1, 3)
+    q = pixels >> 6
+    bins = (q[:, 0].astype(np.int32) << 4) | (q[:, 1].astype(np.int32) << 2) | q[:, 2]
+    top = np.bincount(bins, minlength=64).argmax()
+    b, g, r = pixels[bins == top].mean(axis=0).round().astype(int)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def compute(image: np.ndarray) -> Tuple[str, str]:
+    """(blurhash, dominant_color)"""
+    return blurhash(image), dominant_color(image)
@@ -0,0 +1,74 @@
+"""
+게시물 생성 후 미리 준비 (pre-warm)
+
+create_post 응답 후 백그라운드에서 처음 보는 사람 / 첫 AI 분석이 기다리지 않도록 준비한다.
+- 썸네일 파생 이미지 / 자리표시자 (thumbnail_store, 가벼우므로 항상)
+- 메타데이터: create_post가 조회한 결과가 이미 캐시됨 (extract_youtube_metadata)
+- 프레임 세트 + 저해상도 영상 캐시: 추출 풀에서 실행하되 사용자 요청보다 낮은 우선순위
+  · 한 번에 하나만 (전용 스레드 1개)
+  · 추출 풀에 대기 중인 요청이 있거나 워커가 하나도 남지 않으면 / CPU 부하가 높으면
+    PREWARM_RETRY_SECONDS 후 다시 확인, PREWARM_ATTEMPTS회 모두 바쁘면 생략
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import extraction_pool
+import thumbnail_store
+from extraction_pool import ExtractionQueueFull
+from db_config import PREWARM_ENABLED, PREWARM_MAX_LOAD, PREWARM_RETRY_SECONDS, PREWARM_ATTEMPTS
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prewarm")
+stats = {"queued": 0, "warmed": 0, "skipped": 0, "failed": 0}
+
+
+def _is_busy() -> bool:
+    """사용자 요청이 기다리고 있거나 서버 부하가 높은지"""
+    metrics = extraction_pool.get_metrics()
+    # 대기 중인 요청이 있거나, 미리 추출이 마지막 남은 워커를 차지하게 되면 양보
+    if metrics["queued"] > 0 or metrics["running"] >= max(1, metrics["workers"] - 1):
+        return True
+    try:
+        load = os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return False  # getloadavg 미지원 플랫폼
+    return load > PREWARM_MAX_LOAD
+
+
+def _run(post_id: int, url: str):
+    from youtube_service import prewarm_frames
+
+    for attempt in range(PREWARM_ATTEMPTS):
+        if not _is_busy():
+            break
+        if attempt < PREWARM_ATTEMPTS - 1:
+            time.sleep(PREWARM_RETRY_SECONDS)
+    else:
+        stats["skipped"] += 1
+        print(f"⏭️ Pre-warm skipped for post {post_id} (system busy)")
+        return
+
+    started = time.monotonic()
+    try:
+        count = extraction_pool.submit(prewarm_frames, url).result()
+    except ExtractionQueueFull:
+        stats["skipped"] += 1
+        print(f"⏭️ Pre-warm skipped for post {post_id} (extraction queue full)")
+        return
+    except Exception as e:
+        stats["failed"] += 1
+        print(f"⚠️ Pre-warm failed for post {post_id}: {e}")
+        return
+
+    stats["warmed"] += 1
+    print(f"🔥 Pre-warmed post {post_id}: {count} frames in {time.monotonic() - started:.1f}s")
+
+
+def submit(post_id: int, url: str, video_id: Optional[str], thumbnail: Optional[str]):
+    """게시물 생성 직후 호출 (바로 반환)"""
+    thumbnail_store.submit(post_id, video_id, thumbnail)
+    if not PREWARM_ENABLED or not video_id:
+        return
+    stats["queued"] += 1
+    _executor.submit(_run, post_id, url)
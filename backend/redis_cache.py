@@ -1,7 +1,13 @@
 import redis
 import json
-from typing import Optional, List
-from db_config import REDIS_URL, FRAME_CACHE_EXPIRE_SECONDS
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, List
+from db_config import (
+    REDIS_URL, FRAME_CACHE_EXPIRE_SECONDS, FRAME_L1_CACHE_MAX_BYTES, FRAME_L1_CACHE_TTL_SECONDS,
+    METADATA_CACHE_EXPIRE_SECONDS, METADATA_L1_CACHE_MAX_BYTES,
+)
 
 # Redis 클라이언트 초기화
 redis_client = None
@@ -12,38 +18,143 @@ if REDIS_URL:
         redis_client.ping()  # 연결 테스트
         print(f"[OK] Redis connected: {REDIS_URL}")
     except Exception as e:
-        print(f"[WARN] Redis connection failed: {e}. Caching disabled.")
+        print(f"[WARN] Redis connection failed: {e}. Using in-process cache only.")
         redis_client = None
 else:
-    print("[WARN] REDIS_URL not set. Caching disabled.")
+    print("[WARN] REDIS_URL not set. Using in-process cache only.")
 
 
-def get_cached_frames(url: str, count: int = 4) -> Optional[List[str]]:
-    """캐시에서 프레임 가져오기"""
+def _frames_size(frames: List[str]) -> int:
+    return sum(len(f) for f in frames)
+
+
+class LocalFrameCache:
+    """
+    프로세스 내 L1 캐시 (Redis 앞단)
+    - 전체 바이트 예산을 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+    - 항목별 TTL
+    - Redis 없이도 캐싱 가능
+    - 기본 값은 프레임 목록, size_of를 주면 다른 값도 저장 (예: 메타데이터)
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: int, size_of: Callable[[Any], int] = _frames_size):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.size_of = size_of
+        self._items = OrderedDict()  # key -> (만료 시각, 크기, 값)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = item
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        size = self.size_of(value)
+        if size > self.max_bytes:
+            return  # 예산보다 큰 항목은 저장하지 않음
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._items))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [k for k in self._items if k.startswith(prefix)]:
+                self._remove(key)
+
+    def _remove(self, key: str):
+        _, size, _ = self._items.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+local_cache = LocalFrameCache(FRAME_L1_CACHE_MAX_BYTES, FRAME_L1_CACHE_TTL_SECONDS)
+metadata_cache = LocalFrameCache(
+    METADATA_L1_CACHE_MAX_BYTES, METADATA_CACHE_EXPIRE_SECONDS,
+    size_of=lambda metadata: sum(len(v) for v in metadata if v),  # [title, thumbnail, description, channel_name]
+)
+redis_stats = {"hits": 0, "misses": 0}
+
+
+def get_cache_stats() -> dict:
+    """L1 / Redis 캐시 적중 통계"""
+    return {
+        "l1": local_cache.stats(),
+        "metadata_l1": metadata_cache.stats(),
+        "redis": dict(redis_stats, enabled=redis_client is not None),
+    }
+
+
+def get_cached_frames(url: str, count: int = 4, variant: str = "") -> Optional[List[str]]:
+    """
+    캐시에서 프레임 가져오기 (L1 → Redis)
+    url: 영상 ID (ID를 알 수 없으면 URL), variant: 인코딩 옵션 (예: 'jpeg:80:640')
+    """
+    cache_key = f"frames:{url}:{count}:{variant}"
+    frames = local_cache.get(cache_key)
+    if frames is not None:
+        print(f"[OK] L1 cache HIT for {url}")
+        return frames
+
     if not redis_client:
         return None
     
     try:
-        cache_key = f"frames:{url}:{count}"
         cached = redis_client.get(cache_key)
         if cached:
             print(f"[OK] Cache HIT for {url}")
-            return json.loads(cached)
+            redis_stats["hits"] += 1
+            frames = json.loads(cached)
+            local_cache.set(cache_key, frames)
+            return frames
         else:
             print(f"[WARN] Cache MISS for {url}")
+            redis_stats["misses"] += 1
             return None
     except Exception as e:
         print(f"[ERROR] Redis get error: {e}")
         return None
 
 
-def set_cached_frames(url: str, frames: List[str], count: int = 4):
-    """프레임을 캐시에 저장 (TTL: 5분)"""
+def set_cached_frames(url: str, frames: List[str], count: int = 4, variant: str = ""):
+    """프레임을 캐시에 저장 (L1 + Redis, TTL: 5분)"""
+    cache_key = f"frames:{url}:{count}:{variant}"
+    local_cache.set(cache_key, frames)
+
     if not redis_client:
         return
     
     try:
-        cache_key = f"frames:{url}:{count}"
         redis_client.setex(
             cache_key,
             FRAME_CACHE_EXPIRE_SECONDS,
@@ -54,8 +165,42 @@ def set_cached_frames(url: str, frames: List[str], count: int = 4):
         print(f"[ERROR] Redis set error: {e}")
 
 
+def get_cached_metadata(video_id: str) -> Optional[list]:
+    """캐시된 YouTube 메타데이터 (L1 → Redis)"""
+    cache_key = f"metadata:{video_id}"
+    cached = metadata_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if not redis_client:
+        return None
+    try:
+        cached = redis_client.get(cache_key)
+        if cached:
+            metadata = json.loads(cached)
+            metadata_cache.set(cache_key, metadata)
+            return metadata
+    except Exception as e:
+        print(f"[ERROR] Redis get error: {e}")
+    return None
+
+
+def set_cached_metadata(video_id: str, metadata: list):
+    """YouTube 메타데이터 캐시 저장 (L1 + Redis)"""
+    cache_key = f"metadata:{video_id}"
+    metadata_cache.set(cache_key, metadata)
+
+    if not redis_client:
+        return
+    try:
+        redis_client.setex(cache_key, METADATA_CACHE_EXPIRE_SECONDS, json.dumps(metadata))
+    except Exception as e:
+        print(f"[ERROR] Redis set error: {e}")
+
+
 def clear_frame_cache(url: str):
     """특정 URL의 캐시 삭제"""
+    local_cache.delete_prefix(f"frames:{url}:")
     if not redis_client:
         return
     
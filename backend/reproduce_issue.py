@@ -8,7 +8,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 load_dotenv()
 
-from youtube_service import extract_youtube_metadata, extract_frames, download_image_as_base64
+from youtube_service import extract_youtube_metadata, frame_superset, select_frames, download_image_as_base64
 from ai_service import analyze_video_with_gemini
 
 # Sample URL (a popular video likely to work)
@@ -37,7 +37,7 @@ def test_analysis():
                 images_data.append(thumb_b64)
                 print("   ✅ Thumbnail downloaded")
         
-        frames = extract_frames(TEST_URL, count=1) # Just 1 frame for speed
+        frames = select_frames(frame_superset(TEST_URL), 1) # Just 1 frame for speed
         if frames:
             images_data.extend(frames)
             print(f"   ✅ {len(frames)} frames extracted")
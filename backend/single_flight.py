@@ -0,0 +1,161 @@
+"""
+Single-flight: 같은 키의 작업을 동시에 한 번만 실행
+
+- 프로세스 내: 키별 Flight 객체로 첫 호출자(leader)만 실행하고 나머지는 결과를 기다림
+- 워커 간: Redis 락 (SET NX EX). 락을 얻지 못한 워커는 recheck()(예: 캐시 조회)로
+  leader의 결과가 저장되기를 기다린다. 락이 풀렸는데도 결과가 없으면 직접 실행.
+"""
+import time
+import uuid
+import asyncio
+import threading
+from typing import Callable, Optional, TypeVar
+
+from db_config import FRAME_LOCK_TTL_SECONDS, FRAME_LOCK_WAIT_SECONDS
+from redis_cache import redis_client
+
+T = TypeVar("T")
+
+_POLL_INTERVAL = 0.2
+
+# 토큰이 일치할 때만 삭제 (다른 워커가 다시 얻은 락을 지우지 않도록)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+stats = {"leaders": 0, "coalesced": 0, "remote_waits": 0}
+
+
+def run(key: str, fn: Callable[[], T], recheck: Optional[Callable[[], Optional[T]]] = None,
+        distributed: bool = True) -> T:
+    """
+    key 단위로 fn을 한 번만 실행하고 동시 호출자와 결과를 공유
+
+    Args:
+        key: 작업 키 (예: 'frames:{video_id}:{count}:{variant}')
+        fn: 실제 작업
+        recheck: 다른 워커가 저장한 결과 조회 (없으면 None 반환)
+        distributed: False면 프로세스 내에서만 합침 (결과를 워커 간에 공유할 수 없는 경우)
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _Flight()
+            _flights[key] = flight
+
+    if not leader:
+        stats["coalesced"] += 1
+        print(f"⏳ Waiting for in-flight work: {key}")
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    stats["leaders"] += 1
+    try:
+        flight.result = _run_with_redis_lock(key, fn, recheck) if distributed else fn()
+        return flight.result
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def _run_with_redis_lock(key: str, fn: Callable[[], T], recheck: Optional[Callable[[], Optional[T]]]) -> T:
+    """워커 간 락 (Redis 미설정 / 오류 시 바로 실행)"""
+    if not redis_client:
+        return fn()
+
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + FRAME_LOCK_WAIT_SECONDS
+
+    while True:
+        try:
+            acquired = redis_client.set(lock_key, token, nx=True, ex=FRAME_LOCK_TTL_SECONDS)
+        except Exception as e:
+            print(f"[ERROR] Redis lock error: {e}")
+            return fn()
+
+        if acquired:
+            try:
+                # 락을 기다리는 사이 다른 워커가 끝냈을 수 있음
+                result = recheck() if recheck else None
+                return result if result else fn()
+            finally:
+                try:
+                    redis_client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    print(f"[ERROR] Redis unlock error: {e}")
+
+        # 다른 워커가 실행 중: 결과가 저장되거나 락이 풀릴 때까지 대기
+        stats["remote_waits"] += 1
+        print(f"⏳ Another worker is running {key}, waiting...")
+        while time.monotonic() < deadline:
+            time.sleep(_POLL_INTERVAL)
+            result = recheck() if recheck else None
+            if result:
+                return result
+            try:
+                held = redis_client.exists(lock_key)
+            except Exception as e:
+                print(f"[ERROR] Redis lock check error: {e}")
+                return fn()  # 락 상태를 알 수 없음 → 기다리지 않고 직접 실행
+            if not held:
+                break  # 락 해제됨 (결과 없음) → 다시 락 시도
+        else:
+            print(f"⚠️ Timed out waiting for {key}, running it here")
+            return fn()
+
+
+def _remote_lock_held(key: str) -> bool:
+    if not redis_client:
+        return False
+    try:
+        return bool(redis_client.exists(f"lock:{key}"))
+    except Exception as e:
+        print(f"[ERROR] Redis lock check error: {e}")
+        return False
+
+
+async def wait_for_remote(key: str):
+    """
+    다른 워커가 key를 실행 중이면 락이 풀릴 때까지 (최대 FRAME_LOCK_WAIT_SECONDS) 기다림
+    추출 풀에 작업을 넣기 전에 호출해서, 기다리는 동안 워커 슬롯을 차지하지 않도록 한다.
+    (이후 작업은 leader가 저장한 캐시를 바로 읽음)
+    """
+    if not _remote_lock_held(key):
+        return
+    stats["remote_waits"] += 1
+    print(f"⏳ Another worker is running {key}, waiting before queueing...")
+    deadline = time.monotonic() + FRAME_LOCK_WAIT_SECONDS
+    while time.monotonic() < deadline and _remote_lock_held(key):
+        await asyncio.sleep(_POLL_INTERVAL)
+
+
+def wait_for_remote_blocking(key: str):
+    """wait_for_remote의 동기 버전 (동기 핸들러용)"""
+    if not _remote_lock_held(key):
+        return
+    stats["remote_waits"] += 1
+    print(f"⏳ Another worker is running {key}, waiting before queueing...")
+    deadline = time.monotonic() + FRAME_LOCK_WAIT_SECONDS
+    while time.monotonic() < deadline and _remote_lock_held(key):
+        time.sleep(_POLL_INTERVAL)
@@ -0,0 +1,36 @@
+"""
+공통 테스트 설정
+
+모듈들이 import 시점에 환경 변수(db_config, database)를 읽으므로
+임시 디렉터리 / SQLite 파일을 먼저 지정한 뒤 backend 모듈을 import 한다.
+Redis는 사용하지 않음 (프로세스 내 캐시 / 락만 검사).
+"""
+import os
+import sys
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="refedia-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ.pop("REDIS_URL", None)
+os.environ["FRAME_STORE_DIR"] = os.path.join(_TMP, "frames")
+os.environ["THUMBNAIL_STORE_DIR"] = os.path.join(_TMP, "thumbnails")
+os.environ["MEDIA_CACHE_DIR"] = os.path.join(_TMP, "media")
+os.environ["PREWARM_ENABLED"] = "false"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture
+def db_tables():
+    """테스트 DB에 테이블 생성, 끝나면 모든 행 삭제"""
+    from database import engine, Base
+    import db_models  # noqa: F401  (create_all 대상 모델 등록)
+
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
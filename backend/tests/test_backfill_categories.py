@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+import backfill_categories
+from backfill_categories import normalize_categories, run_backfill, BACKFILL_NAME
+from database import SessionLocal
+from db_models import Post, BackfillProgress
+
+EDITED_AT = datetime(2024, 1, 2, 3, 4, 5)
+
+
+def _add_posts(raw_values):
+    db = SessionLocal()
+    try:
+        for i, raw in enumerate(raw_values, start=1):
+            db.add(Post(id=i, url=f"https://youtu.be/post{i:06d}", title=f"post {i}",
+                        video_type="long", industry_categories=raw, updated_at=EDITED_AT))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _rows():
+    db = SessionLocal()
+    try:
+        return db.execute(select(Post.id, Post.industry_categories, Post.updated_at).order_by(Post.id)).all()
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ('["a"]', ['a']),
+    (['["a","b"]'], ['a', 'b']),
+    ([1, 2], ['1', '2']),
+    (None, []),
+    ('"[\\"x\\"]"', ['x']),
+])
+def test_normalize_categories(raw, expected):
+    assert normalize_categories(raw) == expected
+
+
+def test_backfill_keeps_updated_at(db_tables):
+    _add_posts(['["a"]', ['b']])
+
+    run_backfill(batch_size=10, pause=0)
+
+    rows = _rows()
+    assert [r.industry_categories for r in rows] == [['a'], ['b']]
+    assert all(r.updated_at.replace(tzinfo=None) == EDITED_AT for r in rows)
+
+
+def test_backfill_resumes_after_interruption(db_tables, monkeypatch):
+    _add_posts([f'["{i}"]' for i in range(1, 6)])
+
+    # 두 번째 배치(id 3~4) 처리 중 중단
+    original = backfill_categories.normalize_categories
+    seen = []
+
+    def failing(value):
+        seen.append(value)
+        if len(seen) > 2 * len(backfill_categories.CATEGORY_COLUMNS):
+            raise RuntimeError("interrupted")
+        return original(value)
+
+    monkeypatch.setattr(backfill_categories, "normalize_categories", failing)
+    with pytest.raises(RuntimeError):
+        run_backfill(batch_size=2, pause=0)
+
+    db = SessionLocal()
+    try:
+        progress = db.get(BackfillProgress, BACKFILL_NAME)
+        assert (progress.last_id, progress.completed) == (2, False)
+    finally:
+        db.close()
+    assert [r.industry_categories for r in _rows()][2:] == ['["3"]', '["4"]', '["5"]']
+
+    # 재실행하면 id 2 이후부터 이어서 처리
+    monkeypatch.setattr(backfill_categories, "normalize_categories", original)
+    run_backfill(batch_size=2, pause=0)
+
+    assert [r.industry_categories for r in _rows()] == [[str(i)] for i in range(1, 6)]
+    db = SessionLocal()
+    try:
+        assert db.get(BackfillProgress, BACKFILL_NAME).completed
+    finally:
+        db.close()
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.exc import OperationalError
+
+from database import engine, read_engine, ReadSessionLocal
+from db_models import Post
+
+
+def test_sqlite_file_uses_separate_read_engine():
+    assert read_engine is not engine
+
+
+def test_select_goes_to_read_engine():
+    db = ReadSessionLocal()
+    try:
+        assert db.get_bind(clause=select(Post.id)) is read_engine
+        assert not db.info.get("wrote")
+    finally:
+        db.close()
+
+
+def test_writes_go_to_primary_and_pin_session(db_tables):
+    db = ReadSessionLocal()
+    try:
+        assert db.get_bind(clause=update(Post).values(title="x")) is engine
+        # 한 번 쓴 세션은 이후 SELECT도 primary
+        assert db.get_bind(clause=select(Post.id)) is engine
+    finally:
+        db.close()
+
+
+def test_raw_sql_is_treated_as_write():
+    db = ReadSessionLocal()
+    try:
+        assert db.get_bind(clause=text("SELECT 1")) is engine
+        assert db.get_bind(clause=select(Post.id)) is engine
+    finally:
+        db.close()
+
+
+def test_read_after_flush_sees_own_write(db_tables):
+    db = ReadSessionLocal()
+    try:
+        db.add(Post(url="https://youtu.be/routing0001", title="new", video_type="short"))
+        db.flush()
+        assert db.info.get("wrote")
+        # 읽기 풀로 갔다면 커밋 전 행이 보이지 않음
+        assert db.execute(select(Post.title)).scalars().all() == ["new"]
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_read_engine_is_read_only(db_tables):
+    with read_engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("DELETE FROM posts"))
+
+
+def test_sqlite_writer_is_a_single_connection():
+    assert engine.pool.size() == 1
+    assert engine.pool._max_overflow == 0
+
+
+def test_concurrent_writers_are_serialized(db_tables):
+    import threading
+    from database import SessionLocal
+
+    errors = []
+
+    def write(i):
+        db = SessionLocal()
+        try:
+            db.add(Post(url=f"https://youtu.be/writer{i:05d}", title=str(i), video_type="long"))
+            db.commit()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+
+    assert not errors
+    db = ReadSessionLocal()
+    try:
+        assert len(db.execute(select(Post.id)).all()) == 8
+    finally:
+        db.close()
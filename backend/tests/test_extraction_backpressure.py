@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app_main
+import extraction_pool
+from extraction_pool import ExtractionQueueFull
+from db_config import EXTRACTION_WORKERS, EXTRACTION_QUEUE_DEPTH
+
+
+def test_submit_rejects_when_queue_is_full():
+    release = threading.Event()
+    capacity = EXTRACTION_WORKERS + EXTRACTION_QUEUE_DEPTH
+    futures = [extraction_pool.submit(release.wait, 5) for _ in range(capacity)]
+    try:
+        with pytest.raises(ExtractionQueueFull) as exc_info:
+            extraction_pool.submit(lambda: None)
+        assert exc_info.value.retry_after >= 1
+    finally:
+        release.set()
+        for f in futures:
+            f.result(5)
+
+    # 대기열이 비면 다시 받음
+    assert extraction_pool.submit(lambda: "ok").result(5) == "ok"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    app_main.app.dependency_overrides[app_main.get_current_approved_user] = lambda: None
+    monkeypatch.setattr(app_main.single_flight, "_remote_lock_held", lambda key: False)
+    yield TestClient(app_main.app)
+    app_main.app.dependency_overrides.clear()
+
+
+def test_frames_endpoint_returns_503_with_retry_after(client, monkeypatch):
+    def full(*args, **kwargs):
+        raise ExtractionQueueFull(7)
+
+    monkeypatch.setattr(app_main.extraction_pool, "submit_coalesced", full)
+    response = client.get("/api/youtube/frames", params={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
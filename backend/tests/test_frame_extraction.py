@@ -0,0 +1,199 @@
+"""
+프레임 추출 경로 동작 확인 (ffmpeg 합성 영상, 네트워크 없음)
+
+테스트 영상: 10fps, 20초, 1초마다 키프레임, 프레임 N의 밝기 = Y(16 + N)
+→ 추출한 프레임의 평균 밝기로 몇 번째 프레임인지 알 수 있다.
+yt-dlp는 로컬 파일 경로를 미디어 URL로 돌려주는 가짜 인스턴스로 대체한다.
+"""
+import subprocess
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+import pytest
+
+import youtube_service
+import frame_hashes
+
+FPS = 10
+DURATION = 20
+VIDEO_ID = "synthclip01"
+
+
+@pytest.fixture(scope="module")
+def ffmpeg_path():
+    path = youtube_service._get_ffmpeg_path()
+    if not path:
+        pytest.skip("ffmpeg not available")
+    return path
+
+
+@pytest.fixture(scope="module")
+def clip(ffmpeg_path, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("clips") / "clip.mp4")
+    subprocess.run([
+        ffmpeg_path, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"nullsrc=s=160x90:r={FPS}:d={DURATION},geq=lum='16+N':cb=128:cr=128,format=yuv420p",
+        "-c:v", "libx264", "-g", str(FPS), "-keyint_min", str(FPS), "-sc_threshold", "0", "-qp", "0",
+        path,
+    ], check=True)
+    return path
+
+
+def _frame_index(image: np.ndarray) -> int:
+    """밝기(limited range Y → RGB)로 원래 프레임 번호 복원"""
+    return round(float(image.mean()) * 219 / 255)
+
+
+def _assert_frames_at(frames, expected):
+    """[(타임스탬프, 프레임)]이 기대한 (타임스탬프, 프레임 번호)와 맞는지 (±1 프레임)"""
+    assert [ts for ts, _ in frames] == [ts for ts, _ in expected]
+    for (ts, image), (_, index) in zip(frames, expected):
+        assert abs(_frame_index(image) - index) <= 1, f"{ts}s: frame {_frame_index(image)} != {index}"
+
+
+@pytest.fixture
+def fake_ydl(monkeypatch, clip):
+    """yt-dlp 대신 테스트 영상 정보를 돌려줌 (info를 고쳐서 경로 / 길이 / 스토리보드 지정)"""
+    info = {"id": VIDEO_ID, "url": clip, "duration": DURATION, "http_headers": {}, "formats": []}
+
+    class FakeYoutubeDL:
+        def extract_info(self, url, download=False):
+            return dict(info)
+
+    @contextmanager
+    def acquire(opts):
+        yield FakeYoutubeDL()
+
+    monkeypatch.setattr(youtube_service.ydl_pool, "acquire", acquire)
+    monkeypatch.setattr(youtube_service.media_cache, "prefetch", lambda *args, **kwargs: None)
+    return info
+
+
+# ========================================
+# showinfo pts 대응
+# ========================================
+
+def test_showinfo_frames_parses_filter_name_and_pts():
+    stderr = (
+        b"[showinfo@f0 @ 0x55d1] n:   0 pts:  20480 pts_time:2       duration: 512\n"
+        b"[Parsed_scale_0 @ 0x55d2] w:160 h:90\n"
+        b"[showinfo@f2 @ 0x55d3] n:   0 pts: 133120 pts_time:13      duration: 512\n"
+        b"[showinfo@out @ 0x55d4] n:   4 pts:  -512 pts_time:-0.05\n"
+    )
+    assert youtube_service._showinfo_frames(stderr) == [("f0", 2.0), ("f2", 13.0), ("out", -0.05)]
+
+
+def test_match_stream_frames_uses_pts_not_order():
+    images = [np.full((2, 2, 3), i, np.uint8) for i in range(3)]
+    # 5초 위치의 프레임이 빠진 경우: 순서로 짝지으면 10초 프레임이 5초에 대응됨
+    shown = [("out", 1.0), ("out", 10.1), ("out", 15.0)]
+    frames = youtube_service._match_stream_frames([1.0, 5.0, 10.0, 15.0], shown, images)
+    assert [ts for ts, _ in frames] == [1.0, 10.0, 15.0]
+    assert [int(image[0, 0, 0]) for _, image in frames] == [0, 1, 2]
+
+
+# ========================================
+# 단일 ffmpeg 실행 (로컬 파일)
+# ========================================
+
+def test_single_pass_exact_maps_each_timestamp(ffmpeg_path, clip, monkeypatch):
+    monkeypatch.setattr(youtube_service, "FRAME_SEEK_PRECISION", "exact")
+    frames = youtube_service._extract_frames_single_pass(ffmpeg_path, clip, [2.0, 7.3, 500.0, 13.0])
+    # 영상 끝을 넘는 위치는 빠지고 나머지는 요청 위치 그대로
+    _assert_frames_at(frames, [(2.0, 20), (7.3, 73), (13.0, 130)])
+
+
+def test_single_pass_keyframe_uses_preceding_keyframe(ffmpeg_path, clip, monkeypatch):
+    monkeypatch.setattr(youtube_service, "FRAME_SEEK_PRECISION", "keyframe")
+    frames = youtube_service._extract_frames_single_pass(ffmpeg_path, clip, [2.5, 7.3, 13.9])
+    _assert_frames_at(frames, [(2.5, 20), (7.3, 70), (13.9, 130)])
+
+
+def test_extract_from_file_returns_requested_count(ffmpeg_path, clip, monkeypatch):
+    monkeypatch.setattr(youtube_service, "FRAME_SELECTION_MODE", "even")
+    monkeypatch.setattr(youtube_service, "FRAME_SEEK_PRECISION", "exact")
+    frames = youtube_service._extract_frames_from_file(ffmpeg_path, clip, 6)
+    expected = youtube_service._sample_timestamps(DURATION, 6)
+    _assert_frames_at(frames, [(ts, round(ts * FPS)) for ts in expected])
+
+
+# ========================================
+# 원격 경로 (seek / stream / 긴 영상 구간 / 스토리보드)
+# ========================================
+
+def test_seek_extracts_sampled_timestamps(ffmpeg_path, fake_ydl, monkeypatch):
+    monkeypatch.setattr(youtube_service, "FRAME_SEEK_PRECISION", "exact")
+    video_id, frames = youtube_service._extract_frames_by_seek("https://youtu.be/synthclip01", 4, ffmpeg_path)
+
+    assert video_id == VIDEO_ID
+    expected = youtube_service._sample_timestamps(DURATION, 4)
+    _assert_frames_at(frames, [(ts, round(ts * FPS)) for ts in expected])
+
+
+@pytest.mark.parametrize("precision", ["keyframe", "exact"])
+def test_stream_outputs_first_frame_after_each_timestamp(ffmpeg_path, fake_ydl, monkeypatch, precision):
+    # 스트림 방식은 설정과 무관하게 모든 프레임을 디코딩하므로 요청한 프레임이 모두 나와야 함
+    monkeypatch.setattr(youtube_service, "FRAME_SEEK_PRECISION", precision)
+    video_id, frames = youtube_service._extract_frames_by_stream("https://youtu.be/synthclip01", 12, ffmpeg_path)
+
+    expected = youtube_service._sample_timestamps(DURATION, 12)
+    assert video_id == VIDEO_ID
+    _assert_frames_at(frames, [(ts, int(np.ceil(round(ts, 3) * FPS))) for ts in expected])
+
+
+def test_long_video_samples_segments(ffmpeg_path, fake_ydl, monkeypatch):
+    monkeypatch.setattr(youtube_service, "FRAME_STREAM_MAX_SECONDS", 5)
+    monkeypatch.setattr(youtube_service, "FRAME_SEEK_PRECISION", "keyframe")
+    _, frames = youtube_service._extract_frames_by_stream("https://youtu.be/synthclip01", 4, ffmpeg_path)
+
+    expected = youtube_service._sample_timestamps(DURATION, 4)
+    _assert_frames_at(frames, [(ts, int(ts) * FPS) for ts in expected])
+
+
+def test_storyboard_fills_failed_seeks(ffmpeg_path, fake_ydl, monkeypatch, tmp_path):
+    # 2x2 타일, 5초마다 한 타일 → 20초 영상이 시트 하나
+    tile_w, tile_h = 40, 30
+    sheet = np.zeros((tile_h * 2, tile_w * 2, 3), np.uint8)
+    for tile, value in enumerate((10, 60, 110, 160)):
+        row, col = divmod(tile, 2)
+        sheet[row * tile_h:(row + 1) * tile_h, col * tile_w:(col + 1) * tile_w] = value
+
+    class Response:
+        status_code = 200
+        content = cv2.imencode(".png", sheet)[1].tobytes()
+
+    import requests
+    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: Response())
+    fake_ydl["url"] = str(tmp_path / "missing.mp4")  # 모든 탐색 실패
+    fake_ydl["formats"] = [{
+        "format_note": "storyboard", "fps": 0.2, "rows": 2, "columns": 2,
+        "width": tile_w, "height": tile_h, "fragments": [{"url": "https://example.com/sb0.jpg"}],
+    }]
+    monkeypatch.setattr(youtube_service, "FRAME_STREAM_MAX_SECONDS", 5)
+
+    _, frames = youtube_service._extract_frames_by_stream("https://youtu.be/synthclip01", 4, ffmpeg_path)
+
+    expected = youtube_service._sample_timestamps(DURATION, 4)
+    assert [ts for ts, _ in frames] == expected
+    assert [int(image.mean()) for _, image in frames] == [int(ts // 5) * 50 + 10 for ts in expected]
+    assert all(image.shape == (tile_h, tile_w, 3) for _, image in frames)
+
+
+# ========================================
+# 거의 같은 프레임 제외
+# ========================================
+
+def test_dedupe_drops_near_duplicate_frames(db_tables):
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 256, (90, 160, 3), dtype=np.uint8)
+    b = rng.integers(0, 256, (90, 160, 3), dtype=np.uint8)
+    frames = [(1.0, a), (2.0, a.copy()), (3.0, b), (4.0, cv2.convertScaleAbs(b, beta=3))]
+
+    video_id, kept = youtube_service._dedupe_frames("dedupeclip1", frames)
+
+    assert video_id == "dedupeclip1"
+    assert [ts for ts, _ in kept] == [1.0, 3.0]
+    record = frame_hashes.get_record("dedupeclip1")
+    assert [f["t"] for f in record["frames"]] == [1.0, 3.0]
+    assert len(record["layout"]) == 48
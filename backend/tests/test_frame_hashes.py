@@ -0,0 +1,119 @@
+import cv2
+import numpy as np
+
+import frame_hashes
+from db_config import FRAME_HASH_DISTANCE
+
+
+def _scene(seed: int) -> np.ndarray:
+    """서로 다른 구도의 640x360 BGR 테스트 이미지"""
+    rng = np.random.default_rng(seed)
+    image = np.zeros((360, 640, 3), np.uint8)
+    for _ in range(6):
+        x, y = rng.integers(0, 560), rng.integers(0, 300)
+        w, h = rng.integers(40, 200), rng.integers(40, 150)
+        cv2.rectangle(image, (int(x), int(y)), (int(x + w), int(y + h)), rng.integers(0, 256, 3).tolist(), -1)
+    return image
+
+
+def _near_copy(image: np.ndarray) -> np.ndarray:
+    """재인코딩 + 약한 밝기 변화 (같은 장면)"""
+    brighter = cv2.convertScaleAbs(image, alpha=1.0, beta=6)
+    ok, data = cv2.imencode(".jpg", brighter, [cv2.IMWRITE_JPEG_QUALITY, 60])
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+def _hashes_with_distance(bits: int):
+    """0 해시와 정확히 bits만큼 다른 해시 쌍 (n=2, 8바이트)"""
+    flipped = np.zeros(64, bool)
+    flipped[:bits] = True
+    return np.stack([np.zeros(8, np.uint8), np.packbits(flipped)])
+
+
+def test_near_duplicates_are_dropped():
+    a, b = _scene(1), _scene(2)
+    phash, dhash = frame_hashes.compute_hashes([a, _near_copy(a), b, _near_copy(b)])
+    assert frame_hashes.unique_indices(phash, dhash) == [0, 2]
+
+
+def test_distinct_scenes_are_kept():
+    scenes = [_scene(seed) for seed in range(5)]
+    phash, dhash = frame_hashes.compute_hashes(scenes)
+    assert frame_hashes.unique_indices(phash, dhash) == list(range(5))
+
+
+def test_threshold_is_inclusive():
+    at_limit = _hashes_with_distance(FRAME_HASH_DISTANCE)
+    over_limit = _hashes_with_distance(FRAME_HASH_DISTANCE + 1)
+    assert frame_hashes.unique_indices(at_limit, at_limit) == [0]
+    assert frame_hashes.unique_indices(over_limit, over_limit) == [0, 1]
+    # 두 해시가 모두 가까워야 같은 프레임
+    assert frame_hashes.unique_indices(at_limit, over_limit) == [0, 1]
+
+
+def test_exclude_drops_frames_like_thumbnail():
+    a, b = _scene(1), _scene(2)
+    thumb_p, thumb_d = frame_hashes.compute_hashes([_near_copy(a)])
+    phash, dhash = frame_hashes.compute_hashes([a, b])
+    assert frame_hashes.unique_indices(phash, dhash, exclude=(thumb_p, thumb_d)) == [1]
+
+
+def test_hex_round_trip():
+    phash, _ = frame_hashes.compute_hashes([_scene(3)])
+    encoded = frame_hashes.to_hex(phash[0])
+    assert len(encoded) == 16
+    assert np.array_equal(frame_hashes.from_hex([encoded])[0], phash[0])
+
+
+def test_hash_image_bytes():
+    ok, data = cv2.imencode(".jpg", _scene(4))
+    record = frame_hashes.hash_image_bytes(data.tobytes())
+    assert len(record["phash"]) == 16 and len(record["dhash"]) == 16
+    assert len(record["layout"]) == 48
+    assert frame_hashes.hash_image_bytes(b"not an image") is None
+
+
+def _record_for(seed: int) -> dict:
+    phash, dhash = frame_hashes.compute_hashes([_scene(seed)])
+    return {"t": 1.0, "phash": frame_hashes.to_hex(phash[0]), "dhash": frame_hashes.to_hex(dhash[0])}
+
+
+def test_save_record_keeps_post_updated_at(db_tables):
+    from datetime import datetime
+    from database import SessionLocal
+    from db_models import Post
+
+    edited_at = datetime(2024, 1, 2, 3, 4, 5)
+    db = SessionLocal()
+    db.add(Post(id=1, url="https://youtu.be/hashpost001", video_id="hashpost001", title="t",
+                video_type="long", updated_at=edited_at))
+    db.commit()
+    db.close()
+
+    frame_hashes.save_record("hashpost001", frames=[_record_for(5)])
+
+    db = SessionLocal()
+    try:
+        post = db.get(Post, 1)
+        assert post.frame_hashes["frames"] == [_record_for(5)]
+        assert post.updated_at.replace(tzinfo=None) == edited_at
+    finally:
+        db.close()
+
+
+def test_save_record_without_post_does_not_write(db_tables):
+    from sqlalchemy import event
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_tables, "before_cursor_execute", capture)
+    try:
+        frame_hashes.save_record("nopost00001", frames=[_record_for(6)])
+    finally:
+        event.remove(db_tables, "before_cursor_execute", capture)
+
+    assert not [s for s in statements if s.lstrip().upper().startswith("UPDATE")]
+    assert frame_hashes.get_record("nopost00001")["frames"] == [_record_for(6)]
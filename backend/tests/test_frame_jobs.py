@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import pytest
+
+import frame_jobs
+import extraction_pool
+import youtube_service
+from db_config import FRAME_JOB_TTL_SECONDS, FRAME_JOB_STALE_SECONDS
+
+URL = "https://www.youtube.com/watch?v=jobvideo001"
+
+
+@pytest.fixture
+def queued(db_tables, monkeypatch):
+    """풀에 넣은 작업을 실행하지 않고 모아 둠 (DB 저장소, Redis 없음)"""
+    assert isinstance(frame_jobs._store, frame_jobs._DBJobStore)
+    jobs = []
+    monkeypatch.setattr(extraction_pool, "submit", lambda fn, job: jobs.append(job))
+    return jobs
+
+
+def _age(job_id: str, **fields):
+    """저장된 작업의 시각을 과거로 옮김"""
+    job = frame_jobs._store.get(job_id)
+    for name, delta in fields.items():
+        job[name] = (frame_jobs._now() - delta).isoformat()
+    frame_jobs._store.save(job)
+
+
+def test_same_video_is_deduplicated(queued):
+    first = frame_jobs.submit_frame_job(URL, 4)
+    second = frame_jobs.submit_frame_job("https://youtu.be/jobvideo001?t=30", 4)
+
+    assert second["job_id"] == first["job_id"]
+    assert len(queued) == 1
+    # count가 다르면 다른 작업
+    assert frame_jobs.submit_frame_job(URL, 8)["job_id"] != first["job_id"]
+
+
+def test_job_runs_and_stores_frame_urls(queued, monkeypatch):
+    urls = [f"/api/frames/jobvideo001/{i:08d}-{'0' * 16}.jpg" for i in range(12)]
+    monkeypatch.setattr(youtube_service, "frame_url_superset", lambda url: urls)
+
+    job = frame_jobs.submit_frame_job(URL, 4)
+    frame_jobs._run_job(queued[0])
+
+    stored = frame_jobs.get_frame_job(job["job_id"])
+    assert stored["status"] == frame_jobs.DONE
+    assert len(stored["frames"]) == 4 and set(stored["frames"]) <= set(urls)
+    # 완료된 작업도 재사용
+    assert frame_jobs.submit_frame_job(URL, 4)["job_id"] == job["job_id"]
+
+
+def test_failed_job_is_not_reused(queued, monkeypatch):
+    monkeypatch.setattr(youtube_service, "frame_url_superset", lambda url: [])
+    job = frame_jobs.submit_frame_job(URL, 4)
+    frame_jobs._run_job(queued[0])
+
+    assert frame_jobs.get_frame_job(job["job_id"])["status"] == frame_jobs.FAILED
+    assert frame_jobs.submit_frame_job(URL, 4)["job_id"] != job["job_id"]
+
+
+def test_stale_job_is_reported_failed_and_replaced(queued):
+    job = frame_jobs.submit_frame_job(URL, 4)
+    _age(job["job_id"], updated_at=timedelta(seconds=FRAME_JOB_STALE_SECONDS + 60))
+
+    stale = frame_jobs.get_frame_job(job["job_id"])
+    assert (stale["status"], stale["error"]) == (frame_jobs.FAILED, "Job timed out")
+    assert frame_jobs.submit_frame_job(URL, 4)["job_id"] != job["job_id"]
+
+
+def test_expired_job_is_gone_and_replaced(queued):
+    job = frame_jobs.submit_frame_job(URL, 4)
+    _age(job["job_id"], created_at=timedelta(seconds=FRAME_JOB_TTL_SECONDS + 60))
+
+    assert frame_jobs.get_frame_job(job["job_id"]) is None
+    assert frame_jobs.submit_frame_job(URL, 4)["job_id"] != job["job_id"]
+
+
+def test_queue_full_marks_job_failed(db_tables, monkeypatch):
+    def full(fn, job):
+        raise extraction_pool.ExtractionQueueFull(5)
+
+    monkeypatch.setattr(extraction_pool, "submit", full)
+    with pytest.raises(extraction_pool.ExtractionQueueFull):
+        frame_jobs.submit_frame_job(URL, 4)
+
+    stored = frame_jobs._store.find_by_video(frame_jobs._video_key(URL, 4))
+    assert (stored["status"], stored["error"]) == (frame_jobs.FAILED, "Extraction queue is full")
@@ -0,0 +1,32 @@
+import threading
+
+import numpy as np
+
+import frame_selection
+
+
+def test_stats_are_counted_under_concurrency(monkeypatch):
+    # 단색(사용 불가) 프레임만 → 매번 균등 간격 대체
+    samples = np.full((20, frame_selection.HEIGHT, frame_selection.WIDTH, 3), 128, np.uint8)
+    monkeypatch.setattr(frame_selection, "_decode_samples", lambda *args, **kwargs: samples)
+    monkeypatch.setattr(frame_selection, "print", lambda *args, **kwargs: None, raising=False)
+    before = frame_selection.get_stats()
+
+    def worker():
+        for _ in range(50):
+            assert frame_selection.scene_timestamps("ffmpeg", "clip.mp4", 20.0, 3) is None
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    after = frame_selection.get_stats()
+    assert after["runs"] - before["runs"] == 400
+    assert after["fallbacks"] - before["fallbacks"] == 400
+    assert after["last"]["samples"] == 20
+
+    # 반환값은 복사본 (호출자가 바꿔도 내부 상태는 그대로)
+    after["last"]["samples"] = 0
+    assert frame_selection.get_stats()["last"]["samples"] == 20
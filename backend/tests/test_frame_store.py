@@ -0,0 +1,47 @@
+import os
+import time
+
+import frame_store
+
+
+def test_saved_frames_are_served_back():
+    # 27시간이 넘는 위치(9자리 ms)도 저장한 이름 그대로 다시 찾을 수 있어야 함
+    for timestamp in (0, 12.5, 99_999.999, 200_000.0):
+        url = frame_store.save_frame("abcdefghijk", timestamp, b"frame", ".jpg")
+        video_id, filename = url.split("/")[-2:]
+        assert frame_store.get_frame_path(video_id, filename)
+
+
+def test_rejects_malformed_filenames():
+    assert frame_store.get_frame_path("abcdefghijk", "1234-0000000000000000.jpg") is None
+    assert frame_store.get_frame_path("abcdefghijk", "00001234-00000000.jpg") is None
+    assert frame_store.get_frame_path("abcdefghijk", "../00001234-0000000000000000.jpg") is None
+    assert frame_store.get_frame_path("../etc", "00001234-0000000000000000.jpg") is None
+
+
+def test_evicts_least_recently_used_over_budget(monkeypatch):
+    monkeypatch.setattr(frame_store, "FRAME_STORE_MAX_BYTES", 2500)
+    monkeypatch.setattr(frame_store, "_EVICT_CHECK_FRACTION", 1000)  # 저장할 때마다 확인
+
+    urls = [frame_store.save_frame("evictvideo1", float(i), bytes([i]) * 1000, ".jpg") for i in range(2)]
+    paths = [frame_store.get_frame_path("evictvideo1", url.rsplit("/", 1)[1]) for url in urls]
+    # 첫 번째 파일을 최근 사용, 두 번째를 오래된 파일로
+    os.utime(paths[0], (time.time(), time.time()))
+    os.utime(paths[1], (time.time() - 3600, time.time() - 3600))
+
+    frame_store.save_frame("evictvideo2", 0.0, b"x" * 1000, ".jpg")
+
+    assert os.path.exists(paths[0])
+    assert not os.path.exists(paths[1])
+
+
+def test_empty_video_directory_is_removed(monkeypatch):
+    monkeypatch.setattr(frame_store, "FRAME_STORE_MAX_BYTES", 1500)
+    monkeypatch.setattr(frame_store, "_EVICT_CHECK_FRACTION", 1000)
+
+    url = frame_store.save_frame("evictvideo3", 0.0, b"a" * 1000, ".jpg")
+    path = frame_store.get_frame_path("evictvideo3", url.rsplit("/", 1)[1])
+    os.utime(path, (time.time() - 3600, time.time() - 3600))
+    frame_store.save_frame("evictvideo4", 0.0, b"b" * 1000, ".jpg")
+
+    assert not os.path.exists(os.path.dirname(path))
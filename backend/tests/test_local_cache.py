@@ -0,0 +1,54 @@
+from redis_cache import LocalFrameCache
+
+
+def test_evicts_least_recently_used_over_byte_budget():
+    cache = LocalFrameCache(max_bytes=10, ttl_seconds=60)
+    cache.set("a", ["aaaa"])
+    cache.set("b", ["bbbb"])
+    assert cache.get("a") == ["aaaa"]  # a를 최근 사용으로
+
+    cache.set("c", ["cccc"])  # 12바이트 → 가장 오래 쓰지 않은 b 제거
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ["aaaa"] and cache.get("c") == ["cccc"]
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_replacing_key_updates_byte_count():
+    cache = LocalFrameCache(max_bytes=10, ttl_seconds=60)
+    cache.set("a", ["aaaaaaaa"])
+    cache.set("a", ["aa"])
+    assert cache.stats()["bytes"] == 2
+    assert cache.stats()["evictions"] == 0
+
+
+def test_item_larger_than_budget_is_not_stored():
+    cache = LocalFrameCache(max_bytes=10, ttl_seconds=60)
+    cache.set("a", ["aaaa"])
+    cache.set("big", ["x" * 11])
+    assert cache.get("big") is None
+    assert cache.get("a") == ["aaaa"]
+
+
+def test_expired_item_is_removed():
+    cache = LocalFrameCache(max_bytes=10, ttl_seconds=-1)
+    cache.set("a", ["aaaa"])
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_delete_prefix():
+    cache = LocalFrameCache(max_bytes=100, ttl_seconds=60)
+    cache.set("frames:v1:4", ["a"])
+    cache.set("frames:v1:8", ["b"])
+    cache.set("frames:v2:4", ["c"])
+    cache.delete_prefix("frames:v1:")
+    assert cache.stats()["entries"] == 1 and cache.get("frames:v2:4") == ["c"]
+
+
+def test_custom_size_of():
+    cache = LocalFrameCache(max_bytes=5, ttl_seconds=60, size_of=lambda value: len(value["title"]))
+    cache.set("m1", {"title": "abc"})
+    cache.set("m2", {"title": "def"})
+    assert cache.get("m1") is None and cache.get("m2") == {"title": "def"}
@@ -0,0 +1,64 @@
+from sqlalchemy import create_engine, text, inspect
+
+import migrations
+
+LEGACY_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER PRIMARY KEY, email VARCHAR NOT NULL, name VARCHAR NOT NULL,
+        employee_id_hash VARCHAR NOT NULL, is_approved BOOLEAN, is_admin BOOLEAN, created_at DATETIME)""",
+    """CREATE TABLE categories (id VARCHAR PRIMARY KEY, name VARCHAR NOT NULL, type VARCHAR NOT NULL, created_at DATETIME)""",
+    """CREATE TABLE posts (
+        id INTEGER PRIMARY KEY, url VARCHAR NOT NULL UNIQUE, title VARCHAR NOT NULL, thumbnail VARCHAR,
+        platform VARCHAR, video_type VARCHAR NOT NULL, primary_category JSON, secondary_category JSON,
+        memo TEXT, author_id INTEGER, created_at DATETIME, updated_at DATETIME)""",
+    """CREATE TABLE favorites (user_id INTEGER, post_id INTEGER, created_at DATETIME)""",
+    "INSERT INTO categories (id, name, type) VALUES ('c1', 'Food', 'primary'), ('c2', 'Vlog', 'secondary')",
+    """INSERT INTO posts (id, url, title, video_type, primary_category) VALUES
+        (1, 'https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'first', 'long', '["c1"]'),
+        (2, 'https://youtu.be/dQw4w9WgXcQ?t=10', 'same video', 'long', '[]'),
+        (3, 'https://youtube.com/shorts/abcdefghijk', 'short', 'short', '[]'),
+        (4, 'https://example.com/not-youtube', 'other', 'long', '[]')""",
+]
+
+
+def _legacy_engine(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.execute(text(statement))
+    return legacy
+
+
+def test_upgrade_legacy_schema(tmp_path, monkeypatch):
+    legacy = _legacy_engine(tmp_path)
+    monkeypatch.setattr(migrations, "engine", legacy)
+
+    assert migrations.upgrade() == migrations.LATEST_VERSION
+
+    columns = {c["name"] for c in inspect(legacy).get_columns("posts")}
+    assert {"user_id", "industry_categories", "genre_categories", "video_id",
+            "frame_hashes", "thumbnail_variants", "blurhash", "dominant_color"} <= columns
+    assert not {"author_id", "primary_category", "secondary_category"} & columns
+    assert "id" in {c["name"] for c in inspect(legacy).get_columns("favorites")}
+
+    with legacy.connect() as conn:
+        assert conn.execute(text("SELECT type FROM categories ORDER BY id")).scalars().all() == ["industry", "genre"]
+        assert conn.execute(text("SELECT industry_categories FROM posts WHERE id = 1")).scalar() == '["c1"]'
+        # 같은 영상의 두 번째 게시물은 video_id를 비워 둠 (unique 인덱스 충돌 방지)
+        video_ids = conn.execute(text("SELECT id, video_id FROM posts ORDER BY id")).all()
+        assert video_ids == [(1, "dQw4w9WgXcQ"), (2, None), (3, "abcdefghijk"), (4, None)]
+        versions = conn.execute(text("SELECT version FROM schema_version ORDER BY version")).scalars().all()
+        assert versions == [v for v, _, _ in migrations.MIGRATIONS]
+
+    index_names = {ix["name"] for ix in inspect(legacy).get_indexes("posts")}
+    assert "ix_posts_video_id" in index_names
+
+
+def test_upgrade_is_noop_when_current(tmp_path, monkeypatch):
+    legacy = _legacy_engine(tmp_path)
+    monkeypatch.setattr(migrations, "engine", legacy)
+    migrations.upgrade()
+
+    assert migrations.upgrade() == migrations.LATEST_VERSION
+    with legacy.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar() == migrations.LATEST_VERSION
@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+import pytest
+
+import placeholders
+
+_SIZE = placeholders._BLURHASH_SAMPLE_SIZE  # (가로, 세로), 이 크기면 축소 없이 인코딩
+
+
+def _reference_blurhash(image_bgr: np.ndarray, x_components: int = 4, y_components: int = 3) -> str:
+    """blurha.sh 공식 인코더(TypeScript)를 그대로 옮긴 반복문 구현 (벡터화 구현 비교용)"""
+    def to_linear(v):
+        v = v / 255
+        return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+    def to_srgb(v):
+        v = max(0.0, min(1.0, v))
+        return int(v * 12.92 * 255 + 0.5) if v <= 0.0031308 else int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+    def sign_pow(v, e):
+        return math.copysign(abs(v) ** e, v)
+
+    def encode83(value, length):
+        return "".join(placeholders._BASE83[(value // 83 ** (length - 1 - i)) % 83] for i in range(length))
+
+    height, width = image_bgr.shape[:2]
+    pixels = [[[to_linear(float(c)) for c in image_bgr[y, x, ::-1]] for x in range(width)] for y in range(height)]
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            norm = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                for x in range(width):
+                    basis = norm * math.cos(math.pi * i * x / width) * math.cos(math.pi * j * y / height)
+                    pr, pg, pb = pixels[y][x]
+                    r, g, b = r + basis * pr, g + basis * pg, b + basis * pb
+            scale = 1 / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    actual_max = max(abs(v) for f in ac for v in f)
+    quantised_max = int(max(0, min(82, math.floor(actual_max * 166 - 0.5))))
+    max_value = (quantised_max + 1) / 166
+    result += encode83(quantised_max, 1)
+    result += encode83((to_srgb(dc[0]) << 16) + (to_srgb(dc[1]) << 8) + to_srgb(dc[2]), 4)
+    for f in ac:
+        q = [int(max(0, min(18, math.floor(sign_pow(v / max_value, 0.5) * 9 + 9.5)))) for v in f]
+        result += encode83(q[0] * 19 * 19 + q[1] * 19 + q[2], 2)
+    return result
+
+
+def test_solid_white_blurhash():
+    # 크기 'L'(4x3), DC #ffffff → 'TSUA'
+    # 공식 인코더는 cos(pi*i*x/width)로 샘플링하므로 단색이어도 홀수 성분이 0이 아님 (blurha.sh 결과와 같은 값)
+    image = np.full((_SIZE[1], _SIZE[0], 3), 255, np.uint8)
+    assert placeholders.blurhash(image) == "L4TSUA-;fQ-;~qj[fQj[fQfQfQfQ"
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_blurhash_matches_reference_encoder(seed):
+    rng = np.random.default_rng(seed)
+    w, h = _SIZE
+    # 가로 / 세로 그라데이션 + 블록 (여러 AC 성분이 0이 아니도록)
+    yy, xx = np.mgrid[0:h, 0:w]
+    image = np.stack([xx * 255 // w, yy * 255 // h, np.full_like(xx, 80)], axis=2).astype(np.uint8)
+    x, y = rng.integers(0, w // 2), rng.integers(0, h // 2)
+    image[y:y + h // 3, x:x + w // 3] = rng.integers(0, 256, 3)
+
+    encoded = placeholders.blurhash(image)
+    assert len(encoded) == 28
+    assert encoded == _reference_blurhash(image)
+
+
+def _blocks(width_colors):
+    """(가로 픽셀, BGR) 목록으로 320x180 세로 띠 이미지 (32x18 축소 시 경계가 섞이지 않도록 10px 단위)"""
+    image = np.zeros((180, 320, 3), np.uint8)
+    x = 0
+    for width, color in width_colors:
+        image[:, x:x + width] = color
+        x += width
+    return image
+
+
+def test_dominant_color_is_mean_of_largest_bin():
+    # 파랑 10칸 < 같은 구간의 두 초록 11칸 + 11칸 → 초록 두 색의 평균
+    image = _blocks([(100, (255, 0, 0)), (110, (10, 200, 30)), (110, (20, 210, 40))])
+    assert placeholders.dominant_color(image) == "#23cd0f"
+
+
+def test_dominant_color_picks_bin_not_overall_majority():
+    # 빨강 40% 구간이 서로 다른 구간의 두 색(30%씩)보다 큼
+    image = _blocks([(130, (0, 0, 230)), (100, (200, 30, 30)), (90, (30, 200, 30))])
+    assert placeholders.dominant_color(image) == "#e60000"
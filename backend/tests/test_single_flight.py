@@ -0,0 +1,116 @@
+import time
+import threading
+
+import single_flight
+import extraction_pool
+
+
+def _call_concurrently(key, fn, n):
+    """n개 스레드에서 동시에 single_flight.run 호출 (결과 / 예외 수집)"""
+    outcomes = []
+
+    def call():
+        try:
+            outcomes.append(single_flight.run(key, fn, distributed=False))
+        except Exception as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, outcomes
+
+
+def _wait_for_followers(before: int, n: int):
+    deadline = time.monotonic() + 5
+    while single_flight.stats["coalesced"] - before < n and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_followers_share_leader_result():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "frames"
+
+    before = single_flight.stats["coalesced"]
+    leader, leader_outcome = _call_concurrently("sf:share", work, 1)
+    assert started.wait(5)
+    followers, outcomes = _call_concurrently("sf:share", work, 4)
+    _wait_for_followers(before, 4)
+    release.set()
+    for t in leader + followers:
+        t.join(5)
+
+    assert calls == [1]  # work는 leader만 실행
+    assert leader_outcome + outcomes == ["frames"] * 5
+
+
+def test_followers_receive_leader_error():
+    started, release = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("extraction failed")
+
+    before = single_flight.stats["coalesced"]
+    leader, leader_outcome = _call_concurrently("sf:error", work, 1)
+    assert started.wait(5)
+    followers, outcomes = _call_concurrently("sf:error", work, 2)
+    _wait_for_followers(before, 2)
+    release.set()
+    for t in leader + followers:
+        t.join(5)
+
+    assert [str(e) for e in leader_outcome + outcomes] == ["extraction failed"] * 3
+
+
+def test_key_is_released_after_completion():
+    assert single_flight.run("sf:again", lambda: 1) == 1
+    assert single_flight.run("sf:again", lambda: 2) == 2
+
+
+def test_submit_coalesced_uses_one_worker_slot():
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "superset"
+
+    before = extraction_pool.get_metrics()
+    futures = [extraction_pool.submit_coalesced("sf:pool", work) for _ in range(5)]
+    release.set()
+
+    assert [f.result(5) for f in futures] == ["superset"] * 5
+    after = extraction_pool.get_metrics()
+    assert calls == [1]
+    assert after["submitted"] - before["submitted"] == 1
+    assert after["joined"] - before["joined"] == 4
+
+
+def test_redis_error_while_waiting_runs_locally(monkeypatch):
+    class FlakyRedis:
+        """락은 다른 워커가 잡고 있고, 대기 중 확인에서 연결 오류"""
+        def set(self, *args, **kwargs):
+            return False
+
+        def exists(self, key):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(single_flight, "redis_client", FlakyRedis())
+    monkeypatch.setattr(single_flight, "_POLL_INTERVAL", 0)
+    calls = []
+
+    def work():
+        calls.append(1)
+        return "frames"
+
+    assert single_flight.run("sf:redis-down", work, recheck=lambda: None) == "frames"
+    assert calls == [1]
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import cv2
+import numpy as np
+import pytest
+
+import thumbnail_store
+import backfill_thumbnails
+from database import SessionLocal
+from db_models import Post, BackfillProgress
+
+EDITED_AT = datetime(2024, 1, 2, 3, 4, 5)
+
+
+def _jpeg() -> bytes:
+    image = np.zeros((360, 640, 3), np.uint8)
+    cv2.rectangle(image, (100, 50), (400, 300), (40, 120, 220), -1)
+    return cv2.imencode(".jpg", image)[1].tobytes()
+
+
+@pytest.fixture
+def posts(db_tables, monkeypatch):
+    downloads = []
+
+    def download(video_id, source_url):
+        downloads.append(video_id)
+        return None if video_id == "thumbfail03" else _jpeg()
+
+    monkeypatch.setattr(thumbnail_store, "_download", download)
+    db = SessionLocal()
+    for i, vid in enumerate(["thumbpost01", "thumbpost02", "thumbfail03"], start=1):
+        db.add(Post(id=i, url=f"https://youtu.be/{vid}", video_id=vid, title=vid,
+                    video_type="long", updated_at=EDITED_AT))
+    db.commit()
+    db.close()
+    return downloads
+
+
+def test_process_post_keeps_updated_at(posts):
+    thumbnail_store.process_post(1, "thumbpost01", None)
+
+    db = SessionLocal()
+    try:
+        post = db.get(Post, 1)
+        assert set(post.thumbnail_variants) == {"card", "detail", "full"}
+        assert post.blurhash and post.dominant_color.startswith("#")
+        assert post.updated_at.replace(tzinfo=None) == EDITED_AT
+    finally:
+        db.close()
+
+
+def test_backfill_runs_once(posts):
+    backfill_thumbnails.run_backfill(batch_size=2, pause=0)
+
+    db = SessionLocal()
+    try:
+        assert db.get(Post, 1).thumbnail_variants and db.get(Post, 2).thumbnail_variants
+        assert db.get(Post, 3).thumbnail_variants is None  # 원본이 없으면 건너뜀
+        assert db.get(BackfillProgress, backfill_thumbnails.BACKFILL_NAME).completed
+    finally:
+        db.close()
+    assert posts == ["thumbpost01", "thumbpost02", "thumbfail03"]
+
+    # 완료 후 다시 실행해도 아무것도 받지 않음
+    backfill_thumbnails.run_backfill(batch_size=2, pause=0)
+    assert len(posts) == 3
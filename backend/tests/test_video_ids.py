@@ -0,0 +1,47 @@
+import pytest
+
+from video_ids import extract_video_id, extract_video_id_lenient
+
+VID = "dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize("url", [
+    f"https://www.youtube.com/watch?v={VID}",
+    f"https://www.youtube.com/watch?v={VID}&t=10s",
+    f"https://m.youtube.com/watch?feature=share&v={VID}",
+    f"https://music.youtube.com/watch?v={VID}&list=RD",
+    f"https://youtu.be/{VID}",
+    f"https://youtu.be/{VID}?si=abc",
+    f"https://www.youtube.com/shorts/{VID}",
+    f"https://youtube.com/shorts/{VID}?feature=share",
+    f"https://www.youtube.com/embed/{VID}",
+    f"https://www.youtube.com/live/{VID}",
+    f"https://www.youtube.com/v/{VID}",
+    f"www.youtube.com/watch?v={VID}",
+    f"  https://youtu.be/{VID}  ",
+    VID,
+])
+def test_extract_video_id(url):
+    assert extract_video_id(url) == VID
+
+
+@pytest.mark.parametrize("url", [
+    None,
+    "",
+    "https://example.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=short",
+    "https://www.youtube.com/channel/UC1234567890",
+    "https://www.youtube.com/shorts/",
+    "https://notyoutube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQextra",
+])
+def test_extract_video_id_rejects(url):
+    assert extract_video_id(url) is None
+
+
+def test_lenient_accepts_legacy_urls():
+    # 엄격한 파서는 호스트가 달라 거부하지만 기존 게시물 URL은 조회수 갱신 대상
+    url = f"https://www.youtube-nocookie.com/watch?v={VID}&feature=share"
+    assert extract_video_id(url) is None
+    assert extract_video_id_lenient(url) == VID
+    assert extract_video_id_lenient("https://youtu.be/short") is None
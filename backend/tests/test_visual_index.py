@@ -0,0 +1,69 @@
+import cv2
+import numpy as np
+import pytest
+
+import frame_hashes
+import visual_index
+from database import SessionLocal
+from db_models import Post
+
+
+def _scene(seed: int, shift: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    image = np.zeros((360, 640, 3), np.uint8)
+    for _ in range(6):
+        x, y = rng.integers(0, 560), rng.integers(0, 300)
+        w, h = rng.integers(40, 200), rng.integers(40, 150)
+        cv2.rectangle(image, (int(x), int(y)), (int(x + w), int(y + h)), rng.integers(0, 256, 3).tolist(), -1)
+    return cv2.convertScaleAbs(image, alpha=1.0, beta=shift)
+
+
+def _record(seed: int, shift: int = 0) -> dict:
+    """썸네일 1장 + 프레임 3장 (같은 장면의 밝기만 다름) 해시 기록"""
+    thumb = frame_hashes.hash_image_bytes(cv2.imencode(".jpg", _scene(seed, shift))[1].tobytes())
+    frames = [_scene(seed, shift + d) for d in (0, 4, 8)]
+    phash, dhash = frame_hashes.compute_hashes(frames)
+    return {
+        "thumbnail": thumb,
+        "frames": [{"t": float(i), "phash": frame_hashes.to_hex(p), "dhash": frame_hashes.to_hex(d)}
+                   for i, (p, d) in enumerate(zip(phash, dhash))],
+        "layout": frame_hashes.compute_layout(frames).mean(axis=0).tolist(),
+    }
+
+
+@pytest.fixture
+def indexed_posts(db_tables, monkeypatch):
+    """게시물 1: 기준 영상과 거의 같은 장면, 2~4: 다른 장면, 5: 해시 없음"""
+    records = {1: _record(10, shift=5), 2: _record(20), 3: _record(30), 4: _record(40), 5: None}
+    db = SessionLocal()
+    try:
+        for post_id, record in records.items():
+            db.add(Post(id=post_id, url=f"https://youtu.be/visual{post_id:05d}", title=f"post {post_id}",
+                        video_type="long", frame_hashes=record))
+        db.commit()
+    finally:
+        db.close()
+    monkeypatch.setattr(visual_index, "_index", None)
+    return records
+
+
+def test_nearest_post_ranks_first(indexed_posts):
+    results = visual_index.search(post_id=99, record=_record(10), k=10)
+
+    assert [post_id for post_id, _ in results][0] == 1
+    assert {post_id for post_id, _ in results} == {1, 2, 3, 4}  # 해시 없는 게시물은 인덱스에 없음
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[0] > 0.9 > scores[1]
+
+
+def test_query_post_is_excluded_and_k_is_respected(indexed_posts):
+    results = visual_index.search(post_id=1, record=indexed_posts[1], k=2)
+    assert len(results) == 2
+    assert 1 not in {post_id for post_id, _ in results}
+
+
+def test_signature_requires_hashes():
+    assert visual_index.signature(None) is None
+    assert visual_index.signature({"thumbnail": None, "frames": [], "layout": None}) is None
+    assert visual_index.search(post_id=1, record=None) == []
@@ -0,0 +1,21 @@
+import ydl_pool
+
+OPTS = {"quiet": True, "no_warnings": True, "skip_download": True}
+
+
+def test_instance_is_reused_after_reset():
+    with ydl_pool.acquire(OPTS) as first:
+        first._num_downloads = 3
+    with ydl_pool.acquire(OPTS) as second:
+        assert second is first
+        assert second._num_downloads == 0
+
+
+def test_reset_failure_discards_instance():
+    with ydl_pool.acquire(OPTS) as ydl:
+        del ydl._playlist_urls  # yt-dlp 내부 속성이 바뀐 경우
+    before = dict(ydl_pool.stats)
+    with ydl_pool.acquire(OPTS) as fresh:
+        assert fresh is not ydl
+    assert ydl_pool.stats["reset_failed"] >= 1
+    assert before["discarded"] >= 1
@@ -0,0 +1,44 @@
+import base64
+
+import cv2
+import numpy as np
+
+import frame_hashes
+import youtube_service
+
+
+def _scene(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    image = np.zeros((180, 320, 3), np.uint8)
+    for _ in range(6):
+        x, y = rng.integers(0, 280), rng.integers(0, 150)
+        w, h = rng.integers(20, 100), rng.integers(20, 75)
+        cv2.rectangle(image, (int(x), int(y)), (int(x + w), int(y + h)), rng.integers(0, 256, 3).tolist(), -1)
+    return image
+
+
+def _data_url(image: np.ndarray) -> str:
+    return "data:image/jpeg;base64," + base64.b64encode(cv2.imencode(".jpg", image)[1].tobytes()).decode()
+
+
+def test_select_frames_keeps_order_and_count():
+    superset = [f"frame-{i}" for i in range(12)]
+    selected = youtube_service.select_frames(superset, 4)
+    assert len(selected) == 4
+    assert selected == sorted(selected, key=superset.index)
+    assert youtube_service.select_frames(superset[:2], 4) == superset[:2]
+
+
+def test_select_frames_excludes_frames_like_thumbnail():
+    superset = [_data_url(_scene(seed)) for seed in (1, 2, 3)]
+    thumb = frame_hashes.hash_data_url(_data_url(_scene(2)))
+    assert youtube_service.select_frames(superset, 3, exclude=thumb) == [superset[0], superset[2]]
+
+
+def test_select_frames_ignores_stored_record_of_other_extraction(monkeypatch):
+    # 같은 길이의 다른 추출 결과 해시 기록이 있어도 세트 자체의 이미지로 판단
+    superset = [_data_url(_scene(seed)) for seed in (1, 2, 3)]
+    other = [frame_hashes.hash_data_url(_data_url(_scene(seed))) for seed in (7, 8, 9)]
+    monkeypatch.setattr(frame_hashes, "get_record", lambda video_id: {"frames": other})
+    thumb = frame_hashes.hash_data_url(_data_url(_scene(8)))
+    assert youtube_service.select_frames(superset, 3, exclude=thumb) == superset
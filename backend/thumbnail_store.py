@@ -0,0 +1,183 @@
+"""
+게시물 썸네일 파생 이미지 (디스크, 백그라운드 생성)
+
+게시물 생성 시 YouTube 썸네일을 한 번만 받아 크기별 WebP / JPEG로 저장하고 URL로 제공한다.
+  {THUMBNAIL_STORE_DIR}/{video_id}/{크기}-{내용 해시}.{확장자}
+  card: 목록 카드 / detail: 상세 화면 / full: 원본 크기 (다운로드, 복사)
+파일 이름에 내용 해시가 포함되므로 immutable 캐시 가능 (frame_store와 같은 방식).
+생성된 URL 목록은 posts.thumbnail_variants에 저장되어 PostResponse로 반환된다.
+같은 단계에서 목록 카드용 자리표시자(blurhash, 대표 색)도 계산해 저장한다.
+"""
+import os
+import re
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import cv2
+import numpy as np
+
+import frame_hashes
+import placeholders
+from db_config import THUMBNAIL_STORE_DIR, THUMBNAIL_CARD_WIDTH, THUMBNAIL_DETAIL_WIDTH
+from video_ids import is_valid_video_id
+
+THUMBNAIL_URL_PREFIX = "/api/thumbnails"
+
+# 크기별 최대 가로 픽셀 (0이면 원본)
+THUMBNAIL_SIZES = {
+    "card": THUMBNAIL_CARD_WIDTH,
+    "detail": THUMBNAIL_DETAIL_WIDTH,
+    "full": 0,
+}
+# 확장자, 품질 플래그, 품질
+THUMBNAIL_FORMATS = {
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY, 80),
+    "jpeg": (".jpg", cv2.IMWRITE_JPEG_QUALITY, 85),
+}
+# 원본 썸네일이 없을 때 (maxresdefault는 일부 영상에만 있음)
+_FALLBACK_SOURCES = ("hqdefault.jpg", "mqdefault.jpg")
+
+_FILENAME_RE = re.compile(r"^(card|detail|full)-[0-9a-f]{16}\.(webp|jpg)$")
+_MAX_SOURCE_BYTES = 10 * 1024 * 1024
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+_pending = set()
+_pending_lock = threading.Lock()
+stats = {"generated": 0, "failed": 0, "source_bytes": 0, "card_bytes": 0}
+
+
+def _save(video_id: str, name: str, data: bytes, ext: str) -> str:
+    """파일 저장 후 URL 반환 (이미 같은 파일이 있으면 쓰지 않음)"""
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    filename = f"{name}-{digest}{ext}"
+    directory = os.path.join(THUMBNAIL_STORE_DIR, video_id)
+    path = os.path.join(directory, filename)
+
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    return f"{THUMBNAIL_URL_PREFIX}/{video_id}/{filename}"
+
+
+def get_thumbnail_path(video_id: str, filename: str) -> Optional[str]:
+    """URL 경로의 파일 위치 반환 (형식이 잘못되었거나 파일이 없으면 None)"""
+    if not is_valid_video_id(video_id) or not _FILENAME_RE.match(filename):
+        return None
+    path = os.path.join(THUMBNAIL_STORE_DIR, video_id, filename)
+    return path if os.path.isfile(path) else None
+
+
+def _download(video_id: str, source_url: Optional[str]) -> Optional[bytes]:
+    """썸네일 원본 다운로드 (실패 시 작은 기본 썸네일로 재시도)"""
+    import requests
+
+    candidates = [source_url] if source_url else []
+    candidates += [f"https://i.ytimg.com/vi/{video_id}/{name}" for name in _FALLBACK_SOURCES]
+    for url in candidates:
+        try:
+            resp = requests.get(url, timeout=10)
+            if resp.status_code == 200 and 0 < len(resp.content) <= _MAX_SOURCE_BYTES:
+                return resp.content
+        except Exception as e:
+            print(f"⚠️ Thumbnail download failed ({url}): {e}")
+    return None
+
+
+def generate_variants(video_id: str, image: np.ndarray) -> dict:
+    """
+    원본 이미지(BGR)로 크기별 WebP / JPEG 생성 후 저장
+    Returns: {"card": {"webp": url, "jpeg": url, "width": w, "height": h}, "detail": {...}, "full": {...}}
+    """
+    height, width = image.shape[:2]
+    variants = {}
+    for name, max_width in THUMBNAIL_SIZES.items():
+        resized = image
+        if max_width and width > max_width:
+            new_height = max(1, round(height * max_width / width))
+            resized = cv2.resize(image, (max_width, new_height), interpolation=cv2.INTER_AREA)
+
+        entry = {"width": resized.shape[1], "height": resized.shape[0]}
+        for fmt, (ext, flag, quality) in THUMBNAIL_FORMATS.items():
+            ok, buffer = cv2.imencode(ext, resized, [flag, quality])
+            if not ok:
+                raise ValueError(f"Cannot encode {fmt} thumbnail")
+            entry[fmt] = _save(video_id, name, buffer.tobytes(), ext)
+            if name == "card" and fmt == "webp":
+                stats["card_bytes"] += len(buffer)
+        variants[name] = entry
+    return variants
+
+
+def process_post(post_id: int, video_id: str, source_url: Optional[str]):
+    """게시물 하나의 파생 이미지 / 자리표시자 생성 후 저장 (실패 시 예외)"""
+    from database import SessionLocal
+    from db_models import Post
+
+    data = _download(video_id, source_url)
+    if data is None:
+        raise ValueError("No thumbnail source available")
+    stats["source_bytes"] += len(data)
+
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Cannot decode thumbnail")
+
+    variants = generate_variants(video_id, image)
+    blurhash, dominant_color = placeholders.compute(image)
+
+    db = SessionLocal()
+    try:
+        # 파생 데이터 저장은 게시물 수정이 아니므로 onupdate로 수정 시각이 바뀌지 않도록 현재 값 유지
+        db.query(Post).filter(Post.id == post_id).update({
+            Post.thumbnail_variants: variants,
+            Post.blurhash: blurhash,
+            Post.dominant_color: dominant_color,
+            Post.updated_at: Post.updated_at,
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    stats["generated"] += 1
+    print(f"🖼️ Thumbnail variants ready for post {post_id} ({video_id})")
+
+    # 받은 김에 썸네일 지각 해시도 기록 (AI 분석을 거치지 않은 게시물)
+    record = frame_hashes.get_record(video_id)
+    if not record or not record.get("thumbnail"):
+        thumb_hash = frame_hashes.hash_image_bytes(data)
+        if thumb_hash:
+            frame_hashes.save_record(video_id, thumbnail=thumb_hash)
+
+
+def submit(post_id: int, video_id: Optional[str], source_url: Optional[str]):
+    """게시물 썸네일 파생 이미지를 백그라운드로 생성 (이미 처리 중이면 무시)"""
+    if not is_valid_video_id(video_id):
+        return
+    with _pending_lock:
+        if post_id in _pending:
+            return
+        _pending.add(post_id)
+
+    def task():
+        try:
+            process_post(post_id, video_id, source_url)
+        except Exception as e:
+            stats["failed"] += 1
+            print(f"⚠️ Thumbnail variants failed for post {post_id}: {e}")
+        finally:
+            with _pending_lock:
+                _pending.discard(post_id)
+
+    _executor.submit(task)
+
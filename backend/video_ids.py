@@ -0,0 +1,70 @@
+"""
+YouTube 영상 ID 파싱 (단일 기준)
+
+같은 영상의 여러 URL 형태를 하나의 ID로 정규화한다.
+  https://www.youtube.com/watch?v=ID&t=10s
+  https://m.youtube.com/watch?feature=share&v=ID
+  https://youtu.be/ID?si=...
+  https://www.youtube.com/shorts/ID
+  https://www.youtube.com/embed/ID, /live/ID, /v/ID
+게시물 중복 확인, 프레임 캐시 / 작업 키, 조회수 매핑은 모두 이 ID를 사용한다.
+"""
+import re
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_PATH_PREFIXES = ("shorts", "embed", "live", "v")
+
+
+def is_valid_video_id(value: str) -> bool:
+    return bool(value and _VIDEO_ID_RE.match(value))
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """YouTube URL에서 11자리 영상 ID 추출 (인식할 수 없으면 None)"""
+    if not url:
+        return None
+    url = url.strip()
+    if is_valid_video_id(url):
+        return url  # 이미 ID인 경우
+    if "://" not in url:
+        url = "https://" + url
+
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+
+    host = (parsed.hostname or "").lower()
+    parts = [p for p in parsed.path.split("/") if p]
+
+    video_id = None
+    if host == "youtu.be":
+        video_id = parts[0] if parts else None
+    elif host == "youtube.com" or host.endswith(".youtube.com"):
+        if parsed.path == "/watch":
+            video_id = parse_qs(parsed.query).get("v", [None])[0]
+        elif len(parts) >= 2 and parts[0] in _PATH_PREFIXES:
+            video_id = parts[1]
+
+    return video_id if is_valid_video_id(video_id) else None
+
+
+def extract_video_id_lenient(url: str) -> Optional[str]:
+    """
+    extract_video_id + 예전 파서 방식 (URL 어디든 'v=' 또는 'youtu.be/' 뒤의 값)
+    엄격한 파서가 거부하는 기존 게시물 URL을 조회수 갱신 등에서 계속 처리하기 위해 사용
+    """
+    video_id = extract_video_id(url)
+    if video_id or not url:
+        return video_id
+    if 'v=' in url:
+        video_id = url.split('v=')[1].split('&')[0]
+    elif 'youtu.be/' in url:
+        video_id = url.split('youtu.be/')[1].split('?')[0]
+    return video_id if is_valid_video_id(video_id) else None
+
+
+def thumbnail_url(video_id: str) -> str:
+    return f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
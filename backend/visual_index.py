@@ -0,0 +1,162 @@
+"""
+게시물 시각 유사도 인덱스 (NumPy, 프로세스 내)
+
+게시물마다 posts.frame_hashes 기록에서 작은 시각 서명을 만든다.
+- 썸네일 pHash/dHash, 프레임 해시의 비트별 다수결 pHash/dHash (각 64비트)
+- 썸네일 + 프레임 평균 4x4 Lab 색 / 구도 벡터 (48차원, 정규화)
+
+검색은 전체 인덱스에 대해 한 번에 계산한다.
+  해시 유사도: XOR + 바이트 popcount 표 → 해밍 거리 (무작위 이미지 ≈ 32비트 → 0점)
+  색 / 구도 유사도: 코사인 (행렬-벡터 곱)
+  점수 = VISUAL_HASH_WEIGHT * 해시 + (1 - VISUAL_HASH_WEIGHT) * 코사인
+수만 건에서도 수 ms. 인덱스는 첫 검색 때 만들고 VISUAL_INDEX_REFRESH_SECONDS마다 백그라운드에서 다시 만든다.
+"""
+import time
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+import frame_hashes
+from db_config import VISUAL_INDEX_REFRESH_SECONDS, VISUAL_HASH_WEIGHT
+
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+_index = None
+_lock = threading.Lock()
+_building = threading.Event()
+stats = {"posts": 0, "build_ms": 0.0, "built_at": None, "searches": 0, "last_search_ms": 0.0}
+
+
+class _Index:
+    def __init__(self, ids: List[int], codes: List[np.ndarray], masks: List[np.ndarray], layouts: List[np.ndarray]):
+        self.ids = np.array(ids, np.int64)
+        self.codes = np.stack(codes) if codes else np.zeros((0, 4, 8), np.uint8)      # (n, 4, 8)
+        self.masks = np.stack(masks) if masks else np.zeros((0, 2), bool)              # (n, 2) 썸네일 / 프레임
+        self.layouts = np.stack(layouts) if layouts else np.zeros((0, 48), np.float32)  # (n, 48)
+        self.built_at = time.monotonic()
+
+
+def _majority(hashes: List[str]) -> np.ndarray:
+    """여러 해시의 비트별 다수결 (영상 전체를 대표하는 해시 하나)"""
+    bits = np.unpackbits(frame_hashes.from_hex(hashes), axis=1)
+    return np.packbits(bits.mean(axis=0) >= 0.5)
+
+
+def signature(record: Optional[dict]) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """해시 기록 → (codes (4, 8), mask (2,), layout (48,)), 쓸 수 있는 정보가 없으면 None"""
+    if not record:
+        return None
+    thumb = record.get("thumbnail")
+    frames = record.get("frames") or []
+    if not thumb and not frames:
+        return None
+
+    codes = np.zeros((4, 8), np.uint8)
+    mask = np.zeros(2, bool)
+    layouts = []
+    if thumb:
+        codes[0], codes[1] = frame_hashes.from_hex([thumb["phash"], thumb["dhash"]])
+        mask[0] = True
+        if thumb.get("layout"):
+            layouts.append(thumb["layout"])
+    if frames:
+        codes[2] = _majority([f["phash"] for f in frames])
+        codes[3] = _majority([f["dhash"] for f in frames])
+        mask[1] = True
+    if record.get("layout"):
+        layouts.append(record["layout"])
+
+    layout = np.zeros(48, np.float32)
+    if layouts:
+        layout = np.mean(np.array(layouts, np.float32), axis=0) - 128.0
+        norm = np.linalg.norm(layout)
+        layout = layout / norm if norm else layout
+    return codes, mask, layout
+
+
+def _build() -> _Index:
+    """frame_hashes가 있는 모든 게시물로 인덱스 생성"""
+    from database import ReadSessionLocal
+    from db_models import Post
+
+    started = time.perf_counter()
+    ids, codes, masks, layouts = [], [], [], []
+    db = ReadSessionLocal()
+    try:
+        rows = db.query(Post.id, Post.frame_hashes).filter(Post.frame_hashes.isnot(None)).yield_per(1000)
+        for post_id, record in rows:
+            sig = signature(record)
+            if sig is None:
+                continue
+            ids.append(post_id)
+            codes.append(sig[0])
+            masks.append(sig[1])
+            layouts.append(sig[2])
+    finally:
+        db.close()
+
+    index = _Index(ids, codes, masks, layouts)
+    stats["posts"] = len(ids)
+    stats["build_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    stats["built_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    print(f"🖼️ Visual index built: {len(ids)} posts in {stats['build_ms']}ms")
+    return index
+
+
+def _rebuild_in_background():
+    global _index
+    try:
+        _index = _build()
+    except Exception as e:
+        print(f"⚠️ Visual index rebuild failed: {e}")
+    finally:
+        _building.clear()
+
+
+def _get_index() -> _Index:
+    """인덱스 (처음에는 만들 때까지 대기, 오래되면 기존 인덱스로 응답하며 백그라운드에서 갱신)"""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = _build()
+        return _index
+
+    if time.monotonic() - _index.built_at > VISUAL_INDEX_REFRESH_SECONDS and not _building.is_set():
+        _building.set()
+        threading.Thread(target=_rebuild_in_background, daemon=True, name="visual-index").start()
+    return _index
+
+
+def search(post_id: int, record: Optional[dict], k: int = 10) -> List[Tuple[int, float]]:
+    """record(기준 게시물의 해시 기록)와 가장 비슷한 게시물 k개 [(post_id, 점수)], 점수 내림차순"""
+    query = signature(record)
+    if query is None:
+        return []
+    q_codes, q_mask, q_layout = query
+
+    index = _get_index()
+    started = time.perf_counter()
+
+    # 해밍 거리 (n, 4) → 썸네일끼리 / 프레임끼리 해시 유사도 (pHash + dHash 평균)
+    dist = _POPCOUNT[index.codes ^ q_codes].sum(axis=2, dtype=np.int32)
+    dist = dist.reshape(-1, 2, 2).sum(axis=2) / 2.0
+    sim = np.clip(1.0 - dist / 32.0, 0.0, 1.0)
+    valid = index.masks & q_mask
+    n_valid = valid.sum(axis=1)
+    hash_score = np.where(n_valid > 0, (sim * valid).sum(axis=1) / np.maximum(n_valid, 1), 0.0)
+
+    layout_score = np.clip(index.layouts @ q_layout, 0.0, 1.0)
+    score = VISUAL_HASH_WEIGHT * hash_score + (1.0 - VISUAL_HASH_WEIGHT) * layout_score
+    score[index.ids == post_id] = -1.0
+
+    k = min(k, int((score >= 0).sum()))
+    if k <= 0:
+        return []
+    top = np.argpartition(-score, k - 1)[:k]
+    top = top[np.argsort(-score[top])]
+
+    stats["searches"] += 1
+    stats["last_search_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return [(int(index.ids[i]), round(float(score[i]), 4)) for i in top]
@@ -0,0 +1,128 @@
+"""
+재사용 가능한 yt-dlp 인스턴스 풀 (옵션 조합별)
+
+YoutubeDL을 호출마다 새로 만들면 추출기 초기화, HTTP 연결, 플레이어 JS / 서명 해석을
+매번 다시 한다. 옵션 조합(프로필)마다 초기화된 인스턴스를 보관했다가 재사용한다.
+- 한 인스턴스는 한 번에 한 스레드만 사용 (대여 / 반납)
+- 남는 인스턴스가 없으면 새로 만들고, 반납 시 프로필당 YDL_POOL_SIZE개까지만 보관
+- 반납할 때 호출별 상태를 초기화하고 플레이어 스크립트 캐시를 YDL_PLAYER_CACHE_SIZE개로 제한
+- 사용 중 예외가 나거나 YDL_POOL_MAX_USES회 사용한 인스턴스는 닫고 버림
+"""
+import json
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+import yt_dlp
+
+from db_config import YDL_POOL_SIZE, YDL_POOL_MAX_USES, YDL_PLAYER_CACHE_SIZE
+
+# 스크립트 하나에서 나오는 서명 / n 파라미터 해석 결과가 여러 개이므로 넉넉하게
+_PLAYER_RESULTS_PER_SCRIPT = 64
+
+_idle = {}  # 프로필 키 -> deque[(YoutubeDL, 사용 횟수)]
+_lock = threading.Lock()
+stats = {"created": 0, "reused": 0, "discarded": 0, "reset_failed": 0, "player_cache_trimmed": 0}
+
+
+def _profile_key(opts: dict) -> str:
+    return json.dumps(opts, sort_keys=True, default=str)
+
+
+def _trim(cache: dict, limit: int) -> int:
+    """오래된 항목부터 제거 (dict 삽입 순서)"""
+    removed = 0
+    while len(cache) > limit:
+        cache.pop(next(iter(cache)))
+        removed += 1
+    return removed
+
+
+# 호출마다 초기화하는 YoutubeDL 내부 속성 (yt-dlp 업데이트로 없어지면 _reset 실패 → 인스턴스를 버림)
+_PER_CALL_STATE = ('_download_retcode', '_num_downloads', '_playlist_level', '_playlist_urls', '_printed_messages')
+
+
+def _reset(ydl: yt_dlp.YoutubeDL):
+    """
+    다음 호출에 남으면 안 되는 호출별 상태 초기화 + 플레이어 캐시 제한
+    속성이 없으면 (yt-dlp 내부 변경) 예외 → 호출한 쪽에서 인스턴스를 버림
+    """
+    missing = [name for name in _PER_CALL_STATE + ('_ies_instances',) if not hasattr(ydl, name)]
+    if missing:
+        raise AttributeError(f"YoutubeDL has no {', '.join(missing)}")
+    ydl._download_retcode = 0
+    ydl._num_downloads = 0
+    ydl._playlist_level = 0
+    ydl._playlist_urls = set()
+    ydl._printed_messages = set()
+
+    for ie in ydl._ies_instances.values():
+        code_cache = getattr(ie, '_code_cache', None)
+        if isinstance(code_cache, dict):
+            stats["player_cache_trimmed"] += _trim(code_cache, YDL_PLAYER_CACHE_SIZE)
+        player_cache = getattr(ie, '_player_cache', None)
+        if isinstance(player_cache, dict):
+            _trim(player_cache, YDL_PLAYER_CACHE_SIZE * _PLAYER_RESULTS_PER_SCRIPT)
+
+
+def _close(ydl: yt_dlp.YoutubeDL):
+    try:
+        ydl.close()
+    except Exception as e:
+        print(f"⚠️ yt-dlp close failed: {e}")
+
+
+@contextmanager
+def acquire(opts: dict):
+    """
+    옵션에 맞는 YoutubeDL 대여 (with 블록이 끝나면 반납)
+    with yt_dlp.YoutubeDL(opts) as ydl: 대신 with ydl_pool.acquire(opts) as ydl: 로 사용
+    """
+    key = _profile_key(opts)
+    with _lock:
+        idle = _idle.setdefault(key, deque())
+        entry = idle.pop() if idle else None
+
+    if entry:
+        ydl, uses = entry
+        stats["reused"] += 1
+    else:
+        ydl, uses = yt_dlp.YoutubeDL(dict(opts)), 0
+        stats["created"] += 1
+
+    try:
+        yield ydl
+    except BaseException:
+        # 중간에 실패한 인스턴스는 상태를 알 수 없으므로 재사용하지 않음
+        stats["discarded"] += 1
+        _close(ydl)
+        raise
+
+    uses += 1
+    if uses < YDL_POOL_MAX_USES:
+        try:
+            _reset(ydl)
+        except Exception as e:
+            # yt-dlp 내부 속성이 바뀌었으면 초기화를 보장할 수 없으므로 재사용하지 않음
+            stats["reset_failed"] += 1
+            print(f"⚠️ yt-dlp instance reset failed, discarding: {e}")
+        else:
+            with _lock:
+                if len(idle) < YDL_POOL_SIZE:
+                    idle.append((ydl, uses))
+                    return
+    stats["discarded"] += 1
+    _close(ydl)
+
+
+def warm(opts: dict, extractor: str = 'Youtube'):
+    """프로필 인스턴스를 미리 만들고 추출기를 초기화해 풀에 넣어둔다 (서버 시작 시)"""
+    with acquire(opts) as ydl:
+        ydl.get_info_extractor(extractor)
+
+
+def get_stats() -> dict:
+    with _lock:
+        idle = sum(len(q) for q in _idle.values())
+        profiles = len(_idle)
+    return dict(stats, idle=idle, profiles=profiles)
@@ -1,12 +1,33 @@
-import yt_dlp
 import cv2
 import numpy as np
 import base64
 import random
-import tempfile
+import subprocess
 import os
-from typing import Optional, Tuple, List
-from redis_cache import get_cached_frames, set_cached_frames
+import re
+from typing import Callable, Optional, Tuple, List
+from redis_cache import get_cached_frames, set_cached_frames, get_cached_metadata, set_cached_metadata
+from frame_store import save_frame
+from video_ids import extract_video_id, thumbnail_url
+import single_flight
+import media_cache
+import frame_hashes
+import ydl_pool
+from frame_selection import scene_timestamps
+from db_config import (
+    FRAME_EXTRACTION_MODE, FRAME_SEEK_PRECISION, FRAME_STREAM_MAX_SECONDS,
+    FRAME_FORMAT, FRAME_QUALITY, FRAME_MAX_WIDTH, FRAME_SUPERSET_SIZE, FRAME_SELECTION_MODE,
+)
+
+
+# 메타데이터 조회용 yt-dlp 옵션 (ydl_pool 프로필)
+METADATA_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'skip_download': True,
+    'nocheckcertificate': True,
+    'ignoreerrors': True,
+}
 
 
 def extract_youtube_metadata(url: str) -> Tuple[Optional[str], Optional[str], str, Optional[str], Optional[str]]:
@@ -14,6 +35,14 @@ def extract_youtube_metadata(url: str) -> Tuple[Optional[str], Optional[str], st
     YouTube URL에서 메타데이터 추출
     Returns: (title, thumbnail_url, video_type, description, channel_name)
     """
+    # 0. 캐시 (게시물 생성 / AI 분석 / 미리 추출이 같은 영상을 다시 조회하지 않도록)
+    #    영상 유형은 URL 형태(/shorts/)로 정해지므로 캐시하지 않음
+    video_id = extract_video_id(url)
+    cached = get_cached_metadata(video_id) if video_id else None
+    if cached:
+        title, thumbnail, description, channel_name = cached
+        return title, thumbnail, 'short' if '/shorts/' in url else 'long', description, channel_name
+
     print(f"🔍 Extracting metadata for: {url}")
     
     # 1. Try oEmbed API first (Most reliable & Fast, avoids IP blocking)
@@ -32,8 +61,9 @@ def extract_youtube_metadata(url: str) -> Tuple[Optional[str], Optional[str], st
             print(f"✅ oEmbed extraction successful: {title} ({channel_name})")
             
             # Force maxresdefault if possible
-            if video_id := (url.split('v=')[1].split('&')[0] if 'v=' in url else None):
-                    thumbnail = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+            if video_id:
+                thumbnail = thumbnail_url(video_id)
+                set_cached_metadata(video_id, [title, thumbnail, description, channel_name])
             
             return title, thumbnail, video_type, description, channel_name
     except Exception as oembed_error:
@@ -41,15 +71,7 @@ def extract_youtube_metadata(url: str) -> Tuple[Optional[str], Optional[str], st
 
     # 2. Try yt-dlp (Fallback)
     try:
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'skip_download': True,
-            'nocheckcertificate': True,
-            'ignoreerrors': True,
-        }
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with ydl_pool.acquire(METADATA_YDL_OPTS) as ydl:
             info = ydl.extract_info(url, download=False)
             title = info.get('title', 'Unknown Title')
             thumbnail = info.get('thumbnail')
@@ -62,6 +84,8 @@ def extract_youtube_metadata(url: str) -> Tuple[Optional[str], Optional[str], st
             else:
                 video_type = 'long'
             
+            if video_id:
+                set_cached_metadata(video_id, [title, thumbnail, description, channel_name])
             return title, thumbnail, video_type, description, channel_name
     
     except Exception as e:
@@ -70,17 +94,9 @@ def extract_youtube_metadata(url: str) -> Tuple[Optional[str], Optional[str], st
         
         try:
             # 3. Manual extraction (Regex/Requests)
-            video_id = None
-            if 'v=' in url:
-                video_id = url.split('v=')[1].split('&')[0]
-            elif 'youtu.be/' in url:
-                video_id = url.split('youtu.be/')[1].split('?')[0]
-            elif 'shorts/' in url:
-                video_id = url.split('shorts/')[1].split('?')[0]
-            
             if video_id:
                 # Construct Thumbnail URL
-                thumbnail = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+                thumbnail = thumbnail_url(video_id)
                 
                 # Extract Title via Requests
                 import requests
@@ -122,107 +138,589 @@ def extract_youtube_metadata(url: str) -> Tuple[Optional[str], Optional[str], st
         return "YouTube Video", None, video_type, "", "Unknown Channel"
 
 
-def extract_frames(url: str, count: int = 4) -> List[str]:
-    """
-    YouTube 영상에서 랜덤 프레임 추출 (Base64)
-    """
-    # ffmpeg 확인 (imageio-ffmpeg 사용)
+def _get_ffmpeg_path() -> Optional[str]:
+    """imageio-ffmpeg 번들 ffmpeg 경로 (없으면 None)"""
     import imageio_ffmpeg
     ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
-    print(f"🎥 ffmpeg path: {ffmpeg_path}")
-    
     if not ffmpeg_path or not os.path.exists(ffmpeg_path):
-        print("❌ ffmpeg not found via imageio-ffmpeg!")
+        return None
+    return ffmpeg_path
+
+
+def _base_ydl_opts(ffmpeg_path: str) -> dict:
+    """프레임 추출용 yt-dlp 공통 옵션"""
+    return {
+        'quiet': True,
+        'no_warnings': True,
+        'nocheckcertificate': True,
+        'ignoreerrors': True,
+        'no_check_certificate': True,
+        'geo_bypass': True,
+        'ffmpeg_location': ffmpeg_path,
+        'extractor_args': {
+            'youtube': {
+                'player_client': ['android', 'web'],
+            }
+        },
+        'socket_timeout': 5,
+        'retries': 0,
+        'fragment_retries': 0,
+    }
+
+
+# seek: range 탐색이 가능한 단일 http(s) 파일 (영상 트랙만 있으면 충분)
+SEEK_FORMAT = (
+    'bestvideo[height<=360][ext=mp4][protocol^=http]/'
+    'best[height<=360][ext=mp4][protocol^=http]/'
+    'best[height<=360][protocol^=http]/best[protocol^=http]'
+)
+STREAM_FORMAT = 'best[height<=360][ext=mp4]/best[height<=360]/best'
+
+
+def warm_extractors():
+    """서버 시작 시 메타데이터 / 프레임 추출용 yt-dlp 인스턴스를 미리 초기화 (ydl_pool)"""
+    profiles = [METADATA_YDL_OPTS]
+    ffmpeg_path = _get_ffmpeg_path()
+    if ffmpeg_path:
+        for fmt in ([SEEK_FORMAT, STREAM_FORMAT] if FRAME_EXTRACTION_MODE == "seek" else [STREAM_FORMAT]):
+            profiles.append(dict(_base_ydl_opts(ffmpeg_path), format=fmt))
+    for opts in profiles:
+        try:
+            ydl_pool.warm(opts)
+        except Exception as e:
+            print(f"⚠️ yt-dlp warm-up failed: {e}")
+
+
+# 출력 포맷별 (확장자, MIME, 품질 플래그)
+FRAME_FORMATS = {
+    'jpeg': ('.jpg', 'image/jpeg', cv2.IMWRITE_JPEG_QUALITY),
+    'webp': ('.webp', 'image/webp', cv2.IMWRITE_WEBP_QUALITY),
+    'png': ('.png', 'image/png', None),
+}
+
+
+def _resize_frame(frame: np.ndarray, max_width: int) -> np.ndarray:
+    """가로가 max_width보다 크면 비율 유지하며 축소 (INTER_AREA: 축소 시 계단 현상 최소화)"""
+    height, width = frame.shape[:2]
+    if not max_width or width <= max_width:
+        return frame
+    new_height = max(1, round(height * max_width / width))
+    return cv2.resize(frame, (max_width, new_height), interpolation=cv2.INTER_AREA)
+
+
+def _encode_frame_bytes(frame: np.ndarray, fmt: str = FRAME_FORMAT, quality: int = FRAME_QUALITY,
+                        max_width: int = FRAME_MAX_WIDTH) -> bytes:
+    """프레임을 축소 후 JPEG/WebP/PNG 바이트로 인코딩"""
+    ext, _, quality_flag = FRAME_FORMATS[fmt]
+    params = [quality_flag, int(quality)] if quality_flag is not None else []
+    _, buffer = cv2.imencode(ext, _resize_frame(frame, max_width), params)
+    return buffer.tobytes()
+
+
+def _encode_frame(frame: np.ndarray, fmt: str = FRAME_FORMAT, quality: int = FRAME_QUALITY,
+                  max_width: int = FRAME_MAX_WIDTH) -> str:
+    """프레임을 축소 후 JPEG/WebP/PNG로 인코딩하여 data URL로 반환"""
+    mime = FRAME_FORMATS[fmt][1]
+    frame_base64 = base64.b64encode(_encode_frame_bytes(frame, fmt, quality, max_width)).decode('utf-8')
+    return f"data:{mime};base64,{frame_base64}"
+
+
+def _sample_timestamps(duration: float, count: int) -> List[float]:
+    """영상 길이 안에서 균등 간격 타임스탬프 (앞뒤 5% 제외, 같은 영상이면 항상 같은 위치)"""
+    start, end = duration * 0.05, duration * 0.95
+    return [start + (end - start) * (i + 0.5) / count for i in range(count)]
+
+
+def _grab_frame_at(ffmpeg_path: str, media_url: str, timestamp: float, http_headers: dict) -> Optional[np.ndarray]:
+    """
+    ffmpeg 입력 탐색(-ss를 -i 앞에)으로 한 프레임만 디코딩
+    progressive/DASH mp4는 HTTP range 요청으로 해당 위치 근처만 받아온다.
+    """
+    cmd = [ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-nostdin']
+    if http_headers:
+        headers = "".join(f"{k}: {v}\r\n" for k, v in http_headers.items())
+        cmd += ['-headers', headers]
+    if FRAME_SEEK_PRECISION == "keyframe":
+        # 탐색 위치 직전 키프레임을 그대로 사용 (키프레임 이후 디코딩 생략)
+        cmd += ['-noaccurate_seek']
+    cmd += [
+        '-rw_timeout', '10000000',  # 10초 (마이크로초)
+        '-ss', f"{timestamp:.3f}",
+        '-i', media_url,
+        '-frames:v', '1',
+        '-an',
+        # passthrough: 탐색 위치 이전 프레임(keyframe)을 버리지 않고 그대로 출력
+        '-fps_mode', 'passthrough',
+        '-f', 'image2pipe',
+        '-c:v', 'png',
+        'pipe:1',
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=30)
+    if result.returncode != 0 or not result.stdout:
+        print(f"⚠️ ffmpeg seek failed at {timestamp:.1f}s: {result.stderr.decode(errors='ignore')[:200]}")
+        return None
+    return cv2.imdecode(np.frombuffer(result.stdout, np.uint8), cv2.IMREAD_COLOR)
+
+
+def _grab_frames(ffmpeg_path: str, media_url: str, timestamps: List[float],
+                 http_headers: dict) -> List[Optional[np.ndarray]]:
+    """타임스탬프별 _grab_frame_at 병렬 실행 (실패한 위치는 None)"""
+    def grab(ts: float) -> Optional[np.ndarray]:
+        try:
+            return _grab_frame_at(ffmpeg_path, media_url, ts, http_headers)
+        except subprocess.TimeoutExpired:
+            print(f"⚠️ ffmpeg seek timed out at {ts:.1f}s")
+            return None
+
+    # 타임스탬프별 ffmpeg 프로세스는 서로 독립적이므로 병렬 실행
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(len(timestamps), 4)) as executor:
+        return list(executor.map(grab, timestamps))
+
+
+def _best_storyboard(info: dict) -> Optional[dict]:
+    """yt-dlp 포맷 중 해상도가 가장 높은 스토리보드 (YouTube 탐색 미리보기 스프라이트)"""
+    boards = [
+        f for f in info.get('formats') or []
+        if f.get('format_note') == 'storyboard' and f.get('fragments')
+        and f.get('fps') and f.get('rows') and f.get('columns') and f.get('width') and f.get('height')
+    ]
+    if not boards:
+        return None
+    return max(boards, key=lambda f: f['width'] * f['height'])
+
+
+def _extract_storyboard_frames(info: dict, timestamps: List[float]) -> List[Tuple[float, np.ndarray]]:
+    """
+    스토리보드 스프라이트 이미지에서 타임스탬프별 타일을 잘라 프레임으로 사용
+    필요한 스프라이트만 받으므로 (장당 수십 KB) 영상 길이와 무관하다. 해상도는 낮다.
+    """
+    board = _best_storyboard(info)
+    if not board:
         return []
 
-    # 캐시 확인
-    cached = get_cached_frames(url, count)
+    import requests
+
+    per_sheet = board['rows'] * board['columns']
+    width, height = board['width'], board['height']
+    sheets = {}
+    frames = []
+    for ts in timestamps:
+        index = int(ts * board['fps'])
+        sheet_index, tile = divmod(index, per_sheet)
+        if sheet_index >= len(board['fragments']):
+            continue
+        if sheet_index not in sheets:
+            sheets[sheet_index] = None
+            try:
+                resp = requests.get(board['fragments'][sheet_index]['url'], timeout=10,
+                                    headers=board.get('http_headers') or info.get('http_headers') or {})
+                if resp.status_code == 200:
+                    sheets[sheet_index] = cv2.imdecode(np.frombuffer(resp.content, np.uint8), cv2.IMREAD_COLOR)
+            except Exception as e:
+                print(f"⚠️ Storyboard download failed: {e}")
+        sheet = sheets[sheet_index]
+        if sheet is None:
+            continue
+
+        row, col = divmod(tile, board['columns'])
+        frame = sheet[row * height:(row + 1) * height, col * width:(col + 1) * width]
+        if frame.shape[0] == height and frame.shape[1] == width:
+            frames.append((ts, frame.copy()))
+            print(f"✅ Storyboard frame at {ts:.1f}s ({width}x{height})")
+    return frames
+
+
+def _collect_frames(info: dict, timestamps: List[float],
+                    results: List[Optional[np.ndarray]]) -> List[Tuple[float, np.ndarray]]:
+    """탐색 결과를 모으고, 실패한 위치는 스토리보드 타일로 채움"""
+    frames = {}
+    for ts, frame in zip(timestamps, results):
+        if frame is not None:
+            frames[ts] = frame
+            print(f"✅ Extracted frame at {ts:.1f}s")
+
+    missing = [ts for ts in timestamps if ts not in frames]
+    if missing:
+        frames.update(_extract_storyboard_frames(info, missing))
+    return [(ts, frames[ts]) for ts in timestamps if ts in frames]
+
+
+def _probe_duration(source: str) -> float:
+    """ffmpeg 메타데이터에서 영상 길이(초) 확인"""
+    import imageio_ffmpeg
+    reader = imageio_ffmpeg.read_frames(source)
+    try:
+        meta = next(reader)
+        return float(meta.get('duration') or 0)
+    finally:
+        reader.close()
+
+
+# showinfo 필터 로그: [showinfo@이름 @ 0x...] n:   0 pts: 153600 pts_time:10 ...
+_SHOWINFO_RE = re.compile(r"\[showinfo@(\w+) @ [^\]]*\] n:\s*\d+ pts:\s*-?\d+ pts_time:(-?[\d.]+)")
+
+
+def _showinfo_frames(stderr: bytes) -> List[Tuple[str, float]]:
+    """ffmpeg 로그에서 showinfo@이름 필터를 지난 프레임의 (이름, pts_time) 목록 (출력 순서)"""
+    return [(name, float(pts)) for name, pts in _SHOWINFO_RE.findall(stderr.decode(errors='ignore'))]
+
+
+def _split_bmp_stream(data: bytes) -> List[np.ndarray]:
+    """image2pipe BMP 스트림을 프레임 배열 목록으로 분리 (BMP 헤더의 파일 크기 사용)"""
+    frames = []
+    offset = 0
+    while offset + 6 <= len(data):
+        size = int.from_bytes(data[offset + 2:offset + 6], 'little')
+        if size <= 0:
+            break
+        frame = cv2.imdecode(np.frombuffer(data[offset:offset + size], np.uint8), cv2.IMREAD_COLOR)
+        if frame is not None:
+            frames.append(frame)
+        offset += size
+    return frames
+
+
+def _extract_frames_single_pass(ffmpeg_path: str, source: str, timestamps: List[float]) -> List[Tuple[float, np.ndarray]]:
+    """
+    ffmpeg 한 번의 실행으로 여러 타임스탬프의 프레임을 추출
+    타임스탬프마다 같은 입력을 -ss 입력 탐색으로 열고, 각 입력의 첫 프레임만
+    concat 하여 하나의 파이프로 출력한다. 키프레임부터 다시 디코딩하는 cv2 seek 루프와
+    부정확한 CAP_PROP_FRAME_COUNT 에 의존하지 않는다.
+    FRAME_SEEK_PRECISION=keyframe 이면 탐색 위치 직전 키프레임을 그대로 사용한다.
+    입력마다 showinfo@f{i}를 두어 프레임이 나온 입력만 골라 타임스탬프를 대응한다.
+    """
+    cmd = [ffmpeg_path, '-hide_banner', '-loglevel', 'info', '-nostdin']
+    for ts in timestamps:
+        if FRAME_SEEK_PRECISION == "keyframe":
+            cmd += ['-noaccurate_seek']
+        cmd += ['-ss', f"{ts:.3f}", '-i', source]
+
+    n = len(timestamps)
+    filter_graph = ";".join(
+        f"[{i}:v:0]trim=end_frame=1,showinfo@f{i},setpts=PTS-STARTPTS[v{i}]" for i in range(n)
+    )
+    filter_graph += ";" + "".join(f"[v{i}]" for i in range(n)) + f"concat=n={n}:v=1:a=0[out]"
+    cmd += [
+        '-filter_complex', filter_graph,
+        '-map', '[out]',
+        '-fps_mode', 'passthrough',
+        '-f', 'image2pipe',
+        '-c:v', 'bmp',  # 무압축이라 인코딩 비용이 거의 없음
+        'pipe:1',
+    ]
+
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=60)
+    if result.returncode != 0:
+        raise Exception(f"ffmpeg frame extraction failed: {result.stderr.decode(errors='ignore')[-300:]}")
+
+    # concat은 입력 순서대로 출력 (영상 끝을 넘는 위치 등 프레임이 없는 입력은 건너뜀)
+    produced = sorted({int(name[1:]) for name, _ in _showinfo_frames(result.stderr) if name[1:].isdigit()})
+    frames = [(timestamps[i], image) for i, image in zip(produced, _split_bmp_stream(result.stdout))]
+    for ts, _ in frames:
+        print(f"✅ Extracted frame at {ts:.1f}s")
+    return frames
+
+
+def _remote_timestamps(ffmpeg_path: str, info: dict, duration: float, count: int) -> List[float]:
+    """
+    처음 보는 영상(로컬 캐시 없음)의 추출 위치
+    FRAME_SELECTION_MODE=scene_remote 이고 순차로 읽을 수 있는 길이면 원격 스트림으로 장면 분석, 아니면 균등 간격
+    """
+    if FRAME_SELECTION_MODE == "scene_remote" and duration <= FRAME_STREAM_MAX_SECONDS:
+        timestamps = scene_timestamps(ffmpeg_path, info['url'], duration, count,
+                                      http_headers=info.get('http_headers') or {}, require_full=True)
+        if timestamps:
+            return timestamps
+    return _sample_timestamps(duration, count)
+
+
+def _extract_frames_by_seek(url: str, count: int, ffmpeg_path: str) -> Tuple[str, List[Tuple[float, np.ndarray]]]:
+    """
+    직접 미디어 URL을 한 번 확인한 뒤 타임스탬프마다 ffmpeg로 탐색하여 추출
+    전송량/지연이 영상 길이가 아니라 프레임 수에 비례한다.
+    Returns: (영상 ID, [(타임스탬프, 프레임), ...])
+    """
+    ydl_opts = _base_ydl_opts(ffmpeg_path)
+    ydl_opts['format'] = SEEK_FORMAT
+
+    print(f"🎬 Resolving media URL for {url}...")
+    with ydl_pool.acquire(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+
+    if not info or not info.get('url'):
+        raise Exception("Failed to resolve direct media URL")
+
+    duration = info.get('duration') or 0
+    if duration <= 0:
+        raise Exception("Unknown video duration (cannot seek)")
+
+    timestamps = _remote_timestamps(ffmpeg_path, info, duration, count)
+    print(f"🎯 Seeking {len(timestamps)} frames in {duration}s video (format {info.get('format_id')})")
+
+    results = _grab_frames(ffmpeg_path, info['url'], timestamps, info.get('http_headers') or {})
+    frames = _collect_frames(info, timestamps, results)
+
+    # 다음 추출은 로컬에서 (백그라운드로 영상 캐시)
+    media_cache.prefetch(info['id'], info['url'], info.get('http_headers') or {}, duration, ffmpeg_path)
+    return info['id'], frames
+
+
+def _extract_frames_from_file(ffmpeg_path: str, path: str, count: int) -> List[Tuple[float, np.ndarray]]:
+    """로컬 영상 파일에서 ffmpeg 한 번으로 추출 (네트워크 없음)"""
+    duration = _probe_duration(path)
+    if not duration:
+        raise Exception("Video has no duration")
+    timestamps = None
+    if FRAME_SELECTION_MODE in ("scene", "scene_remote"):
+        timestamps = scene_timestamps(ffmpeg_path, path, duration, count)
+    if not timestamps:
+        timestamps = _sample_timestamps(duration, count)
+    print(f"📊 Duration: {duration}s, extracting {len(timestamps)} frames from local media")
+    return _extract_frames_single_pass(ffmpeg_path, path, timestamps)
+
+
+def _stream_select_expr(timestamps: List[float]) -> str:
+    """각 타임스탬프를 처음 지나는 프레임만 선택하는 select 필터 식"""
+    return "+".join(f"gte(t,{ts:.3f})*lt(prev_pts*TB,{ts:.3f})" for ts in timestamps)
+
+
+def _match_stream_frames(timestamps: List[float], shown: List[Tuple[str, float]],
+                         images: List[np.ndarray]) -> List[Tuple[float, np.ndarray]]:
+    """
+    출력 프레임을 실제 pts로 요청 타임스탬프에 대응 (순서로 짝짓지 않음)
+    select는 타임스탬프를 처음 지나는 프레임을 고르므로 pts 이하인 가장 늦은 타임스탬프에 해당한다.
+    """
+    frames = []
+    used = set()
+    for (_, pts), image in zip(shown, images):
+        candidates = [ts for ts in timestamps if round(ts, 3) <= pts + 1e-6 and ts not in used]
+        if not candidates:
+            continue
+        ts = max(candidates)
+        used.add(ts)
+        frames.append((ts, image))
+    return frames
+
+
+def _extract_frames_by_stream(url: str, count: int, ffmpeg_path: str) -> Tuple[str, List[Tuple[float, np.ndarray]]]:
+    """
+    360p 미디어를 ffmpeg가 직접 순차로 읽으면서 필요한 프레임만 파이프로 출력 (임시 파일 없음)
+    range 탐색이 안 되는 형식(HLS/DASH 매니페스트 등)에서도 동작한다.
+    마지막 타임스탬프의 프레임을 출력하면 바로 종료하므로 그 뒤는 받지 않는다.
+    Returns: (영상 ID, [(타임스탬프, 프레임), ...])
+    """
+    ydl_opts = _base_ydl_opts(ffmpeg_path)
+    ydl_opts['format'] = STREAM_FORMAT
+
+    print(f"🎬 Checking video duration for {url}...")
+    with ydl_pool.acquire(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+
+    if not info or not info.get('url'):
+        raise Exception("Failed to resolve media URL")
+
+    duration = info.get('duration') or 0
+    if duration <= 0:
+        raise Exception("Video has no duration")
+
+    timestamps = _sample_timestamps(duration, count)
+    http_headers = info.get('http_headers') or {}
+
+    # 긴 영상은 처음부터 읽지 않고 타임스탬프마다 해당 구간만 받는다 (HLS는 세그먼트 단위)
+    # 비용은 영상 길이가 아니라 프레임 수에 비례 (프레임당 시간 제한), 실패한 위치는 스토리보드로
+    if duration > FRAME_STREAM_MAX_SECONDS:
+        print(f"📊 Long video ({duration}s), sampling {len(timestamps)} segments")
+        results = _grab_frames(ffmpeg_path, info['url'], timestamps, http_headers)
+        frames = _collect_frames(info, timestamps, results)
+        media_cache.prefetch(info['id'], info['url'], http_headers, duration, ffmpeg_path)
+        return info['id'], frames
+
+    timestamps = _remote_timestamps(ffmpeg_path, info, duration, count)
+    print(f"📊 Duration: {duration}s, streaming {len(timestamps)} frames in one pass")
+
+    # info: showinfo 로그로 출력 프레임의 실제 pts 확인
+    cmd = [ffmpeg_path, '-hide_banner', '-loglevel', 'info', '-nostdin']
+    if http_headers:
+        cmd += ['-headers', "".join(f"{k}: {v}\r\n" for k, v in http_headers.items())]
+    # 순차로 읽으므로 FRAME_SEEK_PRECISION과 무관하게 모든 프레임을 디코딩한다
+    # (키프레임만 디코딩하면 select가 대부분의 타임스탬프를 지나쳐 프레임이 빠짐)
+    cmd += [
+        '-rw_timeout', '10000000',
+        '-i', info['url'],
+        '-an',
+        '-vf', f"select='{_stream_select_expr(timestamps)}',showinfo@out",
+        '-fps_mode', 'passthrough',
+        '-frames:v', str(len(timestamps)),
+        '-f', 'image2pipe',
+        '-c:v', 'bmp',
+        'pipe:1',
+    ]
+
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=120)
+    if result.returncode != 0:
+        raise Exception(f"ffmpeg stream extraction failed: {result.stderr.decode(errors='ignore')[-300:]}")
+
+    frames = _match_stream_frames(timestamps, _showinfo_frames(result.stderr), _split_bmp_stream(result.stdout))
+    for ts, _ in frames:
+        print(f"✅ Extracted frame at {ts:.1f}s")
+
+    media_cache.prefetch(info['id'], info['url'], http_headers, duration, ffmpeg_path)
+    return info['id'], frames
+
+
+def _extract_raw_frames(url: str, ffmpeg_path: str) -> Tuple[str, List[Tuple[float, np.ndarray]]]:
+    """
+    영상별 고정 위치 원본 프레임 세트 추출 (FRAME_SUPERSET_SIZE장)
+    같은 프로세스의 동시 요청은 인코딩 옵션이 달라도 한 번만 다운로드
+    """
+    return single_flight.run(
+        f"raw:{extract_video_id(url) or url}",
+        lambda: _dedupe_frames(*_extract_raw_frames_uncoalesced(url, FRAME_SUPERSET_SIZE, ffmpeg_path)),
+        distributed=False,
+    )
+
+
+def _dedupe_frames(video_id: str, frames: List[Tuple[float, np.ndarray]]) -> Tuple[str, List[Tuple[float, np.ndarray]]]:
+    """지각 해시로 거의 같은 프레임을 인코딩 전에 제외하고 남은 프레임의 해시를 기록"""
+    if not frames:
+        return video_id, frames
+    phash, dhash = frame_hashes.compute_hashes([frame for _, frame in frames])
+    keep = frame_hashes.unique_indices(phash, dhash)
+    if len(keep) < len(frames):
+        print(f"🧬 Dropped {len(frames) - len(keep)} near-duplicate frames")
+
+    kept = [frames[i] for i in keep]
+    frame_hashes.save_record(video_id, frames=[
+        {"t": round(frames[i][0], 2), "phash": frame_hashes.to_hex(phash[i]), "dhash": frame_hashes.to_hex(dhash[i])}
+        for i in keep
+    ], layout=frame_hashes.compute_layout([frame for _, frame in kept]).mean(axis=0).round().astype(int).tolist())
+    return video_id, kept
+
+
+def _extract_raw_frames_uncoalesced(url: str, count: int, ffmpeg_path: str) -> Tuple[str, List[Tuple[float, np.ndarray]]]:
+    """설정된 방식으로 원본 프레임 추출 (캐시된 영상 → seek → stream 순)"""
+    video_id = extract_video_id(url)
+    cached_path = media_cache.get_media(video_id)
+    if cached_path:
+        try:
+            return video_id, _extract_frames_from_file(ffmpeg_path, cached_path, count)
+        except Exception as cache_error:
+            print(f"⚠️ Cached media extraction failed, fetching again: {cache_error}")
+
+    if FRAME_EXTRACTION_MODE == "seek":
+        try:
+            video_id, frames = _extract_frames_by_seek(url, count, ffmpeg_path)
+            if frames:
+                return video_id, frames
+        except Exception as seek_error:
+            print(f"⚠️ Seek extraction failed, falling back to stream: {seek_error}")
+
+    return _extract_frames_by_stream(url, count, ffmpeg_path)
+
+
+def _cache_id(url: str) -> str:
+    return extract_video_id(url) or url
+
+
+def _superset_key(url: str, variant: str) -> str:
+    return f"frames:{_cache_id(url)}:superset:{variant}"
+
+
+def frame_superset_key(url: str, fmt: str = FRAME_FORMAT, quality: int = FRAME_QUALITY,
+                       max_width: int = FRAME_MAX_WIDTH, urls: bool = False) -> str:
+    """
+    프레임 세트 작업 키 (frame_superset / frame_url_superset 과 같은 single-flight 키)
+    extraction_pool.submit_coalesced / single_flight.wait_for_remote 에 사용
+    """
+    variant = f"{fmt}:{quality}:{max_width}"
+    return _superset_key(url, f"url:{variant}" if urls else variant)
+
+
+def _get_frame_superset(url: str, ffmpeg_path: str, variant: str,
+                        encode: Callable[[str, float, np.ndarray], str],
+                        extract_raw: Optional[Callable[[], Tuple[str, List[Tuple[float, np.ndarray]]]]] = None) -> List[str]:
+    """
+    인코딩된 프레임 세트 (영상 + 인코딩 옵션별로 한 번만 추출 / 캐시)
+    동시 요청 / 다른 워커의 같은 요청은 한 번만 추출하고 결과 공유
+    extract_raw: 원본 프레임을 가져오는 함수 (여러 인코딩 옵션이 한 번의 추출을 공유할 때)
+    """
+    # 같은 영상의 URL 형태가 달라도 영상 ID로 공유
+    cache_id = _cache_id(url)
+    media_cache.record_access(extract_video_id(url))  # 다시 요청된 영상만 영상 캐시에 저장
+    cached = get_cached_frames(cache_id, FRAME_SUPERSET_SIZE, variant)
     if cached:
         return cached
+
+    def extract_and_encode() -> List[str]:
+        video_id, frames = extract_raw() if extract_raw else _extract_raw_frames(url, ffmpeg_path)
+        encoded = [encode(video_id, ts, frame) for ts, frame in frames]
+        if encoded:
+            set_cached_frames(cache_id, encoded, FRAME_SUPERSET_SIZE, variant)
+        return encoded
+
+    return single_flight.run(
+        _superset_key(url, variant),
+        extract_and_encode,
+        recheck=lambda: get_cached_frames(cache_id, FRAME_SUPERSET_SIZE, variant),
+    )
+
+
+def select_frames(frames: List[str], count: int, exclude: Optional[dict] = None) -> List[str]:
+    """
+    세트에서 count장 선택 (요청마다 다른 조합, 시간 순서 유지)
+    exclude: 이 해시(예: 썸네일)와 거의 같은 프레임은 제외
+             (세트의 data URL 이미지를 직접 해시하므로 다른 추출 결과의 해시 기록과 섞이지 않음)
+    """
+    indices = list(range(len(frames)))
+    if exclude:
+        hashes = [frame_hashes.hash_data_url(frame) for frame in frames]
+        hashed = [i for i, h in enumerate(hashes) if h]
+        if hashed:
+            keep = frame_hashes.unique_indices(
+                frame_hashes.from_hex([hashes[i]["phash"] for i in hashed]),
+                frame_hashes.from_hex([hashes[i]["dhash"] for i in hashed]),
+                exclude=(frame_hashes.from_hex([exclude["phash"]]), frame_hashes.from_hex([exclude["dhash"]])),
+            )
+            kept = {hashed[j] for j in keep}
+            # 해시할 수 없는 항목(URL 등)은 그대로 둠
+            indices = [i for i in indices if i in kept or hashes[i] is None] or indices
+
+    if len(indices) > count:
+        indices = sorted(random.sample(indices, count))
+    return [frames[i] for i in indices]
+
+
+def _fallback_thumbnail_url(url: str) -> Optional[str]:
+    """프레임 추출 실패 시 대신 사용할 썸네일 URL"""
+    video_id = extract_video_id(url)
+    return thumbnail_url(video_id) if video_id else None
+
+
+def frame_superset(url: str, fmt: str = FRAME_FORMAT, quality: int = FRAME_QUALITY,
+                   max_width: int = FRAME_MAX_WIDTH) -> List[str]:
+    """
+    영상별 프레임 세트 (Base64 data URL, FRAME_SUPERSET_SIZE장, 추출 실패 시 썸네일 1장)
+    요청별 선택(select_frames)은 호출한 쪽에서 하므로 같은 영상 요청은 이 작업 하나를 공유할 수 있다.
+
+    Args:
+        fmt: 'jpeg' | 'webp' | 'png'
+        quality: JPEG/WebP 품질 (1-100, PNG는 무시)
+        max_width: 최대 가로 픽셀 (0이면 원본 크기)
+    """
+    # ffmpeg 확인 (imageio-ffmpeg 사용)
+    ffmpeg_path = _get_ffmpeg_path()
+    print(f"🎥 ffmpeg path: {ffmpeg_path}")
     
-    frames_base64 = []
-    temp_video_path = None
-    
+    if not ffmpeg_path:
+        print("❌ ffmpeg not found via imageio-ffmpeg!")
+        return []
+
     try:
-        # 임시 파일 경로
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-            temp_video_path = tmp_file.name
-        
-        # YouTube 영상 다운로드 (속도 최적화를 위해 360p 제한)
-        ydl_opts = {
-            'format': 'best[height<=360][ext=mp4]/best[height<=360]/best',
-            'outtmpl': temp_video_path,
-            'quiet': True,
-            'no_warnings': True,
-            'overwrites': True,
-            'nocheckcertificate': True,
-            'ignoreerrors': True,
-            'no_check_certificate': True,
-            'geo_bypass': True,
-            'ffmpeg_location': ffmpeg_path,
-            'extractor_args': {
-                'youtube': {
-                    'player_client': ['android', 'web'],
-                }
-            },
-            'socket_timeout': 5,
-            'retries': 0,
-            'fragment_retries': 0,
-        }
-        
-        print(f"🎬 Checking video duration for {url}...")
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            duration = info.get('duration', 0)
-            
-            # 3분(180초) 이상이면 프레임 추출 스킵
-            if duration > 180:
-                print(f"⚠️ Video is too long ({duration}s). Skipping frame extraction to save time.")
-                return []
-                
-            print(f"🎬 Downloading video (360p) from {url} to {temp_video_path}...")
-            ydl.download([url])
-        
-        # 파일 확인
-        if not os.path.exists(temp_video_path) or os.path.getsize(temp_video_path) == 0:
-            raise Exception("Video download failed (empty file)")
-
-        # OpenCV로 비디오 열기
-        cap = cv2.VideoCapture(temp_video_path)
-        if not cap.isOpened():
-            raise Exception(f"Failed to open video file with OpenCV: {temp_video_path}")
-        
-        # 총 프레임 수
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        if total_frames == 0:
-            raise Exception("Video has no frames")
-        
-        print(f"📊 Total frames: {total_frames}")
-        
-        # 랜덤 프레임 위치 선택 (중복 방지)
-        frame_positions = sorted(random.sample(range(total_frames), min(count, total_frames)))
-        
-        for pos in frame_positions:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
-            ret, frame = cap.read()
-            
-            if ret:
-                # 프레임을 PNG로 인코딩 (고화질 유지)
-                _, buffer = cv2.imencode('.png', frame)
-                
-                # Base64 인코딩
-                frame_base64 = base64.b64encode(buffer).decode('utf-8')
-                frames_base64.append(f"data:image/png;base64,{frame_base64}")
-                
-                print(f"✅ Extracted frame at position {pos}")
-        
-        cap.release()
-        
-        # 캐시에 저장
-        if frames_base64:
-            set_cached_frames(url, frames_base64, count)
-        
-        return frames_base64
+        return _get_frame_superset(
+            url, ffmpeg_path, f"{fmt}:{quality}:{max_width}",
+            lambda video_id, ts, frame: _encode_frame(frame, fmt, quality, max_width),
+        )
     
     except Exception as e:
         print(f"❌ Frame extraction failed: {e}")
@@ -230,17 +728,8 @@ def extract_frames(url: str, count: int = 4) -> List[str]:
         
         # Fallback: Use Thumbnail as a "Frame"
         try:
-            # Extract ID
-            video_id = None
-            if 'v=' in url:
-                video_id = url.split('v=')[1].split('&')[0]
-            elif 'youtu.be/' in url:
-                video_id = url.split('youtu.be/')[1].split('?')[0]
-            elif 'shorts/' in url:
-                video_id = url.split('shorts/')[1].split('?')[0]
-                
-            if video_id:
-                thumb_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+            thumb_url = _fallback_thumbnail_url(url)
+            if thumb_url:
                 import requests
                 resp = requests.get(thumb_url, timeout=5)
                 if resp.status_code == 200:
@@ -255,15 +744,65 @@ def extract_frames(url: str, count: int = 4) -> List[str]:
             print(f"❌ Fallback failed: {fb_e}")
             
         return []
-    
-    finally:
-        # 임시 파일 삭제
-        if temp_video_path and os.path.exists(temp_video_path):
-            try:
-                os.remove(temp_video_path)
-                print(f"🗑️ Cleaned up temp file: {temp_video_path}")
-            except Exception as e:
-                print(f"⚠️ Failed to delete temp file: {e}")
+
+
+def frame_url_superset(url: str, fmt: str = FRAME_FORMAT, quality: int = FRAME_QUALITY,
+                       max_width: int = FRAME_MAX_WIDTH) -> List[str]:
+    """
+    영상별 프레임 세트를 프레임 저장소에 쓰고 URL 목록 반환 (추출 실패 시 썸네일 URL 1개)
+    (/api/frames/... 는 immutable 캐시 헤더로 제공됨)
+    """
+    ffmpeg_path = _get_ffmpeg_path()
+    if not ffmpeg_path:
+        print("❌ ffmpeg not found via imageio-ffmpeg!")
+        return []
+
+    ext = FRAME_FORMATS[fmt][0]
+    try:
+        # URL 자체는 내용이 바뀌지 않으므로 목록만 캐시
+        return _get_frame_superset(
+            url, ffmpeg_path, f"url:{fmt}:{quality}:{max_width}",
+            lambda video_id, ts, frame: save_frame(video_id, ts, _encode_frame_bytes(frame, fmt, quality, max_width), ext),
+        )
+
+    except Exception as e:
+        print(f"❌ Frame extraction failed: {e}")
+        # 썸네일 URL은 브라우저가 직접 불러올 수 있으므로 그대로 반환
+        thumb_url = _fallback_thumbnail_url(url)
+        return [thumb_url] if thumb_url else []
+
+
+def prewarm_frames(url: str) -> int:
+    """
+    게시물 등록 직후 기본 인코딩 옵션의 프레임 세트를 미리 만들어 캐시
+    (/api/youtube/frames 와 AI 분석이 쓰는 두 세트, 원본 추출은 한 번)
+    Returns: 준비된 프레임 수
+    """
+    ffmpeg_path = _get_ffmpeg_path()
+    if not ffmpeg_path:
+        return 0
+
+    media_cache.mark_wanted(extract_video_id(url))  # 등록된 게시물은 다시 열릴 가능성이 높음
+    raw = []
+
+    def extract_raw_once():
+        if not raw:
+            raw.append(_extract_raw_frames(url, ffmpeg_path))
+        return raw[0]
+
+    variant = f"{FRAME_FORMAT}:{FRAME_QUALITY}:{FRAME_MAX_WIDTH}"
+    ext = FRAME_FORMATS[FRAME_FORMAT][0]
+    _get_frame_superset(
+        url, ffmpeg_path, f"url:{variant}",
+        lambda video_id, ts, frame: save_frame(video_id, ts, _encode_frame_bytes(frame), ext),
+        extract_raw_once,
+    )
+    frames = _get_frame_superset(
+        url, ffmpeg_path, variant,
+        lambda video_id, ts, frame: _encode_frame(frame),
+        extract_raw_once,
+    )
+    return len(frames)
 
 
 def validate_youtube_url(url: str) -> bool:
@@ -296,16 +835,7 @@ def update_view_counts_batch(video_ids: List[str]) -> dict:
     results = {}
     
     # Extract IDs from URLs if full URLs are passed (safety check)
-    clean_ids = []
-    for vid in video_ids:
-        if 'v=' in vid:
-            clean_ids.append(vid.split('v=')[1].split('&')[0])
-        elif 'youtu.be/' in vid:
-            clean_ids.append(vid.split('youtu.be/')[1].split('?')[0])
-        elif 'shorts/' in vid:
-            clean_ids.append(vid.split('shorts/')[1].split('?')[0])
-        else:
-            clean_ids.append(vid)
+    clean_ids = [extract_video_id(vid) or vid for vid in video_ids]
 
     import requests
     
@@ -0,0 +1,82 @@
+// blurhash 디코더 (https://blurha.sh) - 서버가 게시물마다 계산한 자리표시자를 작은 이미지로 복원
+const BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~';
+
+const decode83 = (str) => [...str].reduce((value, c) => value * 83 + BASE83.indexOf(c), 0);
+
+const srgbToLinear = (value) => {
+    const v = value / 255;
+    return v <= 0.04045 ? v / 12.92 : Math.pow((v + 0.055) / 1.055, 2.4);
+};
+
+const linearToSrgb = (value) => {
+    const v = Math.max(0, Math.min(1, value));
+    return v <= 0.0031308
+        ? Math.trunc(v * 12.92 * 255 + 0.5)
+        : Math.trunc((1.055 * Math.pow(v, 1 / 2.4) - 0.055) * 255 + 0.5);
+};
+
+const signPow = (value, exp) => Math.sign(value) * Math.pow(Math.abs(value), exp);
+
+export const decodeBlurhash = (hash, width, height) => {
+    const sizeFlag = decode83(hash[0]);
+    const numY = Math.floor(sizeFlag / 9) + 1;
+    const numX = (sizeFlag % 9) + 1;
+    const maxValue = (decode83(hash[1]) + 1) / 166;
+
+    const colors = [];
+    for (let i = 0; i < numX * numY; i++) {
+        if (i === 0) {
+            const value = decode83(hash.substring(2, 6));
+            colors.push([srgbToLinear(value >> 16), srgbToLinear((value >> 8) & 255), srgbToLinear(value & 255)]);
+        } else {
+            const value = decode83(hash.substring(4 + i * 2, 6 + i * 2));
+            colors.push([
+                signPow((Math.floor(value / (19 * 19)) - 9) / 9, 2) * maxValue,
+                signPow(((Math.floor(value / 19) % 19) - 9) / 9, 2) * maxValue,
+                signPow(((value % 19) - 9) / 9, 2) * maxValue,
+            ]);
+        }
+    }
+
+    const pixels = new Uint8ClampedArray(width * height * 4);
+    for (let y = 0; y < height; y++) {
+        for (let x = 0; x < width; x++) {
+            let r = 0, g = 0, b = 0;
+            for (let j = 0; j < numY; j++) {
+                for (let i = 0; i < numX; i++) {
+                    const basis = Math.cos((Math.PI * x * i) / width) * Math.cos((Math.PI * y * j) / height);
+                    const color = colors[i + j * numX];
+                    r += color[0] * basis;
+                    g += color[1] * basis;
+                    b += color[2] * basis;
+                }
+            }
+            const offset = 4 * (x + y * width);
+            pixels[offset] = linearToSrgb(r);
+            pixels[offset + 1] = linearToSrgb(g);
+            pixels[offset + 2] = linearToSrgb(b);
+            pixels[offset + 3] = 255;
+        }
+    }
+    return pixels;
+};
+
+// 작은 캔버스에 그려 data URL로 (CSS 배경으로 늘려서 사용, 같은 해시는 한 번만 계산)
+const cache = new Map();
+
+export const blurhashToDataUrl = (hash, width = 32, height = 18) => {
+    if (!hash || hash.length < 6) return null;
+    if (cache.has(hash)) return cache.get(hash);
+    try {
+        const canvas = document.createElement('canvas');
+        canvas.width = width;
+        canvas.height = height;
+        const ctx = canvas.getContext('2d');
+        ctx.putImageData(new ImageData(decodeBlurhash(hash, width, height), width, height), 0, 0);
+        const url = canvas.toDataURL();
+        cache.set(hash, url);
+        return url;
+    } catch {
+        return null;
+    }
+};
@@ -1,6 +1,17 @@
 import React, { forwardRef, useState } from 'react';
 import { Link } from 'react-router-dom';
-import { API_URL } from '../config';
+import { API_URL, thumbnailVariant } from '../config';
+import { blurhashToDataUrl } from '../blurhash';
+
+// 이미지를 받기 전 바로 그리는 자리표시자 (서버가 계산한 대표 색 + blurhash)
+const placeholderStyle = (post) => {
+    const blurUrl = blurhashToDataUrl(post.blurhash);
+    return {
+        backgroundColor: post.dominant_color || undefined,
+        backgroundImage: blurUrl ? `url(${blurUrl})` : undefined,
+        backgroundSize: 'cover',
+    };
+};
 
 const PostCard = forwardRef(({ post, onClick, getCategoryName }, ref) => {
     const [isFavorited, setIsFavorited] = useState(post.is_favorited);
@@ -43,13 +54,18 @@ const PostCard = forwardRef(({ post, onClick, getCategoryName }, ref) => {
             style={{ textDecoration: 'none', color: 'inherit', display: 'block' }}
         >
             <div className="post-card" ref={ref}>
-                <div className="thumbnail-container">
-                    <img
-                        src={post.thumbnail}
-                        alt={post.title}
-                        className="post-thumbnail"
-                        loading="lazy"
-                    />
+                <div className="thumbnail-container" style={placeholderStyle(post)}>
+                    <picture>
+                        {thumbnailVariant(post, 'card') && (
+                            <source srcSet={thumbnailVariant(post, 'card')} type="image/webp" />
+                        )}
+                        <img
+                            src={thumbnailVariant(post, 'card', 'jpeg') || post.thumbnail}
+                            alt={post.title}
+                            className="post-thumbnail"
+                            loading="lazy"
+                        />
+                    </picture>
                     <span className={`badge ${post.video_type === 'long' ? 'badge-long' : 'badge-short'} video-type-badge`}>
                         {post.video_type === 'long' ? '📺 Long' : '📱 Short'}
                     </span>
@@ -1,7 +1,11 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import CategorySelector from './CategorySelector';
-import { API_URL } from '../config';
+import { API_URL, thumbnailVariant } from '../config';
+
+// 원본 크기 썸네일: 서버에 저장된 JPEG (없으면 YouTube 이미지 프록시)
+const fullThumbnailUrl = (post) =>
+    thumbnailVariant(post, 'full', 'jpeg') || `${API_URL}/api/download/image?url=${encodeURIComponent(post.thumbnail)}`;
 
 export default function PostDetail({ postId: propPostId, currentUser, onClose, onUpdate }) {
     const { postId: paramPostId } = useParams();
@@ -192,7 +196,7 @@ export default function PostDetail({ postId: propPostId, currentUser, onClose, o
 
     const handleCopyImage = async () => {
         try {
-            const response = await fetch(`${API_URL}/api/download/image?url=${encodeURIComponent(post.thumbnail)}`);
+            const response = await fetch(fullThumbnailUrl(post));
             if (!response.ok) throw new Error('Failed to fetch image');
 
             const blob = await response.blob();
@@ -245,7 +249,7 @@ export default function PostDetail({ postId: propPostId, currentUser, onClose, o
 
     const handleDownloadThumbnail = async () => {
         try {
-            const response = await fetch(`${API_URL}/api/download/image?url=${encodeURIComponent(post.thumbnail)}`);
+            const response = await fetch(fullThumbnailUrl(post));
             if (!response.ok) throw new Error('Failed to download image');
             const blob = await response.blob();
             const url = window.URL.createObjectURL(blob);
@@ -367,7 +371,7 @@ export default function PostDetail({ postId: propPostId, currentUser, onClose, o
                             <h4 style={{ marginBottom: '1rem', fontSize: '1rem', color: 'var(--text-secondary)' }}>Thumbnail</h4>
                             <div style={{ display: 'flex', flexDirection: 'column', gap: '1rem', alignItems: 'flex-start' }}>
                                 <img
-                                    src={post.thumbnail}
+                                    src={thumbnailVariant(post, 'detail') || post.thumbnail}
                                     alt="Thumbnail"
                                     style={{ width: '240px', height: 'auto', borderRadius: '8px', objectFit: 'cover' }}
                                 />
@@ -1 +1,7 @@
 export const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+// 서버에서 생성한 썸네일 파생 이미지 URL (없으면 null → 원본 post.thumbnail 사용)
+export const thumbnailVariant = (post, size, format = 'webp') => {
+    const url = post.thumbnail_variants?.[size]?.[format];
+    return url ? `${API_URL}${url}` : null;
+};